@@ -0,0 +1,49 @@
+"""add typed column values
+
+Revision ID: 5d0a7c2e9b14
+Revises: b3e91f4c7a20
+Create Date: 2026-10-18 11:02:17.548330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0a7c2e9b14'
+down_revision: Union[str, Sequence[str], None] = 'b3e91f4c7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NUMERIC_VALUE_SQL = "CASE WHEN {column} ~ '^\\s*-?[0-9]+(\\.[0-9]+)?\\s*$' THEN trim({column})::numeric END"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('standingcolumns', sa.Column('value_type', sa.String(length=10), server_default='text', nullable=False))
+    op.add_column('columnvalues', sa.Column('numeric_value', sa.Numeric(), sa.Computed(NUMERIC_VALUE_SQL.format(column='value'), persisted=True), nullable=True))
+    op.add_column('tiesheet_player_match_score', sa.Column('numeric_points', sa.Numeric(), sa.Computed(NUMERIC_VALUE_SQL.format(column='points'), persisted=True), nullable=True))
+    op.create_index('ix_columnvalues_column_numeric', 'columnvalues', ['column_id', 'numeric_value'], unique=False)
+
+    # Columns whose existing values are all numbers become typed
+    op.execute(
+        "UPDATE standingcolumns SET value_type = typed.value_type "
+        "FROM ("
+        "SELECT column_id, "
+        "CASE WHEN bool_and(value ~ '^\\s*-?[0-9]+\\s*$') THEN 'int' ELSE 'decimal' END AS value_type "
+        "FROM columnvalues GROUP BY column_id "
+        "HAVING bool_and(numeric_value IS NOT NULL)"
+        ") AS typed "
+        "WHERE standingcolumns.id = typed.column_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_columnvalues_column_numeric', table_name='columnvalues')
+    op.drop_column('tiesheet_player_match_score', 'numeric_points')
+    op.drop_column('columnvalues', 'numeric_value')
+    op.drop_column('standingcolumns', 'value_type')
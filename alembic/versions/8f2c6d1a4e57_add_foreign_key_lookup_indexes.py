@@ -0,0 +1,51 @@
+"""add foreign key lookup indexes
+
+Revision ID: 8f2c6d1a4e57
+Revises: 5d0a7c2e9b14
+Create Date: 2026-10-18 11:48:05.913274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2c6d1a4e57'
+down_revision: Union[str, Sequence[str], None] = '5d0a7c2e9b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_userrole_user_event', 'userrole', ['user_id', 'event_id']),
+    ('ix_userrole_event_created', 'userrole', ['event_id', 'created_at', 'id']),
+    ('ix_stages_event_created', 'stages', ['event_id', 'created_at']),
+    ('ix_groups_stage', 'groups', ['stage_id']),
+    ('ix_groups_event', 'groups', ['event_id']),
+    ('ix_groupmembers_group_user', 'groupmembers', ['group_id', 'user_id']),
+    ('ix_standingcolumns_stage', 'standingcolumns', ['stage_id']),
+    ('ix_tiesheets_stage_scheduled', 'tiesheets', ['stage_id', 'scheduled_date']),
+    ('ix_tiesheets_scheduled_date', 'tiesheets', ['scheduled_date']),
+    ('ix_tiesheets_group', 'tiesheets', ['group_id']),
+    ('ix_tiesheet_players_tiesheet_created', 'tiesheet_players', ['tiesheet_id', 'created_at']),
+    ('ix_tiesheet_players_user', 'tiesheet_players', ['user_id']),
+    ('ix_roundmatch_tiesheet_created', 'roundmatch', ['tiesheet_id', 'created_at']),
+    ('ix_match_score_tiesheetplayer', 'tiesheet_player_match_score', ['tiesheetplayer_id']),
+    ('ix_qualifier_stage_user', 'qualifier', ['stage_id', 'user_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
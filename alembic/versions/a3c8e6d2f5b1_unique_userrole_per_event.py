@@ -0,0 +1,61 @@
+"""unique userrole per event
+
+A user may hold one role per event. Existing duplicates are removed before the
+constraint is added: the role assigned last (newest created_at) is kept and
+every removed row is logged as a warning with its user, event and role.
+
+Revision ID: a3c8e6d2f5b1
+Revises: f2a9c4e7d1b6
+Create Date: 2026-10-18 17:48:12.604937
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8e6d2f5b1'
+down_revision: Union[str, Sequence[str], None] = 'f2a9c4e7d1b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the role assigned last to a user within an event, and report what was dropped
+    removed = op.get_bind().execute(sa.text(
+        "DELETE FROM userrole AS ur USING ("
+        "SELECT id, row_number() OVER ("
+        "PARTITION BY user_id, event_id ORDER BY created_at DESC, id DESC"
+        ") AS position FROM userrole WHERE event_id IS NOT NULL"
+        ") AS ranked "
+        "WHERE ur.id = ranked.id AND ranked.position > 1 "
+        "RETURNING ur.id, ur.user_id, ur.event_id, ur.role_id"
+    )).all()
+    for row in removed:
+        logger.warning(
+            "Removed duplicate userrole %s (user %s, event %s, role %s)",
+            row.id, row.user_id, row.event_id, row.role_id,
+        )
+    if removed:
+        logger.warning("Removed %d duplicate userrole rows, the newest role per user and event was kept", len(removed))
+
+    op.create_unique_constraint('uq_userrole_user_event', 'userrole', ['user_id', 'event_id'])
+    # Covered by the unique constraint's index, dropped concurrently so userrole stays writable
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_userrole_user_event', table_name='userrole', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_userrole_user_event', 'userrole', ['user_id', 'event_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+    op.drop_constraint('uq_userrole_user_event', 'userrole', type_='unique')
@@ -0,0 +1,28 @@
+"""add version to events
+
+Revision ID: a61f3e8b2c09
+Revises: e4b7a9c3d215
+Create Date: 2026-10-18 13:41:09.725316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61f3e8b2c09'
+down_revision: Union[str, Sequence[str], None] = 'e4b7a9c3d215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('events', 'version')
@@ -0,0 +1,62 @@
+"""add standings table
+
+Revision ID: b3e91f4c7a20
+Revises: 6184d481ac47
+Create Date: 2026-10-18 10:12:41.302115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e91f4c7a20'
+down_revision: Union[str, Sequence[str], None] = '6184d481ac47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def numeric_column(field: str) -> str:
+    return (
+        "coalesce(max(CASE WHEN lower(standingcolumns.column_field) = '%s' "
+        "AND columnvalues.value ~ '^\\s*-?[0-9]+(\\.[0-9]+)?\\s*$' "
+        "THEN trim(columnvalues.value)::numeric END), 0)" % field
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('standings',
+    sa.Column('stage_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('match_played', sa.Numeric(), nullable=False),
+    sa.Column('win', sa.Numeric(), nullable=False),
+    sa.Column('loss', sa.Numeric(), nullable=False),
+    sa.Column('draw', sa.Numeric(), nullable=False),
+    sa.Column('points', sa.Numeric(), nullable=False),
+    sa.Column('column_values', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['stage_id'], ['stages.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('stage_id', 'user_id', name='pk_standings')
+    )
+    op.create_index('ix_standings_stage_points', 'standings', ['stage_id', sa.text('points DESC'), sa.text('user_id DESC')], unique=False)
+
+    # Backfill from the existing column values
+    op.execute(
+        "INSERT INTO standings (stage_id, user_id, match_played, win, loss, draw, points, column_values) "
+        "SELECT standingcolumns.stage_id, columnvalues.user_id, "
+        + ", ".join(numeric_column(field) for field in ("match played", "win", "loss", "draw", "points"))
+        + ", jsonb_object_agg(lower(standingcolumns.column_field), columnvalues.value) "
+        "FROM columnvalues JOIN standingcolumns ON columnvalues.column_id = standingcolumns.id "
+        "GROUP BY standingcolumns.stage_id, columnvalues.user_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_standings_stage_points', table_name='standings')
+    op.drop_table('standings')
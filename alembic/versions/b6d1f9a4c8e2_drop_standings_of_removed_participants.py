@@ -0,0 +1,35 @@
+"""drop standings of removed participants
+
+Revision ID: b6d1f9a4c8e2
+Revises: a3c8e6d2f5b1
+Create Date: 2026-10-18 19:12:40.871352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1f9a4c8e2'
+down_revision: Union[str, Sequence[str], None] = 'a3c8e6d2f5b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows left behind by participants removed before removal started cleaning the projection
+    op.execute(
+        "DELETE FROM standings AS s USING stages AS st "
+        "WHERE st.id = s.stage_id AND NOT EXISTS ("
+        "SELECT 1 FROM participants AS p WHERE p.user_id = s.user_id AND p.event_id = st.event_id"
+        ")"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The projection is rebuilt from ColumnValues, the dropped rows are not restored
+    pass
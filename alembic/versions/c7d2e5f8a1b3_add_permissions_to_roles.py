@@ -0,0 +1,54 @@
+"""add permissions to roles
+
+Revision ID: c7d2e5f8a1b3
+Revises: a61f3e8b2c09
+Create Date: 2026-10-18 15:02:44.180537
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e5f8a1b3'
+down_revision: Union[str, Sequence[str], None] = 'a61f3e8b2c09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Bit positions of enums.Permission at the time of this migration
+ROLE_BITS = [
+    'can_edit', 'can_create', 'can_delete',
+    'can_edit_users', 'can_create_users', 'can_delete_users',
+    'can_edit_roles', 'can_create_roles', 'can_delete_roles',
+    'can_edit_events', 'can_create_events', 'can_delete_events',
+]
+PAGE_BITS = [
+    'home_page', 'event_page', 'user_page', 'profile_page', 'role_page', 'tiesheet_page',
+    'group_page', 'round_config_page', 'qualifier_page', 'participants_page', 'column_config_page',
+    'group_stage_standing_page', 'todays_game_page', 'event_role_page',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('roles', sa.Column('permissions', sa.Integer(), server_default='0', nullable=False))
+
+    bits = [f"roles.{name}" for name in ROLE_BITS] + [f"page.{name}" for name in PAGE_BITS]
+    mask = " | ".join(
+        f"(CASE WHEN coalesce({column}, false) THEN {1 << bit} ELSE 0 END)"
+        for bit, column in enumerate(bits)
+    )
+    # Roles without an access page row get only their can_* bits
+    op.execute(
+        f"UPDATE roles SET permissions = {mask} "
+        "FROM roles AS r LEFT JOIN role_access_page AS page ON page.role_id = r.id "
+        "WHERE r.id = roles.id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('roles', 'permissions')
@@ -0,0 +1,59 @@
+"""add event standings table
+
+Revision ID: c9f4a2e7b3d8
+Revises: b6d1f9a4c8e2
+Create Date: 2026-10-18 21:05:17.482930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f4a2e7b3d8'
+down_revision: Union[str, Sequence[str], None] = 'b6d1f9a4c8e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_standings',
+    sa.Column('event_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('points', sa.Numeric(), nullable=False),
+    sa.Column('column_values', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id', 'user_id', name='pk_event_standings')
+    )
+    op.create_index('ix_event_standings_event_points', 'event_standings', ['event_id', sa.text('points DESC'), sa.text('user_id DESC')], unique=False)
+
+    # Backfill from the standings of every stage
+    op.execute(
+        "INSERT INTO event_standings (event_id, user_id, points, column_values) "
+        "SELECT points.event_id, points.user_id, points.points, "
+        "coalesce(jsonb_object_agg(stage_values.key, stage_values.value) "
+        "FILTER (WHERE stage_values.key IS NOT NULL), '{}'::jsonb) "
+        "FROM ("
+        "SELECT stages.event_id, standings.user_id, max(standings.points) AS points "
+        "FROM standings JOIN stages ON stages.id = standings.stage_id "
+        "GROUP BY stages.event_id, standings.user_id"
+        ") AS points LEFT JOIN ("
+        "SELECT stages.event_id, standings.user_id, each.key, max(each.value) AS value "
+        "FROM standings JOIN stages ON stages.id = standings.stage_id "
+        "JOIN jsonb_each_text(standings.column_values) AS each ON true "
+        "GROUP BY stages.event_id, standings.user_id, each.key"
+        ") AS stage_values ON stage_values.event_id = points.event_id AND stage_values.user_id = points.user_id "
+        "GROUP BY points.event_id, points.user_id, points.points"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_standings_event_points', table_name='event_standings')
+    op.drop_table('event_standings')
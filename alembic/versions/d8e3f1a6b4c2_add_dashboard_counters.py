@@ -0,0 +1,39 @@
+"""add dashboard counters
+
+Revision ID: d8e3f1a6b4c2
+Revises: c7d2e5f8a1b3
+Create Date: 2026-10-18 16:21:07.493812
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e3f1a6b4c2'
+down_revision: Union[str, Sequence[str], None] = 'c7d2e5f8a1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('dashboard_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Start from the current totals, the create/delete/status paths keep them up to date from here
+    op.execute(
+        "INSERT INTO dashboard_counters (name, value) VALUES "
+        "('total_users', (SELECT count(*) FROM users)), "
+        "('total_events', (SELECT count(*) FROM events)), "
+        "('active_events', (SELECT count(*) FROM events WHERE status = 'active'))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dashboard_counters')
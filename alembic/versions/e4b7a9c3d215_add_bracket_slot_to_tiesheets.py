@@ -0,0 +1,32 @@
+"""add bracket slot to tiesheets
+
+Revision ID: e4b7a9c3d215
+Revises: 8f2c6d1a4e57
+Create Date: 2026-10-18 12:36:52.184407
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a9c3d215'
+down_revision: Union[str, Sequence[str], None] = '8f2c6d1a4e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tiesheets', sa.Column('bracket_round', sa.Integer(), nullable=True))
+    op.add_column('tiesheets', sa.Column('bracket_position', sa.Integer(), nullable=True))
+    op.create_index('uq_tiesheets_bracket_slot', 'tiesheets', ['stage_id', 'bracket_round', 'bracket_position'], unique=True, postgresql_where=sa.text('bracket_round IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_tiesheets_bracket_slot', table_name='tiesheets', postgresql_where=sa.text('bracket_round IS NOT NULL'))
+    op.drop_column('tiesheets', 'bracket_position')
+    op.drop_column('tiesheets', 'bracket_round')
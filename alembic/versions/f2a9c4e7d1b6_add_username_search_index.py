@@ -0,0 +1,34 @@
+"""add username search index
+
+Revision ID: f2a9c4e7d1b6
+Revises: d8e3f1a6b4c2
+Create Date: 2026-10-18 17:05:39.218604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9c4e7d1b6'
+down_revision: Union[str, Sequence[str], None] = 'd8e3f1a6b4c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so the users table stays writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_username_lower', 'users', [sa.text('lower(username) COLLATE "C"'), 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_username_lower', table_name='users', postgresql_concurrently=True, if_exists=True)
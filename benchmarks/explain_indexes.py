@@ -0,0 +1,135 @@
+"""
+EXPLAIN regression check for the foreign-key lookup indexes.
+
+Runs EXPLAIN (FORMAT JSON) for the hot lookups of the tiesheet, group,
+standings and role services against the database in
+DATABASE_CONNECTION_STRING and checks that each plan uses the expected
+index. Sequential scans are disabled for the check, so it verifies that the
+planner can serve the query from the index even on a small dev database.
+Exits non-zero when an expected index is missing from a plan.
+
+This is a manual check, the repository has no test suite to run it from. It
+needs a migrated database, so run it after adding an index or changing
+one of these queries:
+
+    alembic upgrade head
+    python benchmarks/explain_indexes.py
+"""
+import asyncio
+import json
+import os
+import sys
+from datetime import date
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "dashboard"))
+
+from sqlalchemy import select, func
+
+from db_connect import engine
+from models import (
+    Stage, Group, GroupMembers, StandingColumn, ColumnValues, Standing, EventStanding,
+    Tiesheet, TiesheetPlayer, Match, Tiesheetplayermatchscore, Qualifier, UserRole,
+)
+
+
+def key_queries():
+    """ (name, statement, expected index) for the lookups the services run on every page """
+    some_id = uuid4()
+    return [
+        ("tiesheets of a stage by day",
+         select(Tiesheet.id).where(Tiesheet.stage_id == some_id, Tiesheet.scheduled_date == date.today()),
+         "ix_tiesheets_stage_scheduled"),
+        ("tiesheets scheduled today",
+         select(Tiesheet.id).where(Tiesheet.scheduled_date == date.today()),
+         "ix_tiesheets_scheduled_date"),
+        ("tiesheets of a group",
+         select(Tiesheet.id).where(Tiesheet.group_id == some_id),
+         "ix_tiesheets_group"),
+        ("players of a tiesheet",
+         select(TiesheetPlayer.user_id).where(TiesheetPlayer.tiesheet_id == some_id).order_by(TiesheetPlayer.created_at),
+         "ix_tiesheet_players_tiesheet_created"),
+        ("tiesheets of a player",
+         select(TiesheetPlayer.tiesheet_id).where(TiesheetPlayer.user_id == some_id),
+         "ix_tiesheet_players_user"),
+        ("matches of a tiesheet",
+         select(Match.id).where(Match.tiesheet_id == some_id).order_by(Match.created_at),
+         "ix_roundmatch_tiesheet_created"),
+        ("scores of a tiesheet player",
+         select(Tiesheetplayermatchscore.id).where(Tiesheetplayermatchscore.tiesheetplayer_id == some_id),
+         "ix_match_score_tiesheetplayer"),
+        ("stages of an event",
+         select(Stage.id).where(Stage.event_id == some_id).order_by(Stage.created_at),
+         "ix_stages_event_created"),
+        ("groups of a stage",
+         select(Group.id).where(Group.stage_id == some_id),
+         "ix_groups_stage"),
+        ("members of a group",
+         select(GroupMembers.user_id).where(GroupMembers.group_id == some_id),
+         "ix_groupmembers_group_user"),
+        ("standing columns of a stage",
+         select(StandingColumn.id).where(StandingColumn.stage_id == some_id),
+         "ix_standingcolumns_stage"),
+        ("values of a standing column",
+         select(ColumnValues.user_id).where(ColumnValues.column_id == some_id).order_by(ColumnValues.numeric_value.desc()),
+         "ix_columnvalues_column_numeric"),
+        ("standings page of a stage",
+         select(Standing.user_id).where(Standing.stage_id == some_id)
+         .order_by(Standing.points.desc(), Standing.user_id.desc()).limit(10),
+         "ix_standings_stage_points"),
+        ("standings page of an event",
+         select(EventStanding.user_id).where(EventStanding.event_id == some_id)
+         .order_by(EventStanding.points.desc(), EventStanding.user_id.desc()).limit(10),
+         "ix_event_standings_event_points"),
+        ("qualifiers of a stage",
+         select(Qualifier.user_id).where(Qualifier.stage_id == some_id),
+         "ix_qualifier_stage_user"),
+        ("roles of a user",
+         select(UserRole.role_id).where(UserRole.user_id == some_id, UserRole.event_id == some_id),
+         "uq_userrole_user_event"),
+        ("event roles page",
+         select(UserRole.id).where(UserRole.event_id == some_id).order_by(UserRole.created_at, UserRole.id).limit(10),
+         "ix_userrole_event_created"),
+        ("tiesheet listing of an event",
+         select(Tiesheet.id, func.count(TiesheetPlayer.id))
+         .join(Stage, Stage.id == Tiesheet.stage_id)
+         .outerjoin(TiesheetPlayer, TiesheetPlayer.tiesheet_id == Tiesheet.id)
+         .where(Stage.event_id == some_id)
+         .group_by(Tiesheet.id),
+         "ix_tiesheets_stage_scheduled"),
+    ]
+
+
+def used_indexes(plan: dict) -> set[str]:
+    indexes = set()
+    if "Index Name" in plan:
+        indexes.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        indexes |= used_indexes(child)
+    return indexes
+
+
+async def main():
+    failures = 0
+    async with engine.connect() as connection:
+        await connection.exec_driver_sql("SET enable_seqscan = off")
+        for name, stmt, expected in key_queries():
+            sql = stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            indexes = used_indexes(plan[0]["Plan"])
+
+            ok = expected in indexes
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name:<32} expected {expected}, used {sorted(indexes) or 'no index'}")
+    await engine.dispose()
+
+    if failures:
+        print(f"{failures} queries do not use their index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,258 @@
+"""
+Synthetic dataset generator for load testing.
+
+Loads a production-sized league into the database in
+DATABASE_CONNECTION_STRING: a pool of users, and per event a set of
+participants split into stages and groups, with a round-robin of tiesheets
+per group, several matches per tiesheet and the standing columns filled in
+from the results. Rows are written with bulk inserts and the standings
+projection is rebuilt per stage at the end.
+
+The same --seed always produces the same users, ids and results; tiesheets
+are scheduled around today's date so the "today" listings have data, with
+past rounds completed and today's and later rounds still scheduled.
+seeds.py must have run first (the member role is assigned to every user).
+
+    python benchmarks/generate_data.py --events 4 --stages 2 --groups 4 --participants 64 --matches 3
+    python benchmarks/generate_data.py --scale 10        # every count above x10, except matches
+
+Every generated user can log in with --password (default "benchmark").
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import uuid
+from datetime import date, time, timedelta
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "dashboard"))
+
+from sqlalchemy import insert, select
+
+from db_connect import AsyncSessionLocal, engine
+from models import (
+    User, UserRole, Event, Stage, Group, GroupMembers, StandingColumn, ColumnValues,
+    Tiesheet, TiesheetPlayer, Match, Tiesheetplayermatchscore, user_event_association,
+)
+from roles.services import get_member_role_id
+from users.services import get_password_hash
+from events.group.service import GroupServices
+from events.overalltiesheet.crud import refresh_standings
+from events.tiesheet.schema import TiesheetStatus
+from events.standingcolumn.schema import ColumnValueType
+from counters import adjust_counters, event_counter_deltas
+
+STANDING_COLUMNS = ["Match Played", "Win", "Loss", "Draw", "Points"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", type=int, default=1, help="multiplies users, events and participants")
+    parser.add_argument("--users", type=int, default=200, help="size of the user pool participants are drawn from")
+    parser.add_argument("--events", type=int, default=4)
+    parser.add_argument("--stages", type=int, default=2, help="stages per event")
+    parser.add_argument("--groups", type=int, default=4, help="groups per stage")
+    parser.add_argument("--participants", type=int, default=64, help="participants per event")
+    parser.add_argument("--matches", type=int, default=3, help="matches per tiesheet")
+    parser.add_argument("--password", default="benchmark")
+    parser.add_argument("--chunk", type=int, default=5000, help="rows per bulk insert")
+    args = parser.parse_args()
+
+    args.users *= args.scale
+    args.events *= args.scale
+    args.participants = min(args.participants * args.scale, args.users)
+    return args
+
+
+class Generator:
+    """ Builds the rows of one event at a time from a seeded random source """
+
+    def __init__(self, args, member_role_id, password_hash):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.prefix = f"bench{args.seed}"
+        self.member_role_id = member_role_id
+        self.password_hash = password_hash
+        self.today = date.today()
+
+    def new_id(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def users(self):
+        users = [
+            {
+                "id": self.new_id(),
+                "username": f"{self.prefix}_{i}",
+                "fullname": f"Bench User {i}",
+                "email": f"{self.prefix}_{i}@bench.local",
+                "password": self.password_hash,
+            }
+            for i in range(self.args.users)
+        ]
+        user_roles = [{"id": self.new_id(), "user_id": u["id"], "role_id": self.member_role_id} for u in users]
+        return users, user_roles
+
+    def event(self, number, user_ids):
+        args = self.args
+        rows = {table: [] for table in (
+            Event, user_event_association, Stage, StandingColumn, Group, GroupMembers,
+            Tiesheet, TiesheetPlayer, Match, Tiesheetplayermatchscore, ColumnValues,
+        )}
+
+        participants = self.rng.sample(user_ids, args.participants)
+        # Rounds of the group stage run one per day, centred on today
+        days = max(1, -(-args.participants // args.groups))
+        start = self.today - timedelta(days=days // 2)
+
+        event_id = self.new_id()
+        rows[Event].append({
+            "id": event_id,
+            "title": f"Benchmark event {number}",
+            "description": f"Generated with seed {args.seed}",
+            "startdate": start,
+            "enddate": start + timedelta(days=days * args.stages),
+            "status": "active",
+        })
+        rows[user_event_association] = [{"user_id": user_id, "event_id": event_id} for user_id in participants]
+
+        for stage_number in range(args.stages):
+            stage_id = self.new_id()
+            stage_start = start + timedelta(days=days * stage_number)
+            rows[Stage].append({"id": stage_id, "event_id": event_id, "name": f"Stage {stage_number + 1}"})
+
+            columns = {}
+            for field in STANDING_COLUMNS:
+                columns[field] = self.new_id()
+                rows[StandingColumn].append({
+                    "id": columns[field],
+                    "stage_id": stage_id,
+                    "column_field": field,
+                    "default_value": "0",
+                    "value_type": ColumnValueType.int.value,
+                })
+
+            shuffled = list(participants)
+            self.rng.shuffle(shuffled)
+            table = {user_id: dict.fromkeys(STANDING_COLUMNS, 0) for user_id in shuffled}
+
+            for group_number in range(args.groups):
+                members = shuffled[group_number::args.groups]
+                group_id = self.new_id()
+                rows[Group].append({
+                    "id": group_id, "stage_id": stage_id, "event_id": event_id,
+                    "name": f"Group {chr(ord('A') + group_number % 26)}{group_number // 26 or ''}",
+                })
+                rows[GroupMembers] += [{"id": self.new_id(), "group_id": group_id, "user_id": m} for m in members]
+
+                for round_number, fixtures in enumerate(GroupServices.round_robin_rounds(members)):
+                    scheduled_date = stage_start + timedelta(days=round_number)
+                    played = scheduled_date < self.today
+                    for slot, pair in enumerate(fixtures):
+                        self.tiesheet(rows, stage_id, group_id, scheduled_date, slot, pair, played, table)
+
+            for user_id, values in table.items():
+                rows[ColumnValues] += [
+                    {"id": self.new_id(), "user_id": user_id, "column_id": columns[field], "value": str(value)}
+                    for field, value in values.items()
+                ]
+
+        return rows
+
+    def tiesheet(self, rows, stage_id, group_id, scheduled_date, slot, pair, played, table):
+        tiesheet_id = self.new_id()
+        minutes = 9 * 60 + slot * 30
+        rows[Tiesheet].append({
+            "id": tiesheet_id,
+            "stage_id": stage_id,
+            "group_id": group_id,
+            "scheduled_date": scheduled_date,
+            "scheduled_time": time(hour=minutes // 60 % 24, minute=minutes % 60),
+            "status": (TiesheetStatus.completed if played else TiesheetStatus.scheduled).value,
+        })
+        players = {user_id: self.new_id() for user_id in pair}
+        if not played:
+            rows[TiesheetPlayer] += [
+                {"id": player_id, "tiesheet_id": tiesheet_id, "user_id": user_id, "is_winner": False}
+                for user_id, player_id in players.items()
+            ]
+            return
+
+        won = dict.fromkeys(pair, 0)
+        for match_number in range(self.args.matches):
+            match_id = self.new_id()
+            rows[Match].append({"id": match_id, "tiesheet_id": tiesheet_id, "match_name": f"Match {match_number + 1}"})
+            points = {user_id: self.rng.randint(0, 11) for user_id in pair}
+            best = max(points.values())
+            for user_id, player_id in players.items():
+                winner = points[user_id] == best and list(points.values()).count(best) == 1
+                won[user_id] += winner
+                rows[Tiesheetplayermatchscore].append({
+                    "id": self.new_id(), "match_id": match_id, "tiesheetplayer_id": player_id,
+                    "points": str(points[user_id]), "winner": winner,
+                })
+
+        home, away = pair
+        draw = won[home] == won[away]
+        for user_id, opponent in ((home, away), (away, home)):
+            is_winner = won[user_id] > won[opponent]
+            rows[TiesheetPlayer].append({
+                "id": players[user_id], "tiesheet_id": tiesheet_id, "user_id": user_id, "is_winner": is_winner,
+            })
+            values = table[user_id]
+            values["Match Played"] += 1
+            values["Win"] += is_winner
+            values["Loss"] += not is_winner and not draw
+            values["Draw"] += draw
+            values["Points"] += 3 if is_winner else 1 if draw else 0
+
+
+async def bulk_insert(db, table, rows, chunk):
+    for start in range(0, len(rows), chunk):
+        await db.execute(insert(table), rows[start:start + chunk])
+
+
+async def main():
+    args = parse_args()
+    started = perf_counter()
+
+    async with AsyncSessionLocal() as db:
+        member_role_id = await get_member_role_id(db)
+        if not member_role_id:
+            sys.exit("Member role not found, run seeds.py first")
+
+        generator = Generator(args, member_role_id, await get_password_hash(args.password))
+        existing = await db.scalar(select(User.id).where(User.username == f"{generator.prefix}_0"))
+        if existing:
+            sys.exit(f"Dataset for seed {args.seed} is already loaded, use another --seed")
+
+        users, user_roles = generator.users()
+        await bulk_insert(db, User, users, args.chunk)
+        await bulk_insert(db, UserRole, user_roles, args.chunk)
+        await adjust_counters(db, total_users=len(users))
+        user_ids = [user["id"] for user in users]
+
+        totals = {}
+        for number in range(args.events):
+            rows = generator.event(number + 1, user_ids)
+            for table, table_rows in rows.items():
+                await bulk_insert(db, table, table_rows, args.chunk)
+                totals[table] = totals.get(table, 0) + len(table_rows)
+            for stage in rows[Stage]:
+                await refresh_standings(db, stage["id"])
+            await adjust_counters(db, **event_counter_deltas(rows[Event][0]["status"]))
+            await db.commit()
+            print(f"event {number + 1}/{args.events} loaded")
+
+    await engine.dispose()
+
+    print(f"users: {len(users)}")
+    for table, count in totals.items():
+        print(f"{getattr(table, '__tablename__', getattr(table, 'name', table))}: {count}")
+    print(f"done in {perf_counter() - started:.1f}s, log in as {generator.prefix}_0 / {args.password}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
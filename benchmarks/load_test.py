@@ -0,0 +1,152 @@
+"""
+HTTP load benchmark for the main routers.
+
+Drives a running API with concurrent httpx clients and reports p50/p95/p99
+latency and throughput per endpoint. Meant to run against a dataset loaded
+with generate_data.py; the event and its scheduled tiesheets are
+discovered through the API (event listing and results export).
+
+    uvicorn app:app --workers 1          # from dashboard/
+    python benchmarks/load_test.py --username bench42_0 --password benchmark
+
+Endpoints: login, tiesheets (today's tiesheet listing), groups (group detail
+of the event), standings, match (match entry on scheduled tiesheets, this
+writes a match per request). Pick a subset with --endpoints.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+from itertools import cycle
+from time import perf_counter
+
+import httpx
+
+ENDPOINTS = ("login", "tiesheets", "groups", "standings", "match")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="bench42_0")
+    parser.add_argument("--password", default="benchmark")
+    parser.add_argument("--event-id", help="defaults to the newest active event")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=20, help="untimed requests per endpoint")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help=f"comma separated subset of {', '.join(ENDPOINTS)}")
+    return parser.parse_args()
+
+
+async def login(client, args) -> str:
+    response = await client.post("/user/login", json={"username": args.username, "password": args.password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def discover(client, event_id):
+    """ Event id and, per scheduled tiesheet, the user ids of its two players """
+    if not event_id:
+        response = await client.get("/event", params={"status": "active", "limit": 1})
+        response.raise_for_status()
+        items = response.json()["items"]
+        if not items:
+            sys.exit("No active event found, load one with generate_data.py")
+        event_id = items[0]["id"]
+
+    scheduled = {}
+    async with client.stream("GET", f"/event/export/{event_id}", params={"format": "ndjson"}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            record = json.loads(line)
+            if record["record"] == "score" and record["tiesheet_status"] == "scheduled":
+                scheduled.setdefault(record["tiesheet_id"], {})[record["user_id"]] = None
+
+    fixtures = [(tiesheet_id, list(players)) for tiesheet_id, players in scheduled.items() if len(players) == 2]
+    return event_id, fixtures
+
+
+def build_requests(args, event_id, fixtures):
+    """ endpoint -> callable(client) issuing one request of that endpoint """
+    next_fixture = cycle(fixtures) if fixtures else None
+
+    def match_entry(client):
+        tiesheet_id, (home, away) = next(next_fixture)
+        return client.post("/event/match", json={
+            "overallwinner": "",
+            # Tiesheets stay scheduled so the next run finds them again
+            "status": "scheduled",
+            "tiesheet_id": tiesheet_id,
+            "matchDetail": [{
+                "match_name": "Load test",
+                "userDetail": [
+                    {"user_id": home, "points": "1", "winner": True},
+                    {"user_id": away, "points": "0", "winner": False},
+                ],
+            }],
+        })
+
+    requests = {
+        "login": lambda client: client.post("/user/login", json={"username": args.username, "password": args.password}),
+        "tiesheets": lambda client: client.get("/event/tiesheet", params={"event_id": event_id, "today": True}),
+        "groups": lambda client: client.get(f"/event/group/event/{event_id}"),
+        "standings": lambda client: client.get("/event/overalltiesheet", params={"event_id": event_id}),
+    }
+    if next_fixture:
+        requests["match"] = match_entry
+    return requests
+
+
+async def run_endpoint(client, send, total: int, concurrency: int):
+    latencies, errors = [], 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = perf_counter()
+            response = await send(client)
+            latencies.append(perf_counter() - started)
+            errors += response.status_code >= 400
+
+    started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, perf_counter() - started
+
+
+def report(name, latencies, errors, elapsed):
+    # quantiles() needs two samples, 99 cut points give p1..p99
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    p50, p95, p99 = (cuts[q - 1] * 1000 for q in (50, 95, 99))
+    print(f"{name:<10} {len(latencies):>7} {errors:>6} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} {len(latencies) / elapsed:>9.1f}")
+
+
+async def main():
+    args = parse_args()
+    selected = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = set(selected) - set(ENDPOINTS)
+    if unknown:
+        sys.exit(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        client.headers["Authorization"] = f"Bearer {await login(client, args)}"
+        event_id, fixtures = await discover(client, args.event_id)
+        requests = build_requests(args, event_id, fixtures)
+        print(f"event {event_id}, {len(fixtures)} scheduled tiesheets, {args.concurrency} concurrent clients")
+
+        print(f"{'endpoint':<10} {'requests':>7} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9}")
+        for name in selected:
+            if name not in requests:
+                print(f"{name:<10} skipped, no scheduled tiesheets to enter matches on")
+                continue
+            await run_endpoint(client, requests[name], args.warmup, args.concurrency)
+            report(name, *await run_endpoint(client, requests[name], args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
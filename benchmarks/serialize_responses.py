@@ -0,0 +1,90 @@
+"""
+Serialization benchmark for the list responses.
+
+Compares the per-row path (Model.model_validate for every row, then FastAPI's
+jsonable_encoder and the stdlib JSONResponse) with the fast path (one
+TypeAdapter call over the result set rendered by FastJSONResponse) for
+1k and 10k row payloads of the event and user listings. Rows are built in
+memory the way the services receive them, ORM objects for events and row
+mappings for users, so no database is needed.
+
+    python benchmarks/serialize_responses.py
+"""
+import os
+import sys
+import time
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "dashboard"))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from events.schema import EventDetailResponse, EventDetailResponseList
+from users.schema import UserDetailResponse, UserDetailResponseList
+from responses import FastJSONResponse
+
+ROW_COUNTS = (1_000, 10_000)
+REPEAT = 5
+
+
+def event_rows(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid4(), title=f"Event {i}", description="Weekly league night",
+            startdate=date.today(), enddate=date.today(), status="active",
+            created_at=now, updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def user_rows(count: int):
+    role_id = uuid4()
+    return [
+        {
+            "id": uuid4(), "username": f"user{i}", "fullname": f"User {i}",
+            "email": f"user{i}@example.com", "role_id": role_id, "rolename": "member",
+        }
+        for i in range(count)
+    ]
+
+
+def per_row(model, rows) -> bytes:
+    payload = {"limit": len(rows), "items": [model.model_validate(row) for row in rows]}
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def fast(adapter, rows) -> bytes:
+    payload = {"limit": len(rows), "items": adapter.validate_python(rows)}
+    return FastJSONResponse(payload).body
+
+
+def best_of(func, *args) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    cases = [
+        ("events", EventDetailResponse, EventDetailResponseList, event_rows),
+        ("users", UserDetailResponse, UserDetailResponseList, user_rows),
+    ]
+    print(f"{'payload':<8} {'rows':>6} {'per-row ms':>11} {'fast ms':>8} {'speedup':>8}")
+    for name, model, adapter, build in cases:
+        for count in ROW_COUNTS:
+            rows = build(count)
+            slow_time = best_of(per_row, model, rows)
+            fast_time = best_of(fast, adapter, rows)
+            print(f"{name:<8} {count:>6} {slow_time * 1000:>11.1f} {fast_time * 1000:>8.1f} {slow_time / fast_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,22 @@ from users.routers import router as user_router
 from events.routers import router as event_router
 from participants.routers import router as participant_router
 from roles.routers import router as roles_router
+from live.routers import router as live_router
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from responses import FastJSONResponse
 from exception import APIError
 from dependencies import get_current_user
+from db_connect import get_pool_status
+from query_stats import QueryStats, request_query_stats
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 app.include_router(user_router,prefix="/user",tags=["Users"])
 app.include_router(event_router,prefix="/event",tags=["Events"],dependencies=[Depends(get_current_user)])
 app.include_router(participant_router,prefix="/participant",tags=["Participants"],dependencies=[Depends(get_current_user)])
 app.include_router(roles_router,prefix="/role", tags=["Roles"],dependencies=[Depends(get_current_user)])
+# Authenticates with a token query parameter, WebSocket clients cannot send the Authorization header
+app.include_router(live_router,prefix="/live",tags=["Live"])
 origins = [
     "http://localhost",
     "http://localhost:5173", 
@@ -28,10 +34,46 @@ app.add_middleware(
     allow_headers=["*"],         # allow all headers
 )
 
+@app.middleware("http")
+async def instrument_queries(request: Request, call_next):
+    """
+        Count the queries of each request, report them in Server-Timing and log suspected N+1s.
+        Streamed bodies (no Content-Length, e.g. exports) still run queries after the headers
+        are sent, so they get no Server-Timing and are logged once the body is done.
+    """
+    stats = QueryStats()
+    token = request_query_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        request_query_stats.reset(token)
+
+    if "content-length" in response.headers:
+        response.headers.append("Server-Timing", stats.server_timing())
+        stats.log(request.method, request.url.path)
+        return response
+
+    body_iterator = response.body_iterator
+
+    async def logged_body():
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        finally:
+            stats.log(request.method, request.url.path)
+
+    response.body_iterator = logged_body()
+    return response
+
 @app.get("/health")
 async def health_check():
     return "API Working"
 
+@app.get("/health/db")
+async def db_pool_health():
+    """ Connection pool saturation and checkout wait times for this worker """
+    return get_pool_status()
+
 @app.exception_handler(APIError)
 async def api_error_handler(request: Request, exc: APIError):
     return JSONResponse(
@@ -0,0 +1,139 @@
+from collections import OrderedDict
+from sqlalchemy import event, update, func
+from sqlalchemy.orm import Session
+from models import Event
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+import os
+import time
+
+load_dotenv()
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))
+# Upper bound on staleness for other workers, which do not see this worker's invalidations
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 60))
+
+
+class ResponseCache:
+    """
+        LRU cache of read responses keyed by (endpoint, event_id, params, event version).
+        Entries of an event are dropped together when a write to that event commits.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self.event_keys: dict[object, set[tuple]] = {}
+        # Bumped when an event is invalidated during a load so a read that raced a write
+        # does not store stale data. Only events with a load in flight are kept.
+        self.generations: dict[object, int] = {}
+        self.loading: dict[object, int] = {}
+
+    def get(self, key: tuple):
+        cached = self.entries.get(key)
+        if cached is None:
+            return None
+        expires_at, value = cached
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: tuple, value, generation: int):
+        event_id = key[1]
+        if self.max_entries <= 0 or self.generations.get(event_id, 0) != generation:
+            return
+
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        self.event_keys.setdefault(event_id, set()).add(key)
+        while len(self.entries) > self.max_entries:
+            oldest, _ = self.entries.popitem(last=False)
+            self._forget(oldest)
+
+    async def get_or_load(self, endpoint: str, event_id, version, params: dict, loader):
+        """
+            Cached response for the endpoint, calling loader() to build it on a miss.
+            version is the event version the caller read, so a worker whose entry predates
+            another worker's write misses instead of serving the old body under the new version.
+        """
+        key = (endpoint, event_id, tuple(sorted(params.items())), version)
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        generation = self.generations.get(event_id, 0)
+        self.loading[event_id] = self.loading.get(event_id, 0) + 1
+        try:
+            value = await loader()
+            self.set(key, value, generation)
+        finally:
+            self._finish_load(event_id)
+        return value
+
+    def invalidate_event(self, event_id):
+        if event_id in self.loading:
+            self.generations[event_id] = self.generations.get(event_id, 0) + 1
+        for key in self.event_keys.pop(event_id, set()):
+            self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+        self.event_keys.clear()
+        # Loads in flight must not store what they read before the clear
+        for event_id in self.loading:
+            self.generations[event_id] = self.generations.get(event_id, 0) + 1
+
+    def _finish_load(self, event_id):
+        """ Drop the generation of an event once no load of it is in flight """
+        remaining = self.loading[event_id] - 1
+        if remaining:
+            self.loading[event_id] = remaining
+        else:
+            del self.loading[event_id]
+            self.generations.pop(event_id, None)
+
+    def _remove(self, key: tuple):
+        self.entries.pop(key, None)
+        self._forget(key)
+
+    def _forget(self, key: tuple):
+        keys = self.event_keys.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.event_keys[key[1]]
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS)
+
+
+def touch_event(db: AsyncSession, event_id):
+    """ Mark an event as changed by this transaction; its cached responses are dropped on commit """
+    if event_id is not None:
+        db.info.setdefault("touched_events", set()).add(event_id)
+
+
+@event.listens_for(Session, "before_commit")
+def bump_touched_event_versions(session):
+    """ Bump the version of every touched event inside the committing transaction """
+    touched = session.info.get("touched_events")
+    if touched:
+        session.execute(
+            update(Event)
+            .where(Event.id.in_(touched))
+            .values(version=Event.version + 1, updated_at=func.clock_timestamp())
+            .execution_options(synchronize_session=False)
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_touched_events(session):
+    for event_id in session.info.pop("touched_events", ()):
+        response_cache.invalidate_event(event_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_touched_events(session, previous_transaction):
+    session.info.pop("touched_events", None)
@@ -0,0 +1,55 @@
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from email.utils import format_datetime, parsedate_to_datetime
+from models import Event
+import hashlib
+
+
+async def event_validators(db : AsyncSession, event_id, params : dict) -> tuple[int, str, str] | None:
+    """ Event version, with the ETag and Last-Modified of an event read derived from it """
+    result = await db.execute(select(Event.version, Event.updated_at).where(Event.id == event_id))
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    # The query string selects a different view of the same event version
+    digest = hashlib.sha1(repr(sorted(params.items())).encode()).hexdigest()[:16]
+    etag = f'"{row.version}-{digest}"'
+    last_modified = format_datetime(row.updated_at.replace(microsecond=0), usegmt=True)
+    return row.version, etag, last_modified
+
+
+def is_not_modified(request : Request, etag : str, last_modified : str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def conditional_get(request : Request, response : Response, db : AsyncSession, event_id, params : dict):
+    """
+        (304 response, version) when the client already has the current version of the event read,
+        otherwise (None, version) after setting the validators on the response.
+        The version is None for an unknown event.
+    """
+    validators = await event_validators(db, event_id, params)
+    if validators is None:
+        return None, None
+
+    version, etag, last_modified = validators
+    headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": "no-cache"}
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers), version
+
+    response.headers.update(headers)
+    return None, version
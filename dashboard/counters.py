@@ -0,0 +1,38 @@
+from sqlalchemy import select, update, case, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import DashboardCounter
+
+TOTAL_USERS = "total_users"
+TOTAL_EVENTS = "total_events"
+ACTIVE_EVENTS = "active_events"
+COUNTERS = (TOTAL_USERS, TOTAL_EVENTS, ACTIVE_EVENTS)
+
+
+async def adjust_counters(db: AsyncSession, **deltas: int):
+    """
+        Add the deltas to the named counters in the caller's transaction, so they
+        commit or roll back together with the write they count
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    stmt = (
+        update(DashboardCounter)
+        .where(DashboardCounter.name.in_(deltas))
+        .values(value=DashboardCounter.value + case(deltas, value=DashboardCounter.name, else_=0))
+    )
+    await db.execute(stmt)
+
+
+def event_counter_deltas(status: str | None, sign: int = 1) -> dict:
+    """ Counter deltas of adding (sign 1) or removing (sign -1) an event with this status """
+    return {TOTAL_EVENTS: sign, ACTIVE_EVENTS: sign if status == "active" else 0}
+
+
+def counters_row():
+    """ One row with a column per counter, 0 for counters that have no row yet """
+    return select(*(
+        func.coalesce(func.sum(DashboardCounter.value).filter(DashboardCounter.name == name), 0).label(name)
+        for name in COUNTERS
+    )).subquery("counters")
@@ -1,12 +1,97 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from dataclasses import dataclass
+from time import perf_counter
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 db_url = os.getenv("DATABASE_CONNECTION_STRING")
 
-engine = create_async_engine(db_url)
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """ Connection pool and driver settings, read from the environment """
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    statement_timeout_ms: int = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            pool_size=int(os.getenv("DB_POOL_SIZE", cls.pool_size)),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", cls.max_overflow)),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", cls.pool_timeout)),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", cls.pool_recycle)),
+            pool_pre_ping=os.getenv("DB_POOL_PRE_PING", str(cls.pool_pre_ping)).lower() in ("1", "true", "yes"),
+            statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", cls.statement_cache_size)),
+            statement_timeout_ms=int(os.getenv("DB_STATEMENT_TIMEOUT_MS", cls.statement_timeout_ms)),
+        )
+
+
+class PoolMetrics:
+    """ Checkout counters used to size the pool from measured wait times """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """ Queue pool that records how long each checkout waited for a connection """
+
+    def connect(self):
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            pool_metrics.record(perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record(perf_counter() - start)
+        return connection
+
+
+def create_engine_from_settings(url: str, settings: EngineSettings):
+    connect_args = {"prepared_statement_cache_size": settings.statement_cache_size}
+    if settings.statement_timeout_ms:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.statement_timeout_ms)}
+
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+engine_settings = EngineSettings.from_env()
+engine = create_engine_from_settings(db_url, engine_settings)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -19,6 +104,23 @@ async def get_db_session():
         yield session
 
 
+def get_pool_status():
+    """ Current pool saturation plus cumulative checkout wait times """
+    pool = engine.pool
+    checkouts = pool_metrics.checkouts
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": engine_settings.max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": checkouts,
+        "timeouts": pool_metrics.timeouts,
+        "avg_wait_ms": round(pool_metrics.total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+        "max_wait_ms": round(pool_metrics.max_wait * 1000, 3),
+    }
+
+
 # from sqlalchemy import create_engine
 # from sqlalchemy.orm import Session
 # import os
@@ -1,16 +1,34 @@
-from fastapi import Depends, HTTPException, Header, status
+from fastapi import Depends
 from users.services import verify_jwt_token
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from exception import HTTPUnauthorized
+from exception import HTTPUnauthorized, HTTPForbidden
+from enums import Permission
 
 security = HTTPBearer()
 
 async def get_current_user(credential: HTTPAuthorizationCredentials = Depends(security)):
     if not credential:
         raise HTTPUnauthorized("Authorization header missing")
-    try:
-        decoded_token = await verify_jwt_token(credential)
-    except HTTPException as e:
-        raise e
+    return await verify_jwt_token(credential)
 
-    return decoded_token
+
+def ensure_permission(current_user: dict, *permissions: Permission):
+    """ Raise HTTPForbidden unless the role in the access token has every given permission """
+    required = 0
+    for permission in permissions:
+        required |= permission
+
+    if (current_user.get("perm", 0) & required) != required:
+        raise HTTPForbidden("You do not have permission to perform this action")
+
+
+def require_permission(*permissions: Permission):
+    """
+        Dependency allowing the request only when the role in the access token has every given permission.
+        Checked against the token's permission bits, no database access.
+    """
+    async def check_permission(current_user: dict = Depends(get_current_user)):
+        ensure_permission(current_user, *permissions)
+        return current_user
+
+    return check_permission
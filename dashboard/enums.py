@@ -14,4 +14,40 @@ PERMISSION_DETAIL_SCHEMA = {
     "user" : UserDetail,
     "within_event" : WithinEventDetail,
     "page" : PageDetail
-}
\ No newline at end of file
+}
+
+class Permission(enum.IntFlag):
+    """
+        Bit of each Role can_* flag and RoleAccessPage *_page flag in Role.permissions.
+        Bits are stored and embedded in access tokens, only ever append new members.
+    """
+    can_edit = 1 << 0
+    can_create = 1 << 1
+    can_delete = 1 << 2
+    can_edit_users = 1 << 3
+    can_create_users = 1 << 4
+    can_delete_users = 1 << 5
+    can_edit_roles = 1 << 6
+    can_create_roles = 1 << 7
+    can_delete_roles = 1 << 8
+    can_edit_events = 1 << 9
+    can_create_events = 1 << 10
+    can_delete_events = 1 << 11
+
+    home_page = 1 << 12
+    event_page = 1 << 13
+    user_page = 1 << 14
+    profile_page = 1 << 15
+    role_page = 1 << 16
+    tiesheet_page = 1 << 17
+    group_page = 1 << 18
+    round_config_page = 1 << 19
+    qualifier_page = 1 << 20
+    participants_page = 1 << 21
+    column_config_page = 1 << 22
+    group_stage_standing_page = 1 << 23
+    todays_game_page = 1 << 24
+    event_role_page = 1 << 25
+
+ROLE_PERMISSIONS = [permission for permission in Permission if permission.name.startswith("can_")]
+PAGE_PERMISSIONS = [permission for permission in Permission if permission.name.endswith("_page")]
@@ -0,0 +1,64 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from sqlalchemy import select, delete
+from models import Tiesheet, TiesheetPlayer
+from events.tiesheet.schema import TiesheetStatus
+
+def seed_order(size : int) -> list[int]:
+    """ Seeds in bracket slot order, so seed 1 and 2 can only meet in the final """
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+async def advance_winner(db : AsyncSession, tiesheet_id : UUID):
+    """
+        Move the winner of a completed bracket tiesheet into its slot of the next round.
+        A previously advanced player of the same tiesheet is replaced when the winner changed.
+    """
+    result = await db.execute(
+        select(Tiesheet.stage_id, Tiesheet.bracket_round, Tiesheet.bracket_position, Tiesheet.status)
+        .where(Tiesheet.id == tiesheet_id)
+    )
+    tiesheet = result.one_or_none()
+    if not tiesheet or tiesheet.bracket_round is None or tiesheet.status != TiesheetStatus.completed.value:
+        return
+
+    result = await db.execute(
+        select(TiesheetPlayer.user_id, TiesheetPlayer.is_winner).where(TiesheetPlayer.tiesheet_id == tiesheet_id)
+    )
+    players = result.all()
+    winners = [user_id for user_id, is_winner in players if is_winner]
+    if len(winners) != 1:
+        return
+    winner = winners[0]
+
+    result = await db.execute(
+        select(Tiesheet.id).where(
+            Tiesheet.stage_id == tiesheet.stage_id,
+            Tiesheet.bracket_round == tiesheet.bracket_round + 1,
+            Tiesheet.bracket_position == tiesheet.bracket_position // 2,
+        )
+    )
+    next_tiesheet_id = result.scalar_one_or_none()
+    # The final has no next slot
+    if next_tiesheet_id is None:
+        return
+
+    await db.execute(
+        delete(TiesheetPlayer).where(
+            TiesheetPlayer.tiesheet_id == next_tiesheet_id,
+            TiesheetPlayer.user_id.in_([user_id for user_id, _ in players if user_id != winner]),
+        )
+    )
+
+    result = await db.execute(
+        select(TiesheetPlayer.id).where(
+            TiesheetPlayer.tiesheet_id == next_tiesheet_id,
+            TiesheetPlayer.user_id == winner,
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        db.add(TiesheetPlayer(tiesheet_id=next_tiesheet_id, user_id=winner))
+        await db.flush()
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated
+from uuid import UUID
+from db_connect import get_db_session
+from events.bracket.schema import GenerateBracket
+from events.bracket.services import BracketServices
+
+router = APIRouter()
+
+@router.post("/{stage_id}")
+async def generate_bracket(
+    stage_id: UUID,
+    bracket: GenerateBracket,
+    db: Annotated[AsyncSession, Depends(get_db_session)]
+):
+    return await BracketServices.generate_bracket(db=db, stage_id=stage_id, bracket=bracket)
+
+@router.get("/{stage_id}")
+async def retrieve_bracket(
+    stage_id: UUID,
+    db: Annotated[AsyncSession, Depends(get_db_session)]
+):
+    return await BracketServices.retrieve_bracket(db=db, stage_id=stage_id)
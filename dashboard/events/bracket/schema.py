@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import date, time
+
+class GenerateBracket(BaseModel):
+    start_date : date
+    start_time : time
+    # Seed qualifiers by the standings of this stage, qualifier order when not set
+    seed_stage_id : UUID | None = None
+    slot_minutes : int = Field(default=30, ge=0)
+    # Days between two bracket rounds
+    round_interval_days : int = Field(default=1, ge=0)
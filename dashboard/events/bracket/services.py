@@ -0,0 +1,147 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, and_
+from sqlalchemy.exc import SQLAlchemyError
+from models import Qualifier, Standing, Tiesheet, TiesheetPlayer
+from events.bracket.schema import GenerateBracket
+from events.bracket.crud import seed_order
+from events.stage.crud import extract_stage_by_id
+from events.tiesheet.schema import TiesheetStatus
+from events.crud import touch_event_of
+from exception import HTTPBadRequest, HTTPConflict, HTTPInternalServer
+
+class BracketServices:
+    @staticmethod
+    async def extract_seeded_qualifiers(db : AsyncSession, stage_id : UUID, seed_stage_id : UUID | None = None) -> list[UUID]:
+        """ Qualifiers of a stage, best first by the standings of seed_stage_id when given """
+        stmt = select(Qualifier.user_id).where(Qualifier.stage_id == stage_id)
+
+        if seed_stage_id is not None:
+            stmt = (
+                stmt.outerjoin(
+                    Standing,
+                    and_(Standing.user_id == Qualifier.user_id, Standing.stage_id == seed_stage_id)
+                )
+                .order_by(Standing.points.desc().nulls_last(), Qualifier.created_at)
+            )
+        else:
+            stmt = stmt.order_by(Qualifier.created_at)
+
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    @staticmethod
+    async def generate_bracket(db : AsyncSession, stage_id : UUID, bracket : GenerateBracket):
+        await extract_stage_by_id(db=db, stage_id=stage_id)
+
+        result = await db.execute(
+            select(Tiesheet.id).where(Tiesheet.stage_id == stage_id, Tiesheet.bracket_round.is_not(None)).limit(1)
+        )
+        if result.scalar_one_or_none() is not None:
+            raise HTTPConflict("Bracket already exists for this stage")
+
+        players = await BracketServices.extract_seeded_qualifiers(
+            db=db, stage_id=stage_id, seed_stage_id=bracket.seed_stage_id
+        )
+        if len(players) < 2:
+            raise HTTPBadRequest("A bracket needs at least two qualifiers")
+
+        size = 1
+        while size < len(players):
+            size *= 2
+        rounds = size.bit_length() - 1
+
+        # Round 1 slots in seed order; seeds past the number of players are byes
+        slots = [players[seed - 1] if seed <= len(players) else None for seed in seed_order(size)]
+
+        # Players of each slot before scheduling, a bye sends its player straight to round 2
+        seats = {}
+        for position in range(size // 2):
+            home, away = slots[2 * position], slots[2 * position + 1]
+            if home is not None and away is not None:
+                seats[(1, position)] = [home, away]
+            else:
+                seats.setdefault((2, position // 2), []).append(home or away)
+
+        start = datetime.combine(bracket.start_date, bracket.start_time)
+        tiesheets = []
+        tiesheet_players = []
+        for bracket_round in range(1, rounds + 1):
+            round_start = start + timedelta(days=(bracket_round - 1) * bracket.round_interval_days)
+            slot = 0
+            for position in range(size // 2 ** bracket_round):
+                # Round 1 slots decided by a bye get no tiesheet
+                if bracket_round == 1 and (1, position) not in seats:
+                    continue
+
+                scheduled_at = round_start + timedelta(minutes=slot * bracket.slot_minutes)
+                slot += 1
+                tiesheet_id = uuid4()
+                tiesheets.append({
+                    "id": tiesheet_id,
+                    "stage_id": stage_id,
+                    "scheduled_date": scheduled_at.date(),
+                    "scheduled_time": scheduled_at.time(),
+                    "status": TiesheetStatus.scheduled.value,
+                    "bracket_round": bracket_round,
+                    "bracket_position": position,
+                })
+                tiesheet_players += [
+                    {"id": uuid4(), "tiesheet_id": tiesheet_id, "user_id": user_id}
+                    for user_id in seats.get((bracket_round, position), [])
+                ]
+
+        try:
+            await db.execute(insert(Tiesheet), tiesheets)
+            await db.execute(insert(TiesheetPlayer), tiesheet_players)
+            await touch_event_of(db=db, stage_id=stage_id)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPInternalServer("Failed to generate bracket")
+
+        return {
+            "message": "Bracket generated successfully",
+            "rounds": rounds,
+            "tiesheets_created": len(tiesheets),
+        }
+
+    @staticmethod
+    async def retrieve_bracket(db : AsyncSession, stage_id : UUID):
+        """ Bracket tiesheets of a stage grouped by round """
+        result = await db.execute(
+            select(
+                Tiesheet.id.label("tiesheet_id"),
+                Tiesheet.bracket_round,
+                Tiesheet.bracket_position,
+                Tiesheet.status,
+                Tiesheet.scheduled_date,
+                Tiesheet.scheduled_time,
+                TiesheetPlayer.user_id,
+                TiesheetPlayer.is_winner,
+            )
+            .outerjoin(TiesheetPlayer, TiesheetPlayer.tiesheet_id == Tiesheet.id)
+            .where(Tiesheet.stage_id == stage_id, Tiesheet.bracket_round.is_not(None))
+            .order_by(Tiesheet.bracket_round, Tiesheet.bracket_position, TiesheetPlayer.created_at)
+        )
+
+        rounds = {}
+        for row in result.all():
+            tiesheets = rounds.setdefault(row.bracket_round, {})
+            if row.tiesheet_id not in tiesheets:
+                tiesheets[row.tiesheet_id] = {
+                    "tiesheet_id": row.tiesheet_id,
+                    "position": row.bracket_position,
+                    "status": row.status,
+                    "scheduled_date": row.scheduled_date,
+                    "scheduled_time": row.scheduled_time,
+                    "players": [],
+                }
+            if row.user_id is not None:
+                tiesheets[row.tiesheet_id]["players"].append({"user_id": row.user_id, "is_winner": row.is_winner})
+
+        return [
+            {"round": bracket_round, "tiesheets": list(tiesheets.values())}
+            for bracket_round, tiesheets in rounds.items()
+        ]
@@ -1,8 +1,48 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from models import Event
+from models import Event, Stage, Group, Tiesheet, Match, StandingColumn, user_event_association
 from sqlalchemy import select
+from cache import touch_event
 
 async def extract_event_by_id(db : AsyncSession, event_id : UUID):
     result = await db.execute(select(Event).where(Event.id == event_id))
-    return result.scalars().first()
\ No newline at end of file
+    return result.scalars().first()
+
+async def touch_event_of(
+    db : AsyncSession,
+    stage_id : UUID | None = None,
+    group_id : UUID | None = None,
+    tiesheet_id : UUID | None = None,
+    match_id : UUID | None = None,
+    column_id : UUID | None = None,
+):
+    """ Mark the event a stage, group, tiesheet, match or standing column belongs to as changed """
+    if stage_id is not None:
+        stmt = select(Stage.event_id).where(Stage.id == stage_id)
+    elif group_id is not None:
+        stmt = select(Group.event_id).where(Group.id == group_id)
+    elif tiesheet_id is not None:
+        stmt = select(Stage.event_id).join(Tiesheet, Tiesheet.stage_id == Stage.id).where(Tiesheet.id == tiesheet_id)
+    elif match_id is not None:
+        stmt = (
+            select(Stage.event_id)
+            .join(Tiesheet, Tiesheet.stage_id == Stage.id)
+            .join(Match, Match.tiesheet_id == Tiesheet.id)
+            .where(Match.id == match_id)
+        )
+    elif column_id is not None:
+        stmt = select(Stage.event_id).join(StandingColumn, StandingColumn.stage_id == Stage.id).where(StandingColumn.id == column_id)
+    else:
+        return
+
+    result = await db.execute(stmt)
+    touch_event(db, result.scalar_one_or_none())
+
+
+async def touch_events_of_user(db : AsyncSession, user_id : UUID):
+    """ Mark every event a user takes part in as changed, cached payloads carry their username """
+    result = await db.execute(
+        select(user_event_association.c.event_id).where(user_event_association.c.user_id == user_id)
+    )
+    for event_id in result.scalars().all():
+        touch_event(db, event_id)
@@ -5,6 +5,7 @@ from typing import Annotated
 from events.eventrole.schema import createEventRole, EditEventRole
 from events.eventrole.services import EventRoleServices
 from uuid import UUID
+from services import PaginationMode, TotalCount
 
 router = APIRouter()
 
@@ -19,13 +20,19 @@ async def get_event_role(
     role_id : UUID | None = None,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    pagination: PaginationMode = PaginationMode.offset,
+    cursor: str | None = None,
+    total_count: TotalCount = TotalCount.exact,
 ):
     return await EventRoleServices.get_event_role(
         db=db, 
         event_id = event_id, 
         role_id = role_id,
         page = page,
-        limit = limit
+        limit = limit,
+        pagination = pagination,
+        cursor = cursor,
+        total_count = total_count
     )
 
 @router.put("/{event_role_id}")
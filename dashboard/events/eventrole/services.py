@@ -4,19 +4,29 @@ from events.eventrole.schema import createEventRole, EventRoleResponse, EditEven
 from models import UserRole, User, Role
 from sqlalchemy.exc import SQLAlchemyError
 from exception import HTTPInternalServer
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, delete, tuple_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from uuid import uuid4
+from datetime import datetime
 from events.eventrole.crud import extract_event_role_by_id
+from roles.permissions import invalidate_user_permissions
+from services import PaginationMode, TotalCount, count_rows, decode_cursor, encode_cursor, total_pages
 
 class EventRoleServices:
     @staticmethod
     async def create_event_role( db :AsyncSession, event_id : UUID, eventrole: createEventRole):
         try:
-            new_event_role = UserRole(
-                user_id = eventrole.user_id,
-                event_id = event_id,
-                role_id = eventrole.role_id
+            # Participants already hold the member role in the event, assigning a role replaces it
+            stmt = (
+                pg_insert(UserRole)
+                .values(id=uuid4(), user_id=eventrole.user_id, event_id=event_id, role_id=eventrole.role_id)
+                .on_conflict_do_update(
+                    constraint="uq_userrole_user_event",
+                    set_={"role_id": eventrole.role_id, "updated_at": func.now()},
+                )
             )
-            db.add(new_event_role)
+            await db.execute(stmt)
+            invalidate_user_permissions(db, eventrole.user_id)
             await db.commit()
             return{
                 "message" : "EventRole added successfully"
@@ -31,11 +41,12 @@ class EventRoleServices:
         event_id: UUID,
         page: int,
         limit: int,
-        role_id: UUID | None = None
+        role_id: UUID | None = None,
+        pagination: PaginationMode = PaginationMode.offset,
+        cursor: str | None = None,
+        total_count: TotalCount = TotalCount.exact,
     ):
         try:
-            skip = (page - 1) * limit
-
             base_stmt = (
                 select(
                     UserRole.id,
@@ -52,13 +63,32 @@ class EventRoleServices:
             if role_id:
                 base_stmt = base_stmt.where(UserRole.role_id == role_id)
 
-            count_stmt = select(func.count()).select_from(
-                base_stmt.subquery()
-            )
+            total = await count_rows(db=db, stmt=base_stmt, mode=total_count)
+
+            if pagination == PaginationMode.cursor:
+                stmt = base_stmt.add_columns(UserRole.created_at).order_by(UserRole.created_at, UserRole.id)
+                if cursor:
+                    created_at, event_role_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+                    stmt = stmt.where(tuple_(UserRole.created_at, UserRole.id) > (created_at, event_role_id))
 
-            total_result = await db.execute(count_stmt)
-            total = total_result.scalar_one()
+                result = await db.execute(stmt.limit(limit + 1))
+                event_roles = result.mappings().all()
+                next_cursor = None
+                if len(event_roles) > limit:
+                    event_roles = event_roles[:limit]
+                    next_cursor = encode_cursor(event_roles[-1]["created_at"], event_roles[-1]["id"])
 
+                return {
+                    "limit": limit,
+                    "next_cursor": next_cursor,
+                    "total_pages": total_pages(total, limit),
+                    "data": [
+                        EventRoleResponse.model_validate(er)
+                        for er in event_roles
+                    ]
+                }
+
+            skip = (page - 1) * limit
             stmt = base_stmt.offset(skip).limit(limit)
 
             result = await db.execute(stmt)
@@ -67,7 +97,7 @@ class EventRoleServices:
             return {
                 "page": page,
                 "limit": limit,
-                "total_pages" : (total + limit -1) // limit,
+                "total_pages" : total_pages(total, limit),
                 "data": [
                     EventRoleResponse.model_validate(er)
                     for er in event_roles
@@ -82,6 +112,7 @@ class EventRoleServices:
     async def edit_event_role( db: AsyncSession, event_role_id : UUID, editeventrole : EditEventRole):
         try:
             event_role = await extract_event_role_by_id(db=db,event_role_id=event_role_id)
+            previous_user_id = event_role.user_id
             
             if editeventrole.user_id != "":
                 event_role.user_id = editeventrole.user_id
@@ -89,6 +120,7 @@ class EventRoleServices:
             if editeventrole.role_id != "":
                 event_role.role_id = editeventrole.role_id
 
+            invalidate_user_permissions(db, previous_user_id, event_role.user_id)
             await db.commit()
             return{
                 "message" : "Event Role updated successfully"
@@ -100,10 +132,11 @@ class EventRoleServices:
     @staticmethod
     async def delete_event_role(db : AsyncSession, event_role_id : UUID):
         try:
-            await extract_event_role_by_id(db=db, event_role_id=event_role_id)
+            event_role = await extract_event_role_by_id(db=db, event_role_id=event_role_id)
 
             stmt = delete(UserRole).where(UserRole.id == event_role_id)
             await db.execute(stmt)
+            invalidate_user_permissions(db, event_role.user_id)
             await db.commit()
 
             return {
@@ -0,0 +1,64 @@
+from uuid import UUID
+from sqlalchemy import select, literal
+from models import (
+    Stage, Group, User, StandingColumn, ColumnValues,
+    Tiesheet, TiesheetPlayer, Match, Tiesheetplayermatchscore,
+)
+
+# Columns of every exported record, the CSV header
+EXPORT_FIELDS = [
+    "record", "stage", "group", "tiesheet_id", "scheduled_date", "scheduled_time", "tiesheet_status",
+    "match_id", "match_name", "user_id", "username", "is_winner", "points", "winner", "column", "value",
+]
+
+def score_rows_stmt(event_id : UUID):
+    """ One row per player per match of every tiesheet in the event, players without a match included """
+    return (
+        select(
+            literal("score").label("record"),
+            Stage.name.label("stage"),
+            Group.name.label("group"),
+            Tiesheet.id.label("tiesheet_id"),
+            Tiesheet.scheduled_date,
+            Tiesheet.scheduled_time,
+            Tiesheet.status.label("tiesheet_status"),
+            Match.id.label("match_id"),
+            Match.match_name,
+            TiesheetPlayer.user_id,
+            User.username,
+            TiesheetPlayer.is_winner,
+            Tiesheetplayermatchscore.points,
+            Tiesheetplayermatchscore.winner,
+        )
+        .select_from(Tiesheet)
+        .join(Stage, Stage.id == Tiesheet.stage_id)
+        .outerjoin(Group, Group.id == Tiesheet.group_id)
+        .join(TiesheetPlayer, TiesheetPlayer.tiesheet_id == Tiesheet.id)
+        .join(User, User.id == TiesheetPlayer.user_id)
+        .outerjoin(Tiesheetplayermatchscore, Tiesheetplayermatchscore.tiesheetplayer_id == TiesheetPlayer.id)
+        .outerjoin(Match, Match.id == Tiesheetplayermatchscore.match_id)
+        .where(Stage.event_id == event_id)
+        .order_by(
+            Stage.created_at, Tiesheet.scheduled_date, Tiesheet.scheduled_time, Tiesheet.id,
+            Match.created_at, TiesheetPlayer.created_at,
+        )
+    )
+
+def column_value_rows_stmt(event_id : UUID):
+    """ Final standing column values of every stage in the event """
+    return (
+        select(
+            literal("column_value").label("record"),
+            Stage.name.label("stage"),
+            ColumnValues.user_id,
+            User.username,
+            StandingColumn.column_field.label("column"),
+            ColumnValues.value,
+        )
+        .select_from(ColumnValues)
+        .join(StandingColumn, StandingColumn.id == ColumnValues.column_id)
+        .join(Stage, Stage.id == StandingColumn.stage_id)
+        .join(User, User.id == ColumnValues.user_id)
+        .where(Stage.event_id == event_id)
+        .order_by(Stage.created_at, User.username, StandingColumn.created_at)
+    )
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated
+from uuid import UUID
+from db_connect import get_db_session
+from events.crud import extract_event_by_id
+from events.export.schema import ExportFormat
+from events.export.services import ExportServices
+from exception import HTTPNotFound
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+@router.get("/{event_id}")
+async def export_event_results(
+    event_id: UUID,
+    db: Annotated[AsyncSession, Depends(get_db_session)],
+    format: ExportFormat = ExportFormat.ndjson,
+):
+    event = await extract_event_by_id(db=db, event_id=event_id)
+    if not event:
+        raise HTTPNotFound("Event not found")
+
+    return StreamingResponse(
+        ExportServices.stream_event_results(event_id=event_id, export_format=format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="event-{event_id}.{format.value}"'},
+    )
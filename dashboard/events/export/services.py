@@ -0,0 +1,45 @@
+from uuid import UUID
+from typing import AsyncIterator
+from csv import DictWriter
+from io import StringIO
+from pydantic_core import to_json
+from dotenv import load_dotenv
+from db_connect import AsyncSessionLocal
+from events.export.schema import ExportFormat
+from events.export.crud import EXPORT_FIELDS, score_rows_stmt, column_value_rows_stmt
+import os
+
+load_dotenv()
+# Rows fetched from the server-side cursor, and written to the client, per round trip
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+def encode_ndjson(rows) -> bytes:
+    return b"".join(to_json(dict(row)) + b"\n" for row in rows)
+
+def encode_csv(rows, header : bool = False) -> bytes:
+    buffer = StringIO()
+    writer = DictWriter(buffer, fieldnames=EXPORT_FIELDS, restval="")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+class ExportServices:
+    @staticmethod
+    async def stream_event_results(event_id : UUID, export_format : ExportFormat) -> AsyncIterator[bytes]:
+        """
+            Every score of the event followed by the final standing column values, one batch at a time.
+            Runs on its own session, the body is sent after the request's session is released,
+            and rows come from a server-side cursor so memory stays flat whatever the season size.
+        """
+        if export_format == ExportFormat.csv:
+            yield encode_csv([], header=True)
+
+        async with AsyncSessionLocal() as session:
+            for stmt in (score_rows_stmt(event_id), column_value_rows_stmt(event_id)):
+                result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+                async for rows in result.mappings().partitions():
+                    if export_format == ExportFormat.csv:
+                        yield encode_csv(rows)
+                    else:
+                        yield encode_ndjson(rows)
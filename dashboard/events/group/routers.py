@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends
-from events.group.schema import GroupDetail, GroupUpdate, AddGroupMember, GroupTableUpdate, GroupEvent, GroupByRound, GroupMember
+from fastapi import APIRouter, Depends, Request, Response
+from events.group.schema import GroupDetail, GroupUpdate, AddGroupMember, GroupTableUpdate, GroupEvent, GroupByRound, GroupMember, GenerateSchedule
 from models import Group, GroupMembers, User
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
@@ -8,6 +8,9 @@ from uuid import UUID
 from db_connect import get_db_session
 from events.group.service import GroupServices
 from events.group.crud import extract_group_by_id
+from events.crud import touch_event_of
+from cache import touch_event, response_cache
+from conditional import conditional_get
 
 router = APIRouter()
 
@@ -30,8 +33,15 @@ async def extract_group_by_event(stage_id:UUID,db: Annotated[AsyncSession, Depen
     
 
 @router.get("/event/{event_id}")
-async def retrieve_group(db: Annotated[AsyncSession, Depends(get_db_session)],event_id : UUID):
-    return await GroupServices.get_group_detail_in_event_services(db=db, event_id=event_id)
+async def retrieve_group(request: Request, response: Response, db: Annotated[AsyncSession, Depends(get_db_session)],event_id : UUID):
+    not_modified, version = await conditional_get(request, response, db, event_id, {})
+    if not_modified:
+        return not_modified
+
+    return await response_cache.get_or_load(
+        "group_detail", event_id, version, {},
+        lambda: GroupServices.get_group_detail_in_event_services(db=db, event_id=event_id)
+    )
 
 
 @router.patch("/{group_id}")
@@ -47,10 +57,11 @@ async def delete_group(
     group_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db_session)]
 ):
-    await extract_group_by_id(db=db, group_id=group_id)
+    group = await extract_group_by_id(db=db, group_id=group_id)
     
     stmt = delete(Group).where(Group.id == group_id)
     await db.execute(stmt)
+    touch_event(db, group.event_id)
     await db.commit()
 
     return {
@@ -67,6 +78,7 @@ async def add_group_member(
         user_id = group_member_detail.user_id
     )
     db.add(new_group_member)
+    await touch_event_of(db=db, group_id=group_member_detail.group_id)
     await db.commit()
     return{
         "message" : "Group Member added successfully",
@@ -83,6 +95,15 @@ async def update_group_table_data(
     return await GroupServices.update_group_table_data(db=db, table_update=table_update, group_id=group_id)
     
 
+@router.post("/{group_id}/schedule")
+async def generate_schedule(
+    group_id: UUID,
+    schedule: GenerateSchedule,
+    db: Annotated[AsyncSession, Depends(get_db_session)]
+):
+    return await GroupServices.generate_schedule(db=db, group_id=group_id, schedule=schedule)
+
+
 @router.delete("/member/{user_id}/group/{group_id}")
 async def delete_group_member(
     user_id: UUID,
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from typing import Optional, List
+from datetime import date, time
 
 class GroupDetail(BaseModel):
     round_id : UUID
@@ -47,4 +48,13 @@ class GroupMember(BaseModel):
     id: UUID
     username : str
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+class GenerateSchedule(BaseModel):
+    start_date : date
+    start_time : time
+    double_round_robin : bool = False
+    # Fixtures per day, a whole round per day when not set
+    matches_per_day : int | None = Field(default=None, ge=1)
+    slot_minutes : int = Field(default=30, ge=0)
+    # Pairs that already have a tiesheet in the stage are skipped instead of rejected
+    skip_existing : bool = True
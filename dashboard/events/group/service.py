@@ -1,14 +1,21 @@
 from sqlalchemy.ext.asyncio import AsyncSession 
 from uuid import UUID
-from models import Group, Stage, User, ColumnValues, GroupMembers, StandingColumn
+from uuid import uuid4
+from datetime import datetime, timedelta
+from models import Group, Stage, User, ColumnValues, GroupMembers, StandingColumn, Tiesheet, TiesheetPlayer
 from fastapi import HTTPException, status
-from sqlalchemy import select, and_, delete
+from sqlalchemy import select, and_, delete, insert
 from events.crud import extract_event_by_id
+from events.crud import touch_event_of
+from cache import touch_event
 from exception import HTTPNotFound
-from events.group.schema import GroupDetail, GroupUpdate, GroupTableUpdate
+from events.group.schema import GroupDetail, GroupUpdate, GroupTableUpdate, GenerateSchedule
 from sqlalchemy.exc import SQLAlchemyError
-from exception import HTTPNotFound, HTTPInternalServer
+from exception import HTTPNotFound, HTTPInternalServer, HTTPBadRequest, HTTPConflict
 from events.group.crud import extract_group_by_id
+from events.standingcolumn.crud import upsert_column_values
+from events.tiesheet.crud import extract_stage_pairings
+from events.tiesheet.schema import TiesheetStatus
 from sqlalchemy.orm import aliased
 
 class GroupServices:
@@ -149,6 +156,7 @@ class GroupServices:
                 for user_id in group.participants_ids
             ]
             db.add_all(members)
+            touch_event(db, event_id)
 
             await db.commit()
 
@@ -178,6 +186,7 @@ class GroupServices:
                     for user_id in group_update.participants_ids
                 ]
                 db.add_all(new_members)
+                touch_event(db, group.event_id)
 
                 await db.commit()
                 return {
@@ -190,27 +199,15 @@ class GroupServices:
     @staticmethod
     async def update_group_table_data( db : AsyncSession, group_id : UUID, table_update : GroupTableUpdate ):
         try:
-            for member_data in table_update.members:
-                for column_data in member_data.columns:
-                    # Check if column value exists
-                    stmt = select(ColumnValues).where(
-                        ColumnValues.user_id == member_data.user_id,
-                        ColumnValues.column_id == column_data.column_id
-                    )
-                    result = await db.execute(stmt)
-                    existing_value = result.scalar_one_or_none()
-
-                    if existing_value:
-                        # Update existing value
-                        existing_value.value = column_data.value
-                    else:
-                        # Create new column value
-                        new_value = ColumnValues(
-                            user_id=member_data.user_id,
-                            column_id=column_data.column_id,
-                            value=column_data.value
-                        )
-                        db.add(new_value)
+            await upsert_column_values(
+                db=db,
+                values=[
+                    (member_data.user_id, column_data.column_id, column_data.value)
+                    for member_data in table_update.members
+                    for column_data in member_data.columns
+                ]
+            )
+            await touch_event_of(db=db, group_id=group_id)
             
             await db.commit()
             return {
@@ -245,7 +242,103 @@ class GroupServices:
                 GroupMembers.group_id == group_id
             )
         )
+        await touch_event_of(db=db, group_id=group_id)
         await db.commit()
         return {
             "message": f"Member {username} removed from group {group_name} successfully"
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def round_robin_rounds(players : list[UUID], double_round_robin : bool = False) -> list[list[tuple[UUID, UUID]]]:
+        """
+            Pairings of a round robin by the circle method, one list of fixtures per round.
+            With an odd number of players one player has a bye each round.
+            The second leg of a double round robin repeats the rounds with sides swapped.
+        """
+        slots = list(players)
+        if len(slots) % 2:
+            slots.append(None)
+
+        rounds = []
+        for _ in range(len(slots) - 1):
+            half = len(slots) // 2
+            fixtures = [
+                (slots[i], slots[-1 - i])
+                for i in range(half)
+                if slots[i] is not None and slots[-1 - i] is not None
+            ]
+            rounds.append(fixtures)
+            # Keep the first player fixed and rotate everyone else
+            slots = [slots[0], slots[-1], *slots[1:-1]]
+
+        if double_round_robin:
+            rounds += [[(away, home) for home, away in fixtures] for fixtures in rounds]
+        return rounds
+
+    @staticmethod
+    async def generate_schedule(db : AsyncSession, group_id : UUID, schedule : GenerateSchedule):
+        group = await extract_group_by_id(db=db, group_id=group_id)
+
+        result = await db.execute(
+            select(GroupMembers.user_id)
+            .where(GroupMembers.group_id == group_id)
+            .order_by(GroupMembers.created_at, GroupMembers.user_id)
+        )
+        players = result.scalars().all()
+        if len(players) < 2:
+            raise HTTPBadRequest("A group needs at least two members to generate a schedule")
+
+        rounds = GroupServices.round_robin_rounds(players, schedule.double_round_robin)
+
+        # One query for every pairing the stage already has, instead of a check per fixture
+        existing = await extract_stage_pairings(db=db, stage_id=group.stage_id, players=players)
+        fixtures = []
+        for round_fixtures in rounds:
+            for fixture in round_fixtures:
+                pair = frozenset(fixture)
+                if existing[pair] > 0:
+                    if not schedule.skip_existing:
+                        raise HTTPConflict("Tiesheet already exists")
+                    existing[pair] -= 1
+                    continue
+                fixtures.append(fixture)
+
+        if not fixtures:
+            return {"message": "Schedule already generated", "tiesheets_created": 0}
+
+        # Consecutive fixtures share a day and take the next time slot
+        per_day = schedule.matches_per_day or len(rounds[0])
+        start = datetime.combine(schedule.start_date, schedule.start_time)
+
+        tiesheets = []
+        tiesheet_players = []
+        for index, fixture in enumerate(fixtures):
+            day, slot = divmod(index, per_day)
+            scheduled_at = start + timedelta(days=day, minutes=slot * schedule.slot_minutes)
+            tiesheet_id = uuid4()
+            tiesheets.append({
+                "id": tiesheet_id,
+                "group_id": group_id,
+                "stage_id": group.stage_id,
+                "scheduled_date": scheduled_at.date(),
+                "scheduled_time": scheduled_at.time(),
+                "status": TiesheetStatus.scheduled.value,
+            })
+            tiesheet_players += [
+                {"id": uuid4(), "tiesheet_id": tiesheet_id, "user_id": user_id}
+                for user_id in fixture
+            ]
+
+        try:
+            await db.execute(insert(Tiesheet), tiesheets)
+            await db.execute(insert(TiesheetPlayer), tiesheet_players)
+            touch_event(db, group.event_id)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise HTTPInternalServer("Failed to generate schedule")
+
+        return {
+            "message": f"Schedule for group {group.name} generated successfully",
+            "tiesheets_created": len(tiesheets),
+        }
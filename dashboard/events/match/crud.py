@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from sqlalchemy import select
-from models import Match
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from models import Match, Tiesheetplayermatchscore
 from exception import HTTPNotFound
 
 async def extract_match_by_id(db:AsyncSession, match_id : UUID):
@@ -13,3 +14,18 @@ async def extract_match_by_id(db:AsyncSession, match_id : UUID):
     
     return match_info
 
+async def upsert_match_scores(db: AsyncSession, scores: list[dict]):
+    """ Insert or update player scores of many matches in one statement keyed on uq_match_tiesheetplayer """
+    if not scores:
+        return
+
+    stmt = insert(Tiesheetplayermatchscore).values(scores)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_match_tiesheetplayer",
+        set_={
+            "points": stmt.excluded.points,
+            "winner": stmt.excluded.winner,
+            "updated_at": func.now(),
+        }
+    )
+    await db.execute(stmt)
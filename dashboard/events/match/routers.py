@@ -8,6 +8,7 @@ from sqlalchemy import select, delete
 from events.match.schema import CreateMatchRequest, EditMatchRequest
 from events.match.services import MatchServices
 from events.match.crud import extract_match_by_id
+from events.crud import touch_event_of
 router = APIRouter()
 
 
@@ -46,6 +47,7 @@ async def delete_match(
     match_id : UUID
 ):
     match_info = await extract_match_by_id(db=db, match_id=match_id)
+    await touch_event_of(db=db, match_id=match_id)
     
     stmt = delete(Match).where(Match.id == match_id)
     await db.execute(stmt)
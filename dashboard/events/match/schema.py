@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from uuid import UUID
-from typing import List
+from typing import List, Literal
 
 class UserInfo(BaseModel):
     points : str | None
@@ -17,13 +17,15 @@ class EditMatchDetail(BaseModel):
     userDetail : List[UserInfo]
 
 class CreateMatchRequest(BaseModel):
-    overallwinner : UUID | str
+    # Empty when no winner is selected, a plain str would keep player ids from matching as UUID
+    overallwinner : UUID | Literal[""]
     status : str
     tiesheet_id : UUID
     matchDetail : List[MatchDetail]
 
 class EditMatchRequest(BaseModel):
-    overallwinner : UUID | str
+    # Empty when no winner is selected, a plain str would keep player ids from matching as UUID
+    overallwinner : UUID | Literal[""]
     status : str
     tiesheet_id : UUID
     matchDetail : List[EditMatchDetail]
@@ -1,28 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from uuid import UUID
+from uuid import UUID, uuid4
 from models import TiesheetPlayer, Match, Tiesheetplayermatchscore, User, Tiesheet
-from sqlalchemy import select, and_, func
-from events.tiesheet.crud import get_tiesheet, extract_tiesheet_player_by_tiesheet_id
+from sqlalchemy import select, and_, func, update
+from events.tiesheet.crud import get_tiesheet, extract_tiesheet_player_ids, set_tiesheet_winners, extract_tiesheet_schedule
+from events.match.crud import upsert_match_scores
+from events.overalltiesheet.crud import refresh_tiesheet_standings
+from events.bracket.crud import advance_winner
+from events.crud import touch_event_of
+from live.hub import hub, event_topic, stage_topic, tiesheet_topic
 from events.match.schema import CreateMatchRequest, EditMatchRequest
 from exception import HTTPNotFound, HTTPBadRequest, HTTPInternalServer
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from exception import HTTPNotFound
 
-async def extract_tiesheet_player_id(db:AsyncSession,user_id : UUID, tiesheet_id : UUID):
-    stmt = select(TiesheetPlayer.id).where(
-        and_(
-            TiesheetPlayer.tiesheet_id == tiesheet_id,
-            TiesheetPlayer.user_id == user_id
-        )
-    )
-    result = await db.execute(stmt)
-    tiesheetplayer_id = result.one_or_none()
-    if tiesheetplayer_id is None:
-        raise HTTPNotFound("Tiesheet player not available")
-
-    return tiesheetplayer_id[0]
-
 class MatchServices:
     @staticmethod
     async def create_match( db:AsyncSession, request:CreateMatchRequest):
@@ -33,66 +24,87 @@ class MatchServices:
                 tiesheet.status = request.status
                 db.add(tiesheet)
 
+            # Resolve every player of the tiesheet once
+            player_ids = await extract_tiesheet_player_ids(db=db, tiesheet_id=request.tiesheet_id)
+
             # Update overall winner if status is completed and winner is selected
             if request.status == "completed" and request.overallwinner != "":
-                stmt = select(TiesheetPlayer).where(
-                    TiesheetPlayer.tiesheet_id == request.tiesheet_id,
-                    TiesheetPlayer.user_id == request.overallwinner
-                )
-                result = await db.execute(stmt)
-                tiesheet_player = result.scalars().one_or_none()
-
-                if tiesheet_player is None:
+                if request.overallwinner not in player_ids:
                     raise HTTPNotFound("Tiesheet player not found for overall winner")
 
-                tiesheet_player.is_winner = True
-                db.add(tiesheet_player)
+                await set_tiesheet_winners(db=db, tiesheet_id=request.tiesheet_id, winners={request.overallwinner: True})
+                await advance_winner(db=db, tiesheet_id=request.tiesheet_id)
 
-            stmt = select(Match).where(Match.tiesheet_id == request.tiesheet_id).options(selectinload(Match.matchscore)).order_by(Match.created_at)
+            # Points become mandatory once the first match of the tiesheet has points
+            stmt = (
+                select(Tiesheetplayermatchscore.points)
+                .join(Match, Match.id == Tiesheetplayermatchscore.match_id)
+                .where(Match.tiesheet_id == request.tiesheet_id)
+                .order_by(Match.created_at)
+                .limit(1)
+            )
             result = await db.execute(stmt)
-            match_info = result.scalars().all()
-            
+            points_required = result.scalar_one_or_none() is not None
+
             # Create matches and their scores
+            matches = []
+            scores = []
             for match_data in request.matchDetail:
-                # Create match
                 match = Match(
+                    id=uuid4(),
                     tiesheet_id=request.tiesheet_id,
                     match_name=match_data.match_name
                 )
-                db.add(match)
-                await db.flush()
+                matches.append(match)
 
-                # Create match scores for each user
                 for user_detail in match_data.userDetail:
-                    if len(match_info)>0 and match_info[0].matchscore.points is not None:
-                        if user_detail.points is None or user_detail.points == "":
-                            raise HTTPBadRequest("Points are required because the first match already has points")
-                        
-                    tiesheetplayer_id = await extract_tiesheet_player_id(
-                        db=db,
-                        user_id=user_detail.user_id,
-                        tiesheet_id=request.tiesheet_id
-                    )
+                    if points_required and (user_detail.points is None or user_detail.points == ""):
+                        raise HTTPBadRequest("Points are required because the first match already has points")
 
-                    if tiesheetplayer_id is None:
+                    if user_detail.user_id not in player_ids:
                         raise HTTPNotFound(
                             f"Tiesheet player not found for user_id: {user_detail.user_id}"
                         )
 
-                    pms = Tiesheetplayermatchscore(
-                        match_id=match.id,
-                        tiesheetplayer_id=tiesheetplayer_id,
-                        points=user_detail.points if user_detail.points else None,
-                        winner=user_detail.winner
-                    )
-                    db.add(pms)
+                    scores.append({
+                        "match_id": match.id,
+                        "tiesheetplayer_id": player_ids[user_detail.user_id],
+                        "points": user_detail.points if user_detail.points else None,
+                        "winner": user_detail.winner,
+                    })
 
-            await db.commit()
-            return {"message": "Match details added successfully"}
+            db.add_all(matches)
+            await db.flush()
+            await upsert_match_scores(db=db, scores=scores)
+            await refresh_tiesheet_standings(db=db, tiesheet_id=request.tiesheet_id)
+            await touch_event_of(db=db, tiesheet_id=request.tiesheet_id)
 
+            await db.commit()
         except SQLAlchemyError as e:
             await db.rollback()
             raise HTTPInternalServer(f"Database error: {str(e)}")
+
+        await MatchServices.publish_live_update(db=db, tiesheet_id=request.tiesheet_id, update="match.created")
+        return {"message": "Match details added successfully"}
+
+    @staticmethod
+    async def publish_live_update(db: AsyncSession, tiesheet_id: UUID, update: str):
+        """ Push what changed in the committed state of a tiesheet and its matches to live subscribers """
+        tiesheet = await extract_tiesheet_schedule(db=db, tiesheet_id=tiesheet_id)
+        if not tiesheet:
+            return
+
+        topics = [
+            event_topic(tiesheet["event_id"]),
+            stage_topic(tiesheet["stage_id"]),
+            tiesheet_topic(tiesheet_id),
+        ]
+        # Nobody is listening, skip building the payload
+        if not hub.has_subscribers(topics):
+            return
+
+        detail = await MatchServices.get_match_detail(db=db, tiesheet_id=tiesheet_id) or {}
+        hub.publish_state(topics, update, tiesheet_id, {**tiesheet, **detail})
         
     @staticmethod
     async def get_overall_score( db: AsyncSession, tiesheet_id : UUID):
@@ -209,72 +221,62 @@ class MatchServices:
                 tiesheet.status = request.status
                 db.add(tiesheet)
 
-            if request.overallwinner != "":
-                players = await extract_tiesheet_player_by_tiesheet_id(db=db, tiesheet_id=request.tiesheet_id)
-                
-                for player in players:
-                    player.is_winner = False
-
-                    db.add(player)
+            # Resolve every player of the tiesheet once
+            player_ids = await extract_tiesheet_player_ids(db=db, tiesheet_id=request.tiesheet_id)
 
-                stmt = select(TiesheetPlayer).where(
-                    TiesheetPlayer.tiesheet_id == request.tiesheet_id,
-                    TiesheetPlayer.user_id == request.overallwinner
-                )
-                result = await db.execute(stmt)
-                tiesheet_player = result.scalars().one_or_none()
-
-                if tiesheet_player is None:
+            if request.overallwinner != "":
+                if request.overallwinner not in player_ids:
                     raise HTTPNotFound("Tiesheet player not found for overall winner")
 
-                tiesheet_player.is_winner = True
-                db.add(tiesheet_player)
-
-                if request.matchDetail:
-                    # Update each match
-                    for match_data in request.matchDetail:
-
-                        stmt = select(Match).where(
-                            Match.id == match_data.match_id,
-                            Match.tiesheet_id == request.tiesheet_id
-                        ).options(selectinload(Match.matchscore))
-
-                        result = await db.execute(stmt)
-                        match = result.scalars().one_or_none()
-
-                        if match is None:
-                            raise HTTPNotFound(f"Match not found: {match_data.match_id}")
-                        match.match_name = match_data.match_name
-                        db.add(match)
-
-                        # Update user scores
-                        for user_detail in match_data.userDetail:
-                            tiesheetplayer_id = await extract_tiesheet_player_id(
-                                db=db,
-                                user_id=user_detail.user_id,
-                                tiesheet_id=request.tiesheet_id
-                            )
-                            # Get existing match score
-                            stmt = select(Tiesheetplayermatchscore).where(
-                                Tiesheetplayermatchscore.match_id == match.id,
-                                Tiesheetplayermatchscore.tiesheetplayer_id == tiesheetplayer_id
-                            )
-
-                            result = await db.execute(stmt)
-                            existing_score = result.scalars().one_or_none()
-                            if existing_score is None:
-                                raise HTTPNotFound("Match score not found")
-
-                            existing_score.points = (
-                                user_detail.points if user_detail.points != "" else None
-                            )
-                            print("User winner detail:", user_detail.winner)
-                            existing_score.winner = user_detail.winner
-                            db.add(existing_score)
-
-                await db.commit()
-                return {"message": "Match details updated successfully"}
+                # Only the selected player stays winner
+                await set_tiesheet_winners(
+                    db=db,
+                    tiesheet_id=request.tiesheet_id,
+                    winners={user_id: user_id == request.overallwinner for user_id in player_ids}
+                )
+                await advance_winner(db=db, tiesheet_id=request.tiesheet_id)
+
+            if request.matchDetail:
+                match_ids = {match_data.match_id for match_data in request.matchDetail}
+                result = await db.execute(
+                    select(Match.id).where(
+                        Match.id.in_(match_ids),
+                        Match.tiesheet_id == request.tiesheet_id
+                    )
+                )
+                missing = match_ids - set(result.scalars().all())
+                if missing:
+                    raise HTTPNotFound(f"Match not found: {missing.pop()}")
+
+                # Rename all matches with one executemany UPDATE by primary key
+                await db.execute(
+                    update(Match),
+                    [
+                        {"id": match_data.match_id, "match_name": match_data.match_name}
+                        for match_data in request.matchDetail
+                    ]
+                )
 
+                scores = []
+                for match_data in request.matchDetail:
+                    for user_detail in match_data.userDetail:
+                        if user_detail.user_id not in player_ids:
+                            raise HTTPNotFound("Tiesheet player not available")
+
+                        scores.append({
+                            "match_id": match_data.match_id,
+                            "tiesheetplayer_id": player_ids[user_detail.user_id],
+                            "points": user_detail.points if user_detail.points != "" else None,
+                            "winner": user_detail.winner,
+                        })
+                await upsert_match_scores(db=db, scores=scores)
+
+            await refresh_tiesheet_standings(db=db, tiesheet_id=request.tiesheet_id)
+            await touch_event_of(db=db, tiesheet_id=request.tiesheet_id)
+            await db.commit()
         except SQLAlchemyError as e:
             await db.rollback()
             raise HTTPInternalServer(f"Database error: {str(e)}")
+
+        await MatchServices.publish_live_update(db=db, tiesheet_id=request.tiesheet_id, update="match.updated")
+        return {"message": "Match details updated successfully"}
@@ -0,0 +1,236 @@
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, case, literal, literal_column, and_, true
+from sqlalchemy.dialects.postgresql import JSONB, insert
+
+from models import StandingColumn, ColumnValues, Standing, EventStanding, Tiesheet, TiesheetPlayer, Stage, user_event_association
+
+# Standing column (lowercased column_field) -> typed column of the projection
+STANDING_FIELDS = {
+    "match played": "match_played",
+    "win": "win",
+    "loss": "loss",
+    "draw": "draw",
+    "points": "points",
+}
+
+# Points of a completed tiesheet, as the default Points column counts them
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+
+def numeric_value(field: str):
+    """ Numeric value of one column for a user, 0 when missing or not a number """
+    return func.coalesce(
+        func.max(
+            case(
+                (func.lower(StandingColumn.column_field) == field, ColumnValues.numeric_value),
+                else_=None,
+            )
+        ),
+        0,
+    )
+
+
+async def refresh_standings(db: AsyncSession, stage_id: UUID, user_ids=None):
+    """
+        Rebuild the standings rows of a stage from its ColumnValues.
+        Only the given users are rebuilt when user_ids is passed.
+        Users no longer enrolled in the event are left out even while their ColumnValues remain.
+    """
+    delete_stmt = delete(Standing).where(Standing.stage_id == stage_id)
+    if user_ids is not None:
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return
+        delete_stmt = delete_stmt.where(Standing.user_id.in_(user_ids))
+    await db.execute(delete_stmt)
+
+    source = (
+        select(
+            StandingColumn.stage_id,
+            ColumnValues.user_id,
+            *(numeric_value(field) for field in STANDING_FIELDS),
+            func.coalesce(
+                func.jsonb_object_agg(func.lower(StandingColumn.column_field), ColumnValues.value),
+                literal_column("'{}'::jsonb", JSONB),
+            ),
+        )
+        .join(StandingColumn, ColumnValues.column_id == StandingColumn.id)
+        .join(Stage, Stage.id == StandingColumn.stage_id)
+        .join(
+            user_event_association,
+            and_(
+                user_event_association.c.user_id == ColumnValues.user_id,
+                user_event_association.c.event_id == Stage.event_id
+            )
+        )
+        .where(StandingColumn.stage_id == stage_id)
+        .group_by(StandingColumn.stage_id, ColumnValues.user_id)
+    )
+    if user_ids is not None:
+        source = source.where(ColumnValues.user_id.in_(user_ids))
+
+    await db.execute(
+        Standing.__table__.insert().from_select(
+            ["stage_id", "user_id", *STANDING_FIELDS.values(), "column_values"],
+            source,
+        )
+    )
+
+    result = await db.execute(select(Stage.event_id).where(Stage.id == stage_id))
+    event_id = result.scalar_one_or_none()
+    if event_id is not None:
+        await refresh_event_standings(db, event_id, user_ids)
+
+
+async def refresh_event_standings(db: AsyncSession, event_id: UUID, user_ids=None):
+    """
+        Rebuild the event-wide standings rows of an event from the standings of its stages,
+        each user's highest points and column values over the stages.
+        Only the given users are rebuilt when user_ids is passed.
+    """
+    delete_stmt = delete(EventStanding).where(EventStanding.event_id == event_id)
+    if user_ids is not None:
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return
+        delete_stmt = delete_stmt.where(EventStanding.user_id.in_(user_ids))
+    await db.execute(delete_stmt)
+
+    points = (
+        select(Standing.user_id, func.max(Standing.points).label("points"))
+        .join(Stage, Stage.id == Standing.stage_id)
+        .where(Stage.event_id == event_id)
+        .group_by(Standing.user_id)
+    )
+    each = func.jsonb_each_text(Standing.column_values).table_valued("key", "value")
+    values = (
+        select(Standing.user_id, each.c.key, func.max(each.c.value).label("value"))
+        .join(Stage, Stage.id == Standing.stage_id)
+        .join(each, true())
+        .where(Stage.event_id == event_id)
+        .group_by(Standing.user_id, each.c.key)
+    )
+    if user_ids is not None:
+        points = points.where(Standing.user_id.in_(user_ids))
+        values = values.where(Standing.user_id.in_(user_ids))
+    points = points.subquery("points")
+    values = values.subquery("stage_values")
+
+    source = (
+        select(
+            literal(event_id, EventStanding.event_id.type),
+            points.c.user_id,
+            points.c.points,
+            func.coalesce(
+                func.jsonb_object_agg(values.c.key, values.c.value).filter(values.c.key.is_not(None)),
+                literal_column("'{}'::jsonb", JSONB),
+            ),
+        )
+        .outerjoin(values, values.c.user_id == points.c.user_id)
+        .group_by(points.c.user_id, points.c.points)
+    )
+
+    await db.execute(
+        EventStanding.__table__.insert().from_select(
+            ["event_id", "user_id", "points", "column_values"],
+            source,
+        )
+    )
+
+
+async def refresh_standings_for_columns(db: AsyncSession, column_ids, user_ids=None):
+    """ Refresh the standings of every stage the given standing columns belong to """
+    result = await db.execute(
+        select(StandingColumn.stage_id)
+        .where(StandingColumn.id.in_(list(set(column_ids))))
+        .distinct()
+    )
+    for stage_id in result.scalars().all():
+        await refresh_standings(db, stage_id, user_ids)
+
+
+async def extract_stage_results(db: AsyncSession, stage_id: UUID, user_ids: list[UUID]) -> dict[UUID, dict]:
+    """
+        Match played, win, loss, draw and points of users from the completed tiesheets of a stage.
+        A completed tiesheet without a winner is a draw. Users without one get zeros.
+    """
+    decided = (
+        select(
+            TiesheetPlayer.tiesheet_id,
+            func.bool_or(TiesheetPlayer.is_winner).label("decided"),
+        )
+        .join(Tiesheet, Tiesheet.id == TiesheetPlayer.tiesheet_id)
+        .where(Tiesheet.stage_id == stage_id, Tiesheet.status == "completed")
+        .group_by(TiesheetPlayer.tiesheet_id)
+        .subquery("decided")
+    )
+    result = await db.execute(
+        select(
+            TiesheetPlayer.user_id,
+            func.count().label("match played"),
+            func.count().filter(TiesheetPlayer.is_winner.is_(True)).label("win"),
+            func.count().filter(decided.c.decided.is_(True), TiesheetPlayer.is_winner.is_not(True)).label("loss"),
+            func.count().filter(decided.c.decided.is_not(True)).label("draw"),
+        )
+        .join(decided, decided.c.tiesheet_id == TiesheetPlayer.tiesheet_id)
+        .where(TiesheetPlayer.user_id.in_(user_ids))
+        .group_by(TiesheetPlayer.user_id)
+    )
+
+    results = {user_id: {field: 0 for field in STANDING_FIELDS} for user_id in user_ids}
+    for row in result.mappings().all():
+        results[row["user_id"]] = {
+            "match played": row["match played"],
+            "win": row["win"],
+            "loss": row["loss"],
+            "draw": row["draw"],
+            "points": row["win"] * WIN_POINTS + row["draw"] * DRAW_POINTS,
+        }
+    return results
+
+
+async def refresh_tiesheet_standings(db: AsyncSession, tiesheet_id: UUID, keep=()):
+    """
+        Recount the result columns (match played, win, loss, draw, points) of the players
+        of a tiesheet from the completed tiesheets of its stage, then refresh their standings.
+        Cells in keep, as (user_id, column_id), were entered by hand and are not overwritten.
+    """
+    result = await db.execute(
+        select(Tiesheet.stage_id, TiesheetPlayer.user_id)
+        .join(TiesheetPlayer, TiesheetPlayer.tiesheet_id == Tiesheet.id)
+        .where(Tiesheet.id == tiesheet_id)
+    )
+    rows = result.all()
+    if not rows:
+        return
+    stage_id = rows[0].stage_id
+    user_ids = list({row.user_id for row in rows})
+
+    result = await db.execute(
+        select(StandingColumn.id, func.lower(StandingColumn.column_field).label("field"))
+        .where(
+            StandingColumn.stage_id == stage_id,
+            func.lower(StandingColumn.column_field).in_(STANDING_FIELDS),
+        )
+    )
+    columns = result.all()
+    if columns:
+        results = await extract_stage_results(db, stage_id, user_ids)
+        keep = set(keep)
+        values = [
+            {"user_id": user_id, "column_id": column.id, "value": str(results[user_id][column.field])}
+            for user_id in user_ids
+            for column in columns
+            if (user_id, column.id) not in keep
+        ]
+        if values:
+            stmt = insert(ColumnValues).values(values)
+            stmt = stmt.on_conflict_do_update(
+                constraint="pk_columnvalues",
+                set_={"value": stmt.excluded.value, "updated_at": func.now()}
+            )
+            await db.execute(stmt)
+
+    await refresh_standings(db, stage_id, user_ids)
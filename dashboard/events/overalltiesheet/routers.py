@@ -1,25 +1,51 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from uuid import UUID
 from typing import Optional
 from db_connect import get_db_session
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 from events.overalltiesheet.services import OverallTiesheetServices
+from services import PaginationMode, TotalCount
+from cache import response_cache
+from conditional import conditional_get
 
 router = APIRouter()
 
 @router.get("")
 async def retrieve_overall_points_by_round_and_event(
+    request: Request,
+    response: Response,
     event_id : UUID,
     db : Annotated[AsyncSession,Depends(get_db_session)],
     stage_id:Optional[UUID] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    pagination: PaginationMode = PaginationMode.offset,
+    cursor: str | None = None,
+    total_count: TotalCount = TotalCount.exact,
 ):
-    return await OverallTiesheetServices.retrieve_overall_points_by_round_and_event(
-        db=db, 
-        event_id=event_id,
-        stage_id=stage_id,
-        page = page,
-        limit = limit
+    params = {
+        "stage_id": stage_id,
+        "page": page,
+        "limit": limit,
+        "pagination": pagination,
+        "cursor": cursor,
+        "total_count": total_count,
+    }
+    not_modified, version = await conditional_get(request, response, db, event_id, params)
+    if not_modified:
+        return not_modified
+
+    return await response_cache.get_or_load(
+        "standings", event_id, version, params,
+        lambda: OverallTiesheetServices.retrieve_overall_points_by_round_and_event(
+            db=db, 
+            event_id=event_id,
+            stage_id=stage_id,
+            page = page,
+            limit = limit,
+            pagination = pagination,
+            cursor = cursor,
+            total_count = total_count
+        )
     )
\ No newline at end of file
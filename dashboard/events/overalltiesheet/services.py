@@ -1,8 +1,10 @@
 from uuid import UUID
+from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, case
+from sqlalchemy import select, tuple_
 
-from models import User, StandingColumn, ColumnValues
+from models import User, StandingColumn, Standing, EventStanding, Stage
+from services import PaginationMode, TotalCount, count_rows, decode_cursor, encode_cursor, total_pages
 
 
 class OverallTiesheetServices:
@@ -14,83 +16,174 @@ class OverallTiesheetServices:
         page: int,
         limit: int,
         stage_id: UUID | None = None,
+        pagination: PaginationMode = PaginationMode.offset,
+        cursor: str | None = None,
+        total_count: TotalCount = TotalCount.exact,
     ):
-        skip = (page - 1) * limit
-
-        # Get column field for stage
+        # Get column field for stage, or for every stage of the event
         column_stmt = select(StandingColumn.column_field)
 
         if stage_id is not None:
             column_stmt = column_stmt.where(
                 StandingColumn.stage_id == stage_id
             )
+        else:
+            column_stmt = column_stmt.join(Stage, Stage.id == StandingColumn.stage_id).where(Stage.event_id == event_id)
 
         result = await db.execute(column_stmt)
         column_fields = result.scalars().all()
 
-        pivot_columns = [ColumnValues.user_id, User.username]
-        points_label = None
-
-        # Pivot expression
-        for column in column_fields:
-            label_name = column.lower()
-
-            expr = func.max(
-                case(
-                    (StandingColumn.column_field == column, ColumnValues.value),
-                    else_=None
-                )
-            ).label(label_name)
+        if stage_id is not None:
+            return await OverallTiesheetServices.retrieve_stage_standings(
+                db=db,
+                stage_id=stage_id,
+                column_fields=column_fields,
+                page=page,
+                limit=limit,
+                pagination=pagination,
+                cursor=cursor,
+                total_count=total_count,
+            )
 
-            pivot_columns.append(expr)
+        return await OverallTiesheetServices.retrieve_event_standings(
+            db=db,
+            event_id=event_id,
+            column_fields=column_fields,
+            page=page,
+            limit=limit,
+            pagination=pagination,
+            cursor=cursor,
+            total_count=total_count,
+        )
 
-            if label_name == "points":
-                points_label = label_name
+    @staticmethod
+    async def retrieve_event_standings(
+        db: AsyncSession,
+        event_id: UUID,
+        column_fields: list[str],
+        page: int,
+        limit: int,
+        pagination: PaginationMode = PaginationMode.offset,
+        cursor: str | None = None,
+        total_count: TotalCount = TotalCount.exact,
+    ):
+        """
+            Standings across every stage of an event, a user's best value of each column over the stages.
+            Read from the event standings projection, so a cursor page is an index range scan
+            on ix_event_standings_event_points whatever the page.
+        """
+        labels = list(dict.fromkeys(column.lower() for column in column_fields))
 
         base_query = (
-            select(*pivot_columns)
-            .join(StandingColumn, ColumnValues.column_id == StandingColumn.id)
-            .join(User, User.id == ColumnValues.user_id)
-            .group_by(ColumnValues.user_id, User.username)
+            select(EventStanding.user_id, User.username, EventStanding.points, EventStanding.column_values)
+            .join(User, User.id == EventStanding.user_id)
+            .where(EventStanding.event_id == event_id)
+            .order_by(EventStanding.points.desc(), EventStanding.user_id.desc())
         )
 
-        if stage_id is not None:
-            base_query = base_query.where(
-                StandingColumn.stage_id == stage_id
-            )
+        total = await count_rows(
+            db=db,
+            stmt=select(EventStanding.user_id).where(EventStanding.event_id == event_id),
+            mode=total_count,
+        )
+
+        def to_item(row):
+            item = {"user_id": row.user_id, "username": row.username}
+            for label in labels:
+                item[label] = row.column_values.get(label)
+            return item
+
+        if pagination == PaginationMode.cursor:
+            if cursor:
+                points, user_id = decode_cursor(cursor, Decimal, UUID)
+                base_query = base_query.where(tuple_(EventStanding.points, EventStanding.user_id) < (points, user_id))
+
+            result = await db.execute(base_query.limit(limit + 1))
+            rows = result.all()
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor(rows[-1].points, rows[-1].user_id)
+
+            return {
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "total_pages": total_pages(total, limit),
+                "total_items": total,
+                "items": [to_item(row) for row in rows],
+            }
+
+        skip = (page - 1) * limit
+        result = await db.execute(base_query.offset(skip).limit(limit))
+
+        return {
+            "page": page,
+            "limit": limit,
+            "total_pages": total_pages(total, limit),
+            "total_items": total,
+            "items": [to_item(row) for row in result.all()],
+        }
 
-        count_query = (
-            select(func.count(func.distinct(ColumnValues.user_id)))
-            .join(StandingColumn, ColumnValues.column_id == StandingColumn.id)
+    @staticmethod
+    async def retrieve_stage_standings(
+        db: AsyncSession,
+        stage_id: UUID,
+        column_fields: list[str],
+        page: int,
+        limit: int,
+        pagination: PaginationMode = PaginationMode.offset,
+        cursor: str | None = None,
+        total_count: TotalCount = TotalCount.exact,
+    ):
+        """ Standings of one stage read from the standings projection, ordered by points """
+        labels = [column.lower() for column in column_fields]
+
+        base_query = (
+            select(Standing.user_id, User.username, Standing.points, Standing.column_values)
+            .join(User, User.id == Standing.user_id)
+            .where(Standing.stage_id == stage_id)
+            .order_by(Standing.points.desc(), Standing.user_id.desc())
         )
 
-        if stage_id is not None:
-            count_query = count_query.where(
-                StandingColumn.stage_id == stage_id
-            )
+        total = await count_rows(
+            db=db,
+            stmt=select(Standing.user_id).where(Standing.stage_id == stage_id),
+            mode=total_count,
+        )
 
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Ordering
-        if points_label:
-            base_query = base_query.order_by(
-                func.max(
-                    case(
-                        (StandingColumn.column_field == "points", ColumnValues.value),
-                        else_=None
-                    )
-                ).desc()
-            )
-        final_query = base_query.offset(skip).limit(limit)
+        def to_item(row):
+            item = {"user_id": row.user_id, "username": row.username}
+            for label in labels:
+                item[label] = row.column_values.get(label)
+            return item
+
+        if pagination == PaginationMode.cursor:
+            if cursor:
+                points, user_id = decode_cursor(cursor, Decimal, UUID)
+                base_query = base_query.where(tuple_(Standing.points, Standing.user_id) < (points, user_id))
+
+            result = await db.execute(base_query.limit(limit + 1))
+            rows = result.all()
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor(rows[-1].points, rows[-1].user_id)
+
+            return {
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "total_pages": total_pages(total, limit),
+                "total_items": total,
+                "items": [to_item(row) for row in rows],
+            }
 
-        result = await db.execute(final_query)
-        users_col_value = result.mappings().all()
+        skip = (page - 1) * limit
+        result = await db.execute(base_query.offset(skip).limit(limit))
 
         return {
             "page": page,
             "limit": limit,
-            "total_pages": (total + limit - 1) // limit if limit else 1,
+            "total_pages": total_pages(total, limit),
             "total_items": total,
-            "items": users_col_value,
-        }
\ No newline at end of file
+            "items": [to_item(row) for row in result.all()],
+        }
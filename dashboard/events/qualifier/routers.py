@@ -1,5 +1,5 @@
 from models import User,Stage, Qualifier
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from db_connect import get_db_session
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,6 +7,8 @@ from sqlalchemy import select, delete
 from uuid import UUID
 from events.qualifier.services import QualifierService
 from events.qualifier.schema import QualifierByRound, QualifierModel
+from cache import touch_event, response_cache
+from conditional import conditional_get
 
 
 
@@ -31,10 +33,19 @@ async def create_qualifier(
 
 @router.get("/event")
 async def retrieve_qualifiers_by_event(
+    request: Request,
+    response: Response,
     event_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db_session)]
 ):
-    return await QualifierService.retrieve_qualifier_by_event(db=db, event_id=event_id)
+    not_modified, version = await conditional_get(request, response, db, event_id, {})
+    if not_modified:
+        return not_modified
+
+    return await response_cache.get_or_load(
+        "qualifiers", event_id, version, {},
+        lambda: QualifierService.retrieve_qualifier_by_event(db=db, event_id=event_id)
+    )
 
 @router.delete("/{qualifier_id}")
 async def delete_qualifier(
@@ -42,8 +53,9 @@ async def delete_qualifier(
     db: Annotated[AsyncSession, Depends(get_db_session)]
 ):
     qualifier =  await QualifierService.extract_username_from_qualifier_id(db = db, qualifier_id=qualifier_id)
-    stmt = delete(Qualifier).where(Qualifier.id == qualifier_id)
-    await db.execute(stmt)
+    stmt = delete(Qualifier).where(Qualifier.id == qualifier_id).returning(Qualifier.event_id)
+    result = await db.execute(stmt)
+    touch_event(db, result.scalar_one_or_none())
     await db.commit()
 
     return{
@@ -6,6 +6,8 @@ from events.qualifier.crud import extract_qualifier_by_id
 from events.qualifier.schema import QualifierModel
 from sqlalchemy.exc import SQLAlchemyError
 from exception import HTTPInternalServer, HTTPNotFound
+from events.overalltiesheet.crud import refresh_standings
+from cache import touch_event
 
 class QualifierService:
 
@@ -42,6 +44,7 @@ class QualifierService:
             ]
 
             db.add_all(new_qualifiers)
+            touch_event(db, event_id)
             await db.commit()
 
             # 2. Fetch the columns and their default values for the given stage
@@ -65,6 +68,9 @@ class QualifierService:
             ]
 
             db.add_all(new_column_values)
+            await db.flush()
+            await refresh_standings(db, stage_id, qualifier.user_id)
+            touch_event(db, event_id)
             await db.commit()
 
             return {"message": "Qualifier created successfully"}
@@ -8,7 +8,13 @@ from uuid import UUID
 from events.services import extract_all_event, create_event_services, edit_event_services, extract_all_event_pagination
 from sqlalchemy import select, delete
 from events.crud import extract_event_by_id
+from cache import touch_event
+from counters import adjust_counters, event_counter_deltas
 from exception import HTTPNotFound
+from services import PaginationMode, TotalCount
+from responses import FastJSONResponse
+from dependencies import require_permission
+from enums import Permission
 from events.stage.routers import router as state_router
 from events.group.routers import router as group_router
 from events.standingcolumn.routers import router as column_router
@@ -17,6 +23,8 @@ from events.qualifier.routers import router as qualifier_router
 from events.overalltiesheet.routers import router as overalltiesheet_router
 from events.match.routers import router as match_router
 from events.eventrole.routers import router as eventrole_router
+from events.bracket.routers import router as bracket_router
+from events.export.routers import router as export_router
 
 router = APIRouter()
 router.include_router(state_router,prefix="/stage",tags=["Stage"])
@@ -27,8 +35,10 @@ router.include_router(qualifier_router, prefix="/qualifier",tags=["Qualifier"])
 router.include_router(overalltiesheet_router,prefix="/overalltiesheet",tags=["Overalltiesheet"])
 router.include_router(match_router,prefix="/match", tags=["Match"])
 router.include_router(eventrole_router,prefix="/role", tags=["Event Role"])
+router.include_router(bracket_router,prefix="/bracket", tags=["Bracket"])
+router.include_router(export_router,prefix="/export", tags=["Export"])
 
-@router.post("")
+@router.post("", dependencies=[Depends(require_permission(Permission.can_create_events))])
 async def create_event( 
     event : EventDetail, 
     db : Annotated[AsyncSession,Depends(get_db_session)],
@@ -41,10 +51,22 @@ async def retrieve_event(
     status : str | None = None,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    pagination: PaginationMode = PaginationMode.offset,
+    cursor: str | None = None,
+    total_count: TotalCount = TotalCount.exact,
 ):
-    return await extract_all_event_pagination(db=db, status=status,page=page, limit = limit)
+    events = await extract_all_event_pagination(
+        db=db,
+        status=status,
+        page=page,
+        limit = limit,
+        pagination=pagination,
+        cursor=cursor,
+        total_count=total_count
+    )
+    return FastJSONResponse(events)
     
-@router.patch("")
+@router.patch("", dependencies=[Depends(require_permission(Permission.can_edit_events))])
 async def edit_event(
     event_detail : EditEventDetail,
     db: Annotated[AsyncSession, Depends(get_db_session)],
@@ -54,7 +76,7 @@ async def edit_event(
     return await edit_event_services(db=db, event_detail=event_detail, event_id=event_id)
     
 
-@router.delete("/{event_id}")
+@router.delete("/{event_id}", dependencies=[Depends(require_permission(Permission.can_delete_events))])
 async def delete_event(
     db: Annotated[AsyncSession, Depends(get_db_session)],
     event_id: UUID ,
@@ -66,7 +88,12 @@ async def delete_event(
         raise HTTPNotFound("Event not found")
     
     stmt = delete(Event).where(Event.id == event_id)
-    await db.execute(stmt)
+    result = await db.execute(stmt.returning(Event.status))
+    # A concurrent delete already took the event out of the counters
+    deleted_status = result.scalar_one_or_none()
+    if deleted_status is not None:
+        await adjust_counters(db, **event_counter_deltas(deleted_status, sign=-1))
+    touch_event(db, event_id)
     await db.commit()
 
     return {
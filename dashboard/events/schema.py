@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from datetime import date
 from enum import Enum
 from uuid import UUID
@@ -32,3 +32,6 @@ class EventDetailResponse(EventDetail):
     updated_at : datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+# Validates a whole result set in one pydantic-core call instead of one model_validate per row
+EventDetailResponseList = TypeAdapter(list[EventDetailResponse])
@@ -1,36 +1,63 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from models import Event, Stage, StandingColumn
 from uuid import UUID
-from sqlalchemy import select, func
-from events.schema import StatusEnum, EditEventDetail, EventDetailResponse
+from sqlalchemy import select, func, tuple_
+from datetime import datetime
+from events.schema import StatusEnum, EditEventDetail, EventDetailResponseList
 from sqlalchemy.exc import SQLAlchemyError
 from exception import HTTPNotFound, HTTPInternalServer
 from events.crud import extract_event_by_id
-
-async def extract_all_event_pagination(db: AsyncSession, page : int, limit : int , status: str | None = None):
-    skip = (page - 1) * limit
-
-    stmt = select(Event).order_by(Event.created_at.desc())
+from services import PaginationMode, TotalCount, count_rows, decode_cursor, encode_cursor, total_pages
+from counters import adjust_counters, event_counter_deltas
+
+async def extract_all_event_pagination(
+    db: AsyncSession,
+    page : int,
+    limit : int ,
+    status: str | None = None,
+    pagination: PaginationMode = PaginationMode.offset,
+    cursor: str | None = None,
+    total_count: TotalCount = TotalCount.exact,
+):
+    stmt = select(Event)
     if status and status.lower() != "all":
         stmt = stmt.where(Event.status == status.lower())
 
+    # Count total items
+    total = await count_rows(db=db, stmt=stmt, mode=total_count)
+
+    if pagination == PaginationMode.cursor:
+        stmt = stmt.order_by(Event.created_at.desc(), Event.id.desc())
+        if cursor:
+            created_at, event_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+            stmt = stmt.where(tuple_(Event.created_at, Event.id) < (created_at, event_id))
+
+        # Fetch one extra row to know whether another page exists
+        result = await db.execute(stmt.limit(limit + 1))
+        events = result.scalars().all()
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = encode_cursor(events[-1].created_at, events[-1].id)
+
+        return {
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "total_pages": total_pages(total, limit),
+            "items": EventDetailResponseList.validate_python(events)
+        }
+
     # Apply pagination
-    stmt = stmt.offset(skip).limit(limit)
+    skip = (page - 1) * limit
+    stmt = stmt.order_by(Event.created_at.desc()).offset(skip).limit(limit)
     result = await db.execute(stmt)
     events = result.scalars().all()
 
-    # Count total items
-    count_stmt = select(func.count()).select_from(Event)
-    if status and status.lower() != "all":
-        count_stmt = count_stmt.where(Event.status == status.lower())
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar()
-
     return {
         "page": page,
         "limit": limit,
-        "total_pages": (total + limit - 1) // limit,
-        "items": [EventDetailResponse.model_validate(event) for event in events]
+        "total_pages": total_pages(total, limit),
+        "items": EventDetailResponseList.validate_python(events)
     }
 
 async def extract_all_event(db: AsyncSession, status: str | None = None):
@@ -41,7 +68,7 @@ async def extract_all_event(db: AsyncSession, status: str | None = None):
     result = await db.execute(stmt)
     events = result.scalars().all()
 
-    return [EventDetailResponse.model_validate(event) for event in events]
+    return EventDetailResponseList.validate_python(events)
 
 
 async def create_event(db: AsyncSession, event):
@@ -97,6 +124,7 @@ async def create_event_services(db: AsyncSession, event):
         new_event = await create_event(db, event)
         new_round = await create_default_round(db, new_event)
         await create_default_standing_col(db, new_round)
+        await adjust_counters(db, **event_counter_deltas(new_event.status))
 
         await db.commit()
 
@@ -112,6 +140,10 @@ async def edit_event_services( db: AsyncSession, event_id : UUID, event_detail :
     event = await extract_event_by_id(db=db, event_id=event_id)
     if not event:
         raise HTTPNotFound("Event not found")
+
+    if event_detail.status:
+        # Lock the row so concurrent status changes adjust the active counter once
+        await db.refresh(event, with_for_update=True)
     
     if event_detail.title:
         event.title = event_detail.title
@@ -126,7 +158,9 @@ async def edit_event_services( db: AsyncSession, event_id : UUID, event_detail :
         event.enddate = event_detail.enddate
 
     if event_detail.status:
+        was_active = event.status == StatusEnum.active
         event.status = StatusEnum(event_detail.status)
+        await adjust_counters(db, active_events=(event.status == StatusEnum.active) - was_active)
 
 
     await db.commit()
@@ -8,6 +8,8 @@ from uuid import UUID
 from db_connect import get_db_session
 from events.stage.services import StageServices
 from events.stage.crud import extract_stage_by_id
+from cache import touch_event
+from events.overalltiesheet.crud import refresh_event_standings
 from sqlalchemy.orm import selectinload
 router = APIRouter()
 
@@ -40,6 +42,9 @@ async def delete_stage(
     
     stmt = delete(Stage).where(Stage.id == stage_id)
     await db.execute(stmt)
+    # The stage's standings went with it, recount the event-wide best values
+    await refresh_event_standings(db=db, event_id=stage.event_id)
+    touch_event(db, stage.event_id)
     await db.commit()
 
     return {
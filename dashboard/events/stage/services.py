@@ -3,6 +3,7 @@ from uuid import UUID
 from models import Stage
 from events.stage.schema import StageDetail, EditStageDetail, StageResponse
 from events.stage.crud import extract_stage_by_id, extract_stage_by_event
+from cache import touch_event
 
 class StageServices:
     @staticmethod
@@ -12,6 +13,7 @@ class StageServices:
             name = stage.name,
         )
         db.add(new_state)
+        touch_event(db, event_id)
         await db.commit()
         return{
             "message" : "Stage added successfully",
@@ -24,6 +26,7 @@ class StageServices:
         if stage_detail.name:
             stage.name = stage_detail.name
 
+        touch_event(db, stage.event_id)
         await db.commit()
 
         return {
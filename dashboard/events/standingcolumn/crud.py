@@ -1,8 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from sqlalchemy import select
-from models import StandingColumn
-from exception import HTTPNotFound
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from decimal import Decimal, InvalidOperation
+from models import StandingColumn, ColumnValues
+from exception import HTTPNotFound, HTTPBadRequest
+from events.standingcolumn.schema import ColumnValueType
+from events.overalltiesheet.crud import refresh_standings_for_columns
 
 async def extract_column_by_id( db: AsyncSession, column_id : UUID):
     result = await db.execute(select(StandingColumn).where(StandingColumn.id == column_id))
@@ -11,4 +15,64 @@ async def extract_column_by_id( db: AsyncSession, column_id : UUID):
     if not column:
         raise HTTPNotFound("Column not Found")
     
-    return column
\ No newline at end of file
+    return column
+
+def normalize_column_value(value_type : str, value : str | None):
+    """ Check a value against the column type and return it in canonical text form """
+    if value is None or value_type == ColumnValueType.text:
+        return value
+
+    try:
+        number = Decimal(value.strip())
+        if not number.is_finite():
+            raise InvalidOperation
+        if value_type == ColumnValueType.int:
+            if number != number.to_integral_value():
+                raise InvalidOperation
+            return str(int(number))
+        return format(number, "f")
+    except InvalidOperation:
+        raise HTTPBadRequest(f"Value '{value}' is not a valid {ColumnValueType(value_type).value}")
+
+async def extract_column_value_types(db : AsyncSession, column_ids) -> dict[UUID, str]:
+    result = await db.execute(
+        select(StandingColumn.id, StandingColumn.value_type).where(StandingColumn.id.in_(list(set(column_ids))))
+    )
+    return {column_id: value_type for column_id, value_type in result.all()}
+
+UPSERT_BATCH_SIZE = 1000
+
+async def upsert_column_values(db: AsyncSession, values: list[tuple[UUID, UUID, str | None]]):
+    """
+        Write a matrix of (user_id, column_id, value) with INSERT ... ON CONFLICT DO UPDATE
+        on pk_columnvalues, one statement per batch instead of a lookup per cell.
+        The standings rows of the touched users are refreshed afterwards.
+    """
+    # A single statement cannot touch the same row twice, so the last value for a cell wins
+    cells = {(user_id, column_id): value for user_id, column_id, value in values}
+    if not cells:
+        return
+
+    value_types = await extract_column_value_types(db, {column_id for _, column_id in cells})
+    rows = [
+        {
+            "user_id": user_id,
+            "column_id": column_id,
+            "value": normalize_column_value(value_types.get(column_id, ColumnValueType.text), value),
+        }
+        for (user_id, column_id), value in cells.items()
+    ]
+
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = insert(ColumnValues).values(rows[start:start + UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            constraint="pk_columnvalues",
+            set_={"value": stmt.excluded.value, "updated_at": func.now()}
+        )
+        await db.execute(stmt)
+
+    await refresh_standings_for_columns(
+        db,
+        column_ids={row["column_id"] for row in rows},
+        user_ids={row["user_id"] for row in rows},
+    )
@@ -7,7 +7,9 @@ from uuid import UUID
 from db_connect import get_db_session
 from events.standingcolumn.schema import CreateColumn, EditColumn, CreateValues, ColumnResponse
 from events.standingcolumn.sevices import StandingColumnServices
-from events.standingcolumn.crud import extract_column_by_id
+from events.standingcolumn.crud import extract_column_by_id, normalize_column_value
+from events.overalltiesheet.crud import refresh_standings, refresh_standings_for_columns
+from events.crud import touch_event_of
 
 router = APIRouter()
 
@@ -34,6 +36,8 @@ async def delete_column(column_id : UUID,db : Annotated[AsyncSession,Depends(get
 
     stmt = delete(StandingColumn).where(StandingColumn.id == column_id)
     await db.execute(stmt)
+    await refresh_standings(db, column.stage_id)
+    await touch_event_of(db=db, stage_id=column.stage_id)
     await db.commit()
 
     return {
@@ -42,13 +46,17 @@ async def delete_column(column_id : UUID,db : Annotated[AsyncSession,Depends(get
 
 @router.post("/values")
 async def create_value(value_detail : CreateValues, db : Annotated[AsyncSession,Depends(get_db_session)]):
+    column = await extract_column_by_id(db=db, column_id=value_detail.column_id)
     new_value = ColumnValues(
         user_id = value_detail.user_id,
         column_id = value_detail.column_id,
-        value = value_detail.value
+        value = normalize_column_value(column.value_type, value_detail.value)
     )
 
     db.add(new_value)
+    await db.flush()
+    await refresh_standings_for_columns(db, [value_detail.column_id], [value_detail.user_id])
+    await touch_event_of(db=db, stage_id=column.stage_id)
     await db.commit()
     return{
         "message" : "Value added successfully"
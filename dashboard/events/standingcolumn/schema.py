@@ -1,21 +1,30 @@
 from pydantic import BaseModel,ConfigDict
 from uuid import UUID
+from enum import Enum
+
+class ColumnValueType(str, Enum):
+    int = "int"
+    decimal = "decimal"
+    text = "text"
 
 class CreateColumn(BaseModel):
     stage_id : UUID
     column_field : str
     default_value : str
+    value_type : ColumnValueType = ColumnValueType.text
 
 class ColumnResponse(CreateColumn):
     id : UUID
     column_field : str
     default_value : str
+    value_type : ColumnValueType
 
     model_config = ConfigDict(from_attributes=True)
 
 class EditColumn(BaseModel):
     stage_id : UUID | None = None
     column_field : str | None = None
+    value_type : ColumnValueType | None = None
 
 class CreateValues(BaseModel):
     column_id : UUID
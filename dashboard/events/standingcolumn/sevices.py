@@ -4,7 +4,9 @@ from models import StandingColumn, Qualifier, ColumnValues
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from exception import HTTPInternalServer
-from events.standingcolumn.crud import extract_column_by_id
+from events.standingcolumn.crud import extract_column_by_id, normalize_column_value, upsert_column_values
+from events.overalltiesheet.crud import refresh_standings
+from events.crud import touch_event_of
 from uuid import UUID
 
 class StandingColumnServices:
@@ -13,11 +15,13 @@ class StandingColumnServices:
         db: AsyncSession,
         columnDetail: CreateColumn
     ):
+        default_value = normalize_column_value(columnDetail.value_type, columnDetail.default_value)
         try:
             new_column = StandingColumn(
                 stage_id=columnDetail.stage_id,
                 column_field=columnDetail.column_field,
-                default_value=columnDetail.default_value,
+                default_value=default_value,
+                value_type=columnDetail.value_type,
             )
 
             db.add(new_column)
@@ -34,12 +38,15 @@ class StandingColumnServices:
                     ColumnValues(
                         user_id=user_id,
                         column_id=new_column.id,
-                        value=columnDetail.default_value
+                        value=default_value
                     )
                     for user_id in users
                 ]
                 db.add_all(user_standing_col)
+                await db.flush()
+                await refresh_standings(db, columnDetail.stage_id)
 
+            await touch_event_of(db=db, stage_id=columnDetail.stage_id)
             await db.commit()
 
             return {
@@ -53,6 +60,7 @@ class StandingColumnServices:
     @staticmethod
     async def edit_column(db : AsyncSession, columnDetail : EditColumn, column_id : UUID):
         column = await extract_column_by_id(db=db, column_id=column_id)
+        previous_stage_id = column.stage_id
 
         if columnDetail.stage_id:
             column.stage_id = columnDetail.stage_id
@@ -60,6 +68,26 @@ class StandingColumnServices:
         if columnDetail.column_field:
             column.column_field = columnDetail.column_field
 
+        if columnDetail.value_type and columnDetail.value_type != column.value_type:
+            # Existing values must fit the new type; they are rewritten in canonical form
+            column.default_value = normalize_column_value(columnDetail.value_type, column.default_value)
+            column.value_type = columnDetail.value_type
+            await db.flush()
+
+            result = await db.execute(
+                select(ColumnValues.user_id, ColumnValues.value).where(ColumnValues.column_id == column_id)
+            )
+            await upsert_column_values(
+                db=db,
+                values=[(user_id, column_id, value) for user_id, value in result.all()]
+            )
+
+        await db.flush()
+        await refresh_standings(db, previous_stage_id)
+        if column.stage_id != previous_stage_id:
+            await refresh_standings(db, column.stage_id)
+            await touch_event_of(db=db, stage_id=column.stage_id)
+        await touch_event_of(db=db, stage_id=previous_stage_id)
         await db.commit()
 
         return {
@@ -1,9 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from sqlalchemy import select, and_
-from models import TiesheetPlayer, Tiesheet
+from sqlalchemy import select, and_, update, case
+from models import TiesheetPlayer, Tiesheet, Stage
 from exception import HTTPNotFound
 from typing import List
+from collections import Counter
 
 async def extract_tiesheet_player_by_tiesheet_id(db : AsyncSession, tiesheet_id : UUID):
     stmt = select(TiesheetPlayer).where(
@@ -17,6 +18,14 @@ async def extract_tiesheet_player_by_tiesheet_id(db : AsyncSession, tiesheet_id
     
     return players
 
+async def extract_tiesheet_player_ids(db : AsyncSession, tiesheet_id : UUID) -> dict[UUID, UUID]:
+    """ Map user_id -> tiesheet player id for every player of a tiesheet """
+    stmt = select(TiesheetPlayer.user_id, TiesheetPlayer.id).where(
+        TiesheetPlayer.tiesheet_id == tiesheet_id
+    )
+    result = await db.execute(stmt)
+    return {user_id: player_id for user_id, player_id in result.all()}
+
 async def get_tiesheet( db : AsyncSession, tiesheet_id : UUID):
     stmt = select(Tiesheet).where(Tiesheet.id == tiesheet_id)
     result = await db.execute(stmt)
@@ -55,3 +64,51 @@ async def check_tiesheet_exist(
 
     print
     return users
+
+async def set_tiesheet_winners(db: AsyncSession, tiesheet_id: UUID, winners: dict[UUID, bool]):
+    """ Update is_winner of several players of a tiesheet in one statement """
+    if not winners:
+        return
+
+    stmt = (
+        update(TiesheetPlayer)
+        .where(
+            TiesheetPlayer.tiesheet_id == tiesheet_id,
+            TiesheetPlayer.user_id.in_(winners.keys())
+        )
+        .values(is_winner=case(winners, value=TiesheetPlayer.user_id))
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(stmt)
+
+async def extract_stage_pairings(db: AsyncSession, stage_id: UUID, players: list[UUID]) -> Counter:
+    """ How many two-player tiesheets each pair of the given players already has in a stage """
+    stmt = (
+        select(func.array_agg(TiesheetPlayer.user_id))
+        .join(Tiesheet, Tiesheet.id == TiesheetPlayer.tiesheet_id)
+        .where(Tiesheet.stage_id == stage_id)
+        .group_by(TiesheetPlayer.tiesheet_id)
+        .having(
+            func.count(TiesheetPlayer.id) == 2,
+            func.bool_and(TiesheetPlayer.user_id.in_(players))
+        )
+    )
+    result = await db.execute(stmt)
+    return Counter(frozenset(pair) for pair in result.scalars().all())
+
+async def extract_tiesheet_schedule(db: AsyncSession, tiesheet_id: UUID):
+    """ Event, stage, schedule and status of a tiesheet, None when it does not exist """
+    stmt = (
+        select(
+            Tiesheet.id.label("tiesheet_id"),
+            Stage.event_id,
+            Tiesheet.stage_id,
+            Tiesheet.scheduled_date,
+            Tiesheet.scheduled_time,
+            Tiesheet.status,
+        )
+        .join(Stage, Stage.id == Tiesheet.stage_id)
+        .where(Tiesheet.id == tiesheet_id)
+    )
+    result = await db.execute(stmt)
+    return result.mappings().one_or_none()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from models import Tiesheet, TiesheetPlayer
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
@@ -8,6 +8,10 @@ from db_connect import get_db_session
 from events.tiesheet.schema import CreateTiesheet, CreateTiesheetPlayers, EditTiesheetPlayers, TiesheetStatus, UpdateTiesheet
 from events.tiesheet.services import TiesheetServices
 from events.tiesheet.crud import get_tiesheet
+from events.crud import touch_event_of
+from cache import response_cache
+from conditional import conditional_get
+import datetime
 
 router = APIRouter()
 
@@ -26,6 +30,7 @@ async def add_player_in_tiesheet(db: Annotated[AsyncSession, Depends(get_db_sess
     )
 
     db.add(new_player)
+    await touch_event_of(db=db, tiesheet_id=player_info.tiesheet_id)
     await db.commit()
 
     return{
@@ -41,6 +46,7 @@ async def edit_player_in_tiesheet(db: Annotated[AsyncSession, Depends(get_db_ses
     if player_info.is_winner:
         player.is_winner = player_info.is_winner
 
+    await touch_event_of(db=db, tiesheet_id=tiesheet_id)
     await db.commit()
     return {
         "message" : "Player updated successfully"
@@ -48,12 +54,23 @@ async def edit_player_in_tiesheet(db: Annotated[AsyncSession, Depends(get_db_ses
 
 @router.get("")
 async def retrieve_tiesheet(
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db_session)],
     event_id: UUID,
     stage_id: UUID | None = None,
     today : bool | None = None
 ):
-    return await TiesheetServices.retrieve_tiesheet(db=db, event_id=event_id, stage_id=stage_id, today=today)
+    # "today" results change at midnight, so the date is part of the key
+    params = {"stage_id": stage_id, "today": datetime.date.today() if today else None}
+    not_modified, version = await conditional_get(request, response, db, event_id, params)
+    if not_modified:
+        return not_modified
+
+    return await response_cache.get_or_load(
+        "tiesheets", event_id, version, params,
+        lambda: TiesheetServices.retrieve_tiesheet(db=db, event_id=event_id, stage_id=stage_id, today=today)
+    )
 
 
 @router.get("/{tiesheet_id}")
@@ -83,6 +100,7 @@ async def delete_tiesheet(
     tiesheet_id : UUID
 ):
     await get_tiesheet(db=db, tiesheet_id=tiesheet_id)
+    await touch_event_of(db=db, tiesheet_id=tiesheet_id)
     
     stmt = delete(Tiesheet).where(Tiesheet.id == tiesheet_id)
     await db.execute(stmt)
@@ -1,11 +1,16 @@
 from models import StandingColumn, ColumnValues, Tiesheet, TiesheetPlayer, Stage, Group, User, Event
 from sqlalchemy import select, and_, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from events.tiesheet.schema import StandingColumnResponse, UpdateTiesheet, TiesheetStatus, CreateTiesheet
 import datetime
-from exception import HTTPInternalServer, HTTPNotFound, HTTPConflict
-from events.tiesheet.crud import get_tiesheet, check_tiesheet_exist
+from exception import APIError, HTTPInternalServer, HTTPNotFound, HTTPConflict
+from events.tiesheet.crud import get_tiesheet, check_tiesheet_exist, set_tiesheet_winners
+from events.standingcolumn.crud import upsert_column_values
+from events.match.services import MatchServices
+from events.crud import touch_event_of
+from events.overalltiesheet.crud import refresh_tiesheet_standings
 from sqlalchemy.exc import SQLAlchemyError
 
 class TiesheetServices:
@@ -28,6 +33,9 @@ class TiesheetServices:
 
     @staticmethod
     async def get_tiesheet_with_player(event_id : UUID, db : AsyncSession, stage_id : UUID | None = None, today :bool | None = None):
+        """
+            Extract tiesheets of an event with their players aggregated into one row per tiesheet
+        """
         stmt = (
             select(
                 Tiesheet.id,
@@ -37,16 +45,23 @@ class TiesheetServices:
                 Stage.name.label("stage_name"),
                 Stage.id.label("stage_id"),
                 Group.name.label("group_name"),
-                TiesheetPlayer.user_id,
-                TiesheetPlayer.is_winner,
-                User.username,
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            "user_id", TiesheetPlayer.user_id,
+                            "is_winner", TiesheetPlayer.is_winner,
+                            "username", User.username
+                        ),
+                        TiesheetPlayer.created_at
+                    )
+                ).label("player_info")
             )
             .join(TiesheetPlayer, TiesheetPlayer.tiesheet_id == Tiesheet.id)
             .join(Stage, Stage.id == Tiesheet.stage_id)
-            .join(Event, Event.id == Stage.event_id)
             .join(User, User.id == TiesheetPlayer.user_id)
             .outerjoin(Group, Group.id == Tiesheet.group_id)
-            .where(Event.id == event_id)
+            .where(Stage.event_id == event_id)
+            .group_by(Tiesheet.id, Stage.id, Group.id)
             .order_by(Tiesheet.created_at)
         )
 
@@ -57,7 +72,6 @@ class TiesheetServices:
             today_date = datetime.date.today()
             stmt = stmt.where(Tiesheet.scheduled_date == today_date)
 
-
         result = await db.execute(stmt)
         rows = result.mappings().all()
 
@@ -121,44 +135,6 @@ class TiesheetServices:
 
         return rows
 
-    @staticmethod
-    async def test_api(db :AsyncSession, t_id : UUID):
-        stmt = (
-            select(
-                Tiesheet.id,
-                Tiesheet.scheduled_date,
-                Tiesheet.scheduled_time,
-                Tiesheet.status,
-                Stage.name.label("stage_name"),
-                Stage.id.label("stage_id"),
-                Group.name.label("group_name"),
-                
-                func.json_agg(
-                    func.json_build_object(
-                        "user_id", TiesheetPlayer.user_id,
-                        "is_winner", TiesheetPlayer.is_winner,
-                        "username",User.username
-                    )
-                ).label("userinfo")
-            )
-            .join(TiesheetPlayer, TiesheetPlayer.tiesheet_id == Tiesheet.id)
-            .join(Stage, Stage.id == Tiesheet.stage_id)
-            .join(Event, Event.id == Stage.event_id)
-            .join(User, User.id == TiesheetPlayer.user_id)
-            .outerjoin(Group, Group.id == Tiesheet.group_id)
-            .where(Tiesheet.id == t_id )
-            .group_by(
-                Tiesheet.id,
-                Stage.id,
-                Stage.name,
-                Group.name
-            )
-        )
-        result = await db.execute(stmt)
-        rows = result.mappings().all()
-
-        return rows
-
     @staticmethod
     async def get_tiesheet(db: AsyncSession, tiesheet_id: UUID) -> Tiesheet | None:
         stmt = select(Tiesheet).where(Tiesheet.id == tiesheet_id)
@@ -166,52 +142,25 @@ class TiesheetServices:
         return result.scalar_one_or_none()
 
     @staticmethod
-    async def update_tiesheet(db: AsyncSession, tiesheet: Tiesheet, tiesheet_detail: UpdateTiesheet):
-        # Update main fields
-        tiesheet.scheduled_date = tiesheet_detail.scheduled_date
-        tiesheet.scheduled_time = tiesheet_detail.scheduled_time
-        tiesheet.status = TiesheetStatus(tiesheet_detail.status)
-
-        # Update player columns if provided
-        if tiesheet_detail.player_columns:
-            for player_data in tiesheet_detail.player_columns:
-                await TiesheetServices.update_tiesheet_player(db, tiesheet.id, player_data)
-
-        await db.commit()
-        await db.refresh(tiesheet)
-        return tiesheet
+    async def update_tiesheet_player(db: AsyncSession, tiesheet_id: UUID, player_data):
+        await TiesheetServices.save_player_columns(db, tiesheet_id, [player_data])
 
     @staticmethod
-    async def update_tiesheet_player(db: AsyncSession, tiesheet_id: UUID, player_data):
-        # Update player winner status
-        player_stmt = select(TiesheetPlayer).where(
-            TiesheetPlayer.tiesheet_id == tiesheet_id,
-            TiesheetPlayer.user_id == player_data.user_id
+    async def save_player_columns(db: AsyncSession, tiesheet_id: UUID, player_columns):
+        """ Write winner flags and column values of all players with one statement each """
+        await set_tiesheet_winners(
+            db=db,
+            tiesheet_id=tiesheet_id,
+            winners={player_data.user_id: player_data.is_winner for player_data in player_columns}
+        )
+        await upsert_column_values(
+            db=db,
+            values=[
+                (player_data.user_id, column_input.column_id, column_input.value)
+                for player_data in player_columns
+                for column_input in player_data.columns
+            ]
         )
-        player_result = await db.execute(player_stmt)
-        tiesheet_player = player_result.scalar_one_or_none()
-
-        if tiesheet_player:
-            tiesheet_player.is_winner = player_data.is_winner
-
-        # Update or create column values
-        for column_input in player_data.columns:
-            cv_stmt = select(ColumnValues).where(
-                ColumnValues.user_id == player_data.user_id,
-                ColumnValues.column_id == column_input.column_id
-            )
-            cv_result = await db.execute(cv_stmt)
-            column_value = cv_result.scalar_one_or_none()
-
-            if column_value:
-                column_value.value = column_input.value
-            else:
-                new_column_value = ColumnValues(
-                    user_id=player_data.user_id,
-                    column_id=column_input.column_id,
-                    value=column_input.value
-                )
-                db.add(new_column_value)
 
     @staticmethod
     async def create_tiesheet(db:AsyncSession, tiesheet_detail : CreateTiesheet):
@@ -249,6 +198,7 @@ class TiesheetServices:
             ]
 
             db.add_all(tiesheet_players)
+            await touch_event_of(db=db, stage_id=tiesheet_detail.stage_id)
 
             await db.commit()
             await db.refresh(new_tiesheet)
@@ -263,43 +213,17 @@ class TiesheetServices:
         
     @staticmethod
     async def retrieve_tiesheet(db:AsyncSession, event_id : UUID, stage_id : UUID | None = None, today : bool | None = None):
-        rows = await TiesheetServices.get_tiesheet_with_player(event_id=event_id, db=db, today=today)
-        if stage_id:
-            rows = await TiesheetServices.get_tiesheet_with_player(event_id=event_id, stage_id=stage_id, db=db, today=today)
-
-        tiesheets: dict[UUID, dict] = {}
+        rows = await TiesheetServices.get_tiesheet_with_player(event_id=event_id, stage_id=stage_id, db=db, today=today)
 
+        tiesheets = []
         for row in rows:
-            tid = row["id"]
-            sid = row["stage_id"]
-            uid = row["user_id"]
-
-            if tid not in tiesheets:
-                tiesheet = {
-                    "id": tid,
-                    "scheduled_date": row["scheduled_date"],
-                    "scheduled_time": row["scheduled_time"],
-                    "stage_id": sid,
-                    "stage_name": row["stage_name"],
-                    "status": row["status"],
-                    "player_info": [],
-                }
-
-                if row.get("group_name"):
-                    tiesheet["group_name"] = row["group_name"]
-
-                tiesheets[tid] = tiesheet
+            tiesheet = dict(row)
+            # Knockout tiesheets have no group
+            if not tiesheet["group_name"]:
+                del tiesheet["group_name"]
+            tiesheets.append(tiesheet)
 
-            # Build player entry
-            player = {
-                "user_id": uid,
-                "is_winner": row["is_winner"],
-                "username": row["username"],
-            }
-
-            tiesheets[tid]["player_info"].append(player)
-
-        return list(tiesheets.values())
+        return tiesheets
     
     @staticmethod
     async def get_tiesheet_with_player_info_column_values(
@@ -386,50 +310,29 @@ class TiesheetServices:
             tiesheet.scheduled_time = tiesheet_detail.scheduled_time
             tiesheet.status = TiesheetStatus(tiesheet_detail.status)
             
-            # Update player_columns if provided
+            # Winner flags and column values of every player, one batched upsert each
             if tiesheet_detail.player_columns:
-                for player_data in tiesheet_detail.player_columns:
-                    # Update is_winner status
-                    player_stmt = select(TiesheetPlayer).where(
-                        TiesheetPlayer.tiesheet_id == tiesheet_id,
-                        TiesheetPlayer.user_id == player_data.user_id
-                    )
-                    player_result = await db.execute(player_stmt)
-                    tiesheet_player = player_result.scalar_one_or_none()
-                    
-                    if tiesheet_player:
-                        tiesheet_player.is_winner = player_data.is_winner
-                    
-                    # Update column values
-                    for column_input in player_data.columns:
-                        # Check if column value exists
-                        cv_stmt = select(ColumnValues).where(
-                            ColumnValues.user_id == player_data.user_id,
-                            ColumnValues.column_id == column_input.column_id
-                        )
-                        cv_result = await db.execute(cv_stmt)
-                        column_value = cv_result.scalar_one_or_none()
-                        
-                        if column_value:
-                            # Update existing value
-                            column_value.value = column_input.value
-                        else:
-                            # Create new column value
-                            new_column_value = ColumnValues(
-                                user_id=player_data.user_id,
-                                column_id=column_input.column_id,
-                                value=column_input.value
-                            )
-                            db.add(new_column_value)
-            
+                await TiesheetServices.save_player_columns(db, tiesheet_id, tiesheet_detail.player_columns)
+
+            # Status and winners decide the result columns, values entered with this request are kept
+            await refresh_tiesheet_standings(
+                db=db,
+                tiesheet_id=tiesheet_id,
+                keep={
+                    (player_data.user_id, column_input.column_id)
+                    for player_data in tiesheet_detail.player_columns or []
+                    for column_input in player_data.columns
+                }
+            )
+
+            await touch_event_of(db=db, tiesheet_id=tiesheet_id)
             await db.commit()
             await db.refresh(tiesheet)
             
-            return {
-                "message": "Tiesheet updated successfully",
-                "id": tiesheet.id
-            }
-            
+        except APIError:
+            # Not found and invalid column values keep their own status code
+            await db.rollback()
+            raise
         except SQLAlchemyError as e:
             await db.rollback()
             raise HTTPInternalServer(
@@ -440,3 +343,9 @@ class TiesheetServices:
             raise HTTPInternalServer(
                 f"Failed to update tiesheet: {str(e)}"
             )
+
+        await MatchServices.publish_live_update(db=db, tiesheet_id=tiesheet_id, update="tiesheet.updated")
+        return {
+            "message": "Tiesheet updated successfully",
+            "id": tiesheet.id
+        }
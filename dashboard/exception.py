@@ -21,6 +21,9 @@ class APIError(Exception):
 class HTTPUnauthorized(APIError):
     http_code = 401
 
+class HTTPForbidden(APIError):
+    http_code = 403
+
 class HTTPConflict(APIError):
     http_code = 409
 
@@ -32,3 +35,6 @@ class HTTPBadRequest(APIError):
 
 class HTTPInternalServer(APIError):
     http_code = 500
+
+class HTTPServiceUnavailable(APIError):
+    http_code = 503
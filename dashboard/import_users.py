@@ -0,0 +1,34 @@
+"""
+Bulk user import from the command line, same rules as POST /user/import.
+
+    python import_users.py users.csv
+    python import_users.py users.json
+"""
+import asyncio
+import sys
+from db_connect import AsyncSessionLocal
+from exception import APIError
+from users.services import parse_user_import, import_users_services
+
+async def import_users(path : str):
+    with open(path, "rb") as file:
+        content = file.read()
+
+    try:
+        users, conflicts = parse_user_import(content, path)
+        async with AsyncSessionLocal() as db:
+            result = await import_users_services(db=db, users=users, conflicts=conflicts)
+    except APIError as e:
+        print("Failed to import users:", e.detail)
+        sys.exit(1)
+
+    print(result["message"])
+    for conflict in result["conflicts"]:
+        print(f"row {conflict['row']}: {conflict['detail']} ({conflict['username']}, {conflict['email']})")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python import_users.py <users.csv|users.json>")
+        sys.exit(2)
+    asyncio.run(import_users(sys.argv[1]))
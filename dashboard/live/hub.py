@@ -0,0 +1,119 @@
+import asyncio
+import json
+from collections import OrderedDict
+from fastapi.encoders import jsonable_encoder
+
+SUBSCRIBER_QUEUE_SIZE = 100
+# Published states kept to diff the next update against, least recently published dropped first
+LIVE_STATE_SIZE = 1024
+
+
+class Subscription:
+    """ Topics of one connected client and the updates waiting to be sent to it """
+
+    def __init__(self, topics: set[str]):
+        self.topics = topics
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def offer(self, message: str):
+        # A client that stopped reading loses its oldest updates, never blocks the publisher
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class LiveHub:
+    """
+        In-process fan-out of live updates to WebSocket subscribers.
+        Each update is serialized once and the same text is queued for every subscriber.
+        Only clients connected to this worker receive updates published by it.
+    """
+
+    def __init__(self):
+        self.topics: dict[str, set[Subscription]] = {}
+        # id -> (seq, state) of the last state published under that id
+        self.states: OrderedDict[str, tuple[int, dict]] = OrderedDict()
+
+    def subscribe(self, topics: set[str]) -> Subscription:
+        subscription = Subscription(topics)
+        for topic in topics:
+            self.topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for topic in subscription.topics:
+            subscribers = self.topics.get(topic)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.topics[topic]
+
+    def has_subscribers(self, topics) -> bool:
+        return any(topic in self.topics for topic in topics)
+
+    def publish(self, topics, payload: dict) -> int:
+        """ Queue payload for every subscriber of any of the topics, returns how many got it """
+        subscriptions = set()
+        for topic in topics:
+            subscriptions |= self.topics.get(topic, set())
+        if not subscriptions:
+            return 0
+
+        message = json.dumps(jsonable_encoder(payload))
+        for subscription in subscriptions:
+            subscription.offer(message)
+        return len(subscriptions)
+
+    def publish_state(self, topics, update: str, state_id, state: dict) -> int:
+        """
+            Publish only what changed in state since the last state published under state_id.
+            Changes carry whole values, so they apply on top of any newer copy fetched over HTTP.
+            seq grows by one per publish of an id, a client seeing a gap refetches the full state.
+            The first publish of an id on this worker sends the full state.
+        """
+        state_id = str(state_id)
+        state = jsonable_encoder(state)
+        previous = self.states.pop(state_id, None)
+        seq = previous[0] + 1 if previous else 1
+        self.states[state_id] = (seq, state)
+        while len(self.states) > LIVE_STATE_SIZE:
+            self.states.popitem(last=False)
+
+        payload = {"type": update, "id": state_id, "seq": seq}
+        if previous is None:
+            payload["state"] = state
+        else:
+            payload["changes"] = diff_state(previous[1], state)
+        return self.publish(topics, payload)
+
+
+def diff_state(previous: dict, state: dict) -> dict:
+    """
+        Fields of state that differ from previous. matchDetail is compared per match_id:
+        changed or new matches are listed in full and deleted ones in removedMatches.
+    """
+    changes = {key: value for key, value in state.items() if key != "matchDetail" and previous.get(key) != value}
+
+    previous_matches = {match["match_id"]: match for match in previous.get("matchDetail") or []}
+    matches = {match["match_id"]: match for match in state.get("matchDetail") or []}
+    changed = [match for match_id, match in matches.items() if previous_matches.get(match_id) != match]
+    removed = [match_id for match_id in previous_matches if match_id not in matches]
+    if changed:
+        changes["matchDetail"] = changed
+    if removed:
+        changes["removedMatches"] = removed
+    return changes
+
+
+def event_topic(event_id) -> str:
+    return f"event:{event_id}"
+
+def stage_topic(stage_id) -> str:
+    return f"stage:{stage_id}"
+
+def tiesheet_topic(tiesheet_id) -> str:
+    return f"tiesheet:{tiesheet_id}"
+
+
+hub = LiveHub()
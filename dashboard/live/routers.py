@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from uuid import UUID
+from users.services import verify_jwt_token
+from live.hub import hub, event_topic, stage_topic, tiesheet_topic
+
+logger = logging.getLogger("dashboard.live")
+
+router = APIRouter()
+
+@router.websocket("")
+async def live_updates(
+    websocket: WebSocket,
+    token: str,
+    event_id: UUID | None = None,
+    stage_id: UUID | None = None,
+    tiesheet_id: UUID | None = None,
+):
+    """
+        Push tiesheet and match updates of an event, stage or tiesheet as JSON text messages.
+        Browsers cannot set headers on a WebSocket, so the access token comes as a query parameter.
+    """
+    try:
+        await verify_jwt_token(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    topics = set()
+    if event_id:
+        topics.add(event_topic(event_id))
+    if stage_id:
+        topics.add(stage_topic(stage_id))
+    if tiesheet_id:
+        topics.add(tiesheet_topic(tiesheet_id))
+    if not topics:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Subscribe to an event, stage or tiesheet")
+        return
+
+    await websocket.accept()
+    subscription = hub.subscribe(topics)
+
+    async def send_updates():
+        while True:
+            await websocket.send_text(await subscription.queue.get())
+
+    async def wait_for_disconnect():
+        # Clients do not send anything, reading only notices the disconnect
+        while True:
+            await websocket.receive_text()
+
+    sender = asyncio.create_task(send_updates())
+    receiver = asyncio.create_task(wait_for_disconnect())
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        if sender in done and not isinstance(sender.exception(), WebSocketDisconnect):
+            logger.warning("Live update sender failed, closing the connection", exc_info=sender.exception())
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+    finally:
+        hub.unsubscribe(subscription)
+        sender.cancel()
+        receiver.cancel()
+        # Retrieve both outcomes so no task exception goes unobserved
+        await asyncio.gather(sender, receiver, return_exceptions=True)
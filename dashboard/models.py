@@ -10,10 +10,17 @@ from sqlalchemy import (
     UniqueConstraint,
     func,
     PrimaryKeyConstraint,
-    Time
+    Time,
+    Numeric,
+    Index,
+    Computed,
+    Integer,
+    BigInteger,
+    text
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from datetime import date, datetime, time
+from decimal import Decimal
 import uuid
 
 
@@ -100,6 +107,12 @@ class User(Mixins, Base):
         back_populates="user",
         cascade="save-update, delete, delete-orphan"
     )
+
+    __table_args__ = (
+        # Byte order collation so prefix searches on the lowercased username can use the index
+        Index("ix_users_username_lower", func.lower(username).collate("C"), "id"),
+    )
+
     def __repr__(self):
         return f"<User id={self.id} username={self.username}>"
 
@@ -112,6 +125,8 @@ class Event(Mixins, Base):
     startdate: Mapped[date] = mapped_column(Date, nullable=False)
     enddate: Mapped[date] = mapped_column(Date, nullable=False)
     status: Mapped[str] = mapped_column(String(20), nullable=False)
+    # Bumped by every commit that changes the event's stages, groups, tiesheets, matches, columns or qualifiers
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     # Many to many relationship
     users: Mapped[list["User"]] = relationship(
@@ -162,7 +177,9 @@ class Role(Mixins, Base):
     can_create_events: Mapped[bool] = mapped_column(Boolean, default=False)
     can_delete_events: Mapped[bool] = mapped_column(Boolean, default=False)
 
-    
+    # enums.Permission bits of the can_* flags above and of the role's access pages, kept in sync on write
+    permissions: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     userrole: Mapped[list["UserRole"]] = relationship(
         back_populates="role",
         cascade="save-update, delete, delete-orphan"
@@ -195,6 +212,12 @@ class UserRole(Mixins, Base):
         nullable=False
     )
 
+    __table_args__ = (
+        # One role per user within an event, global roles (event_id NULL) are not constrained
+        UniqueConstraint("user_id", "event_id", name="uq_userrole_user_event"),
+        Index("ix_userrole_event_created", "event_id", "created_at", "id"),
+    )
+
     event: Mapped["Event"] = relationship(
         back_populates="userrole",
     )
@@ -247,6 +270,10 @@ class Stage(Mixins, Base):
 
     name: Mapped[str] = mapped_column(String(30), nullable=False)
 
+    __table_args__ = (
+        Index("ix_stages_event_created", "event_id", "created_at"),
+    )
+
     event: Mapped["Event"] = relationship(
         back_populates="stages",
     )
@@ -292,6 +319,11 @@ class Group(Mixins, Base):
     )
     name: Mapped[str] = mapped_column(String(50), nullable=False)
 
+    __table_args__ = (
+        Index("ix_groups_stage", "stage_id"),
+        Index("ix_groups_event", "event_id"),
+    )
+
     stage: Mapped["Stage"] = relationship(back_populates="groups")
 
     members: Mapped[list["GroupMembers"]] = relationship(
@@ -313,6 +345,7 @@ class GroupMembers(Mixins, Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "group_id", name="uq_groupmembers_user_id_group_id"),
+        Index("ix_groupmembers_group_user", "group_id", "user_id"),
     )
 
     group_id: Mapped[uuid.UUID] = mapped_column(
@@ -332,6 +365,10 @@ class GroupMembers(Mixins, Base):
         return f"<GroupMembers user_id={self.user_id} group_id={self.group_id}>"
 
 
+# Text values that parse as numbers, mirrored into a NUMERIC generated column
+NUMERIC_VALUE_SQL = "CASE WHEN {column} ~ '^\\s*-?[0-9]+(\\.[0-9]+)?\\s*$' THEN trim({column})::numeric END"
+
+
 class StandingColumn(Mixins, Base):
     __tablename__ = "standingcolumns"
 
@@ -341,6 +378,12 @@ class StandingColumn(Mixins, Base):
     )
     column_field : Mapped[str] = mapped_column(String(255), nullable=False)
     default_value : Mapped[str] = mapped_column(String(60), nullable=True)
+    # int, decimal or text; typed columns only accept values of that type
+    value_type : Mapped[str] = mapped_column(String(10), nullable=False, default="text", server_default="text")
+
+    __table_args__ = (
+        Index("ix_standingcolumns_stage", "stage_id"),
+    )
 
     stage: Mapped["Stage"] = relationship(back_populates="columns")
     values: Mapped[list["ColumnValues"]] = relationship(
@@ -364,6 +407,10 @@ class ColumnValues(Mixins,Base):
     )
 
     value : Mapped[str] = mapped_column(String(60),nullable=False)
+    numeric_value : Mapped[Decimal | None] = mapped_column(
+        Numeric,
+        Computed(NUMERIC_VALUE_SQL.format(column="value"), persisted=True),
+    )
     
     __table_args__ = (
         PrimaryKeyConstraint(
@@ -371,6 +418,7 @@ class ColumnValues(Mixins,Base):
             "column_id",
             name="pk_columnvalues",
         ),
+        Index("ix_columnvalues_column_numeric", "column_id", "numeric_value"),
     )
     user: Mapped["User"] = relationship(back_populates="column_values")
     column: Mapped["StandingColumn"] = relationship(back_populates="values")
@@ -379,6 +427,76 @@ class ColumnValues(Mixins,Base):
         return f"<Column Value value={self.value}>"
 
 
+class Standing(Base):
+    """ Per-stage standings projection of ColumnValues, refreshed whenever results change """
+    __tablename__ = "standings"
+
+    stage_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("stages.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    match_played: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+    win: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+    loss: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+    draw: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+    points: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+
+    # Every column of the stage keyed by lowercased column_field, as shown in the standings table
+    column_values: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    __table_args__ = (
+        PrimaryKeyConstraint("stage_id", "user_id", name="pk_standings"),
+        Index("ix_standings_stage_points", "stage_id", points.desc(), user_id.desc()),
+    )
+
+    def __repr__(self):
+        return f"<Standing stage_id={self.stage_id} user_id={self.user_id} points={self.points}>"
+
+
+class EventStanding(Base):
+    """ Event-wide standings projection, a user's best points and column values over the event's stages """
+    __tablename__ = "event_standings"
+
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("events.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    points: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+
+    # Highest value of every column over the stages, keyed by lowercased column_field
+    column_values: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    __table_args__ = (
+        PrimaryKeyConstraint("event_id", "user_id", name="pk_event_standings"),
+        Index("ix_event_standings_event_points", "event_id", points.desc(), user_id.desc()),
+    )
+
+    def __repr__(self):
+        return f"<EventStanding event_id={self.event_id} user_id={self.user_id} points={self.points}>"
+
+
 class Tiesheet(Mixins, Base):
     __tablename__ = "tiesheets"
 
@@ -404,6 +522,22 @@ class Tiesheet(Mixins, Base):
 
     status : Mapped[str] = mapped_column(String(20),nullable=True)
 
+    # Slot in a knockout bracket: round 1 is the first round, position counts from 0 within a round
+    bracket_round : Mapped[int | None] = mapped_column(Integer, nullable=True)
+    bracket_position : Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_tiesheets_stage_scheduled", "stage_id", "scheduled_date"),
+        Index("ix_tiesheets_scheduled_date", "scheduled_date"),
+        Index("ix_tiesheets_group", "group_id"),
+        Index(
+            "uq_tiesheets_bracket_slot",
+            "stage_id", "bracket_round", "bracket_position",
+            unique=True,
+            postgresql_where=text("bracket_round IS NOT NULL"),
+        ),
+    )
+
     players: Mapped[list["TiesheetPlayer"]] = relationship(
         back_populates="tiesheet",
         cascade="save-update, delete, delete-orphan",
@@ -430,6 +564,11 @@ class TiesheetPlayer(Mixins,Base):
 
     is_winner: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    __table_args__ = (
+        Index("ix_tiesheet_players_tiesheet_created", "tiesheet_id", "created_at"),
+        Index("ix_tiesheet_players_user", "user_id"),
+    )
+
     tiesheet: Mapped["Tiesheet"] = relationship(back_populates="players")
     user: Mapped["User"] = relationship(back_populates="tiesheetplayer")
     matchscore : Mapped[list["Tiesheetplayermatchscore"]] = relationship(back_populates="tiesheetplayer", cascade="save-update, delete, delete-orphan")
@@ -446,6 +585,10 @@ class Match(Mixins, Base):
 
     match_name : Mapped[str] = mapped_column(String(50),nullable=False)
 
+    __table_args__ = (
+        Index("ix_roundmatch_tiesheet_created", "tiesheet_id", "created_at"),
+    )
+
     tiesheet: Mapped["Tiesheet"] = relationship(back_populates="match")
     matchscore : Mapped["Tiesheetplayermatchscore"] = relationship(back_populates="match", cascade="save-update, delete, delete-orphan")
     
@@ -464,12 +607,17 @@ class Tiesheetplayermatchscore(Mixins, Base):
     )
 
     points : Mapped[str] = mapped_column(String(50), nullable=True)
+    numeric_points : Mapped[Decimal | None] = mapped_column(
+        Numeric,
+        Computed(NUMERIC_VALUE_SQL.format(column="points"), persisted=True),
+    )
     winner : Mapped[bool] = mapped_column(Boolean, default=False)
     match : Mapped["Match"] = relationship(back_populates="matchscore")
     tiesheetplayer : Mapped["TiesheetPlayer"] = relationship(back_populates="matchscore")
 
     __table_args__ = (
         UniqueConstraint('match_id', 'tiesheetplayer_id', name='uq_match_tiesheetplayer'),
+        Index("ix_match_score_tiesheetplayer", "tiesheetplayer_id"),
     )
 
     def __repr__(self):
@@ -495,6 +643,7 @@ class Qualifier(Mixins, Base):
             "user_id",
             name="uq_qualifier_event_stage_user",
         ),
+        Index("ix_qualifier_stage_user", "stage_id", "user_id"),
     )
 
     event: Mapped["Event"] = relationship(back_populates="qualifiers")
@@ -502,4 +651,14 @@ class Qualifier(Mixins, Base):
     user: Mapped["User"] = relationship(back_populates="qualifiers")
 
     def __repr__(self):
-        return f"<Qualifier id={self.id}>"  
\ No newline at end of file
+        return f"<Qualifier id={self.id}>"  
+
+class DashboardCounter(Base):
+    """ Running totals shown on the home page, adjusted by the writes that change them """
+    __tablename__ = "dashboard_counters"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<DashboardCounter name={self.name} value={self.value}>"
@@ -1,9 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from models import user_event_association, User
-from sqlalchemy import select,and_
-from participants.schema import UserResponse
+from sqlalchemy import select,and_, func, tuple_
+from participants.schema import UserResponse, UserParticipantOrNotList
 from exception import HTTPNotFound
+from services import decode_cursor, encode_cursor
 
 async def extract_participants(event_id: UUID, db: AsyncSession):
     stmt = (
@@ -33,4 +34,52 @@ async def validate_participants(
 
         if not participants:
             raise HTTPNotFound("Round not found")
-        return participants
\ No newline at end of file
+        return participants
+
+async def extract_non_participants(
+        db: AsyncSession,
+        event_id: UUID,
+        limit: int,
+        search: str | None = None,
+        cursor: str | None = None,
+    ):
+    """
+        Users not enrolled in the event ordered by username, one page at a time.
+        search keeps the usernames starting with it, ignoring case.
+    """
+    # Same expression as ix_users_username_lower so filtering and ordering run on the index
+    username_key = func.lower(User.username).collate("C")
+    enrolled = (
+        select(user_event_association.c.user_id)
+        .where(
+            user_event_association.c.user_id == User.id,
+            user_event_association.c.event_id == event_id
+        )
+    )
+    stmt = (
+        select(User.id, User.username, username_key.label("username_key"))
+        .where(~enrolled.exists())
+        .order_by(username_key, User.id)
+    )
+
+    if search:
+        prefix = search.lower()
+        # The lower bound lets a generic prepared plan still range scan the index
+        stmt = stmt.where(username_key >= prefix, username_key.startswith(prefix, autoescape=True))
+
+    if cursor:
+        username, user_id = decode_cursor(cursor, str, UUID)
+        stmt = stmt.where(tuple_(username_key, User.id) > (username, user_id))
+
+    result = await db.execute(stmt.limit(limit + 1))
+    users = result.mappings().all()
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1]["username_key"], users[-1]["id"])
+
+    return {
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "items": UserParticipantOrNotList.validate_python(users)
+    }
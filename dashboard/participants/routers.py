@@ -1,5 +1,5 @@
 from models import user_event_association, User, Qualifier
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from participants.schema import Participants, Participants, UserParticipantOrNot
 from db_connect import get_db_session
 from typing import Annotated
@@ -7,7 +7,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select,and_
 from uuid import UUID
 from participants.services import ParticipantsServices
-from participants.crud import extract_participants
+from participants.crud import extract_participants, extract_non_participants
+from events.crud import extract_event_by_id
+from exception import HTTPNotFound
+from responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -26,7 +29,8 @@ async def extract_participant_by_event(
     event_id : UUID,
     db: Annotated[AsyncSession, Depends(get_db_session)],
 ):  
-    return await ParticipantsServices.extract_participant_by_event(db=db, event_id=event_id)
+    participants = await ParticipantsServices.extract_participant_by_event(db=db, event_id=event_id)
+    return FastJSONResponse(participants)
       
 
 @router.get("/user")
@@ -45,15 +49,19 @@ async def retrieve_participants(event_id: UUID, db: Annotated[AsyncSession,Depen
     }
 
 @router.get("/not-participants")
-async def retrieve_not_participants(event_id : UUID,  db: Annotated[AsyncSession,Depends(get_db_session)]):
-    participants = await extract_participants(event_id=event_id, db=db)
-    participant_ids = [p.id for p in participants]
+async def retrieve_not_participants(
+    event_id : UUID,
+    db: Annotated[AsyncSession,Depends(get_db_session)],
+    search: str | None = Query(None, max_length=30),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
+):
+    event = await extract_event_by_id(db=db, event_id=event_id)
+    if not event:
+        raise HTTPNotFound("Event not found")
 
-    stmt = select(User.id,User.username).where(User.id.notin_(participant_ids))
-    result = await db.execute(stmt)  
-    users = result.all()
-    
-    return [ UserParticipantOrNot.model_validate(user) for user in users]
+    users = await extract_non_participants(db=db, event_id=event_id, limit=limit, search=search, cursor=cursor)
+    return FastJSONResponse(users)
 
 @router.get("/not_qualifier")
 async def retrieve_user_not_in_qualifier(stage_id : UUID,event_id : UUID,db: Annotated[AsyncSession,Depends(get_db_session)]):
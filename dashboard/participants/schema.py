@@ -1,4 +1,4 @@
-from pydantic import BaseModel,ConfigDict
+from pydantic import BaseModel,ConfigDict,TypeAdapter
 from typing import List
 from uuid import UUID
 
@@ -19,6 +19,8 @@ class ParticipantsEventResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+ParticipantsEventResponseList = TypeAdapter(list[ParticipantsEventResponse])
+
 class ParticipantsUserResponse(BaseModel):
     user_id : UUID
     event_id : UUID
@@ -53,3 +55,5 @@ class UserParticipantOrNot(BaseModel):
     username : str
 
     model_config = ConfigDict(from_attributes=True)
+
+UserParticipantOrNotList = TypeAdapter(list[UserParticipantOrNot])
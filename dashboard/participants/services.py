@@ -2,14 +2,25 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import UUID
 from events.stage.crud import extract_stage_by_id
 from events.group.service import GroupServices
-from models import GroupMembers, Group, Stage, User, Qualifier, user_event_association, StandingColumn, ColumnValues, UserRole, Event
-from sqlalchemy import select, and_, insert, delete
+from models import GroupMembers, Group, Stage, User, Qualifier, user_event_association, StandingColumn, ColumnValues, UserRole, Event, Standing, EventStanding
+from sqlalchemy import select, and_, delete, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from events.crud import extract_event_by_id
 from participants.crud import validate_participants
 from exception import HTTPNotFound, HTTPInternalServer
-from participants.schema import Participants, ParticipantsEventResponse, ParticipantsUserResponse, ParticipantsNotInGroup
+from participants.schema import Participants, ParticipantsEventResponseList, ParticipantsUserResponse, ParticipantsNotInGroup
 from roles.services import get_member_role_id
+from roles.permissions import invalidate_user_permissions
+from events.overalltiesheet.crud import refresh_standings
+from cache import touch_event
 from sqlalchemy.exc import SQLAlchemyError
+from dotenv import load_dotenv
+from uuid import uuid4
+import os
+
+load_dotenv()
+# Users enrolled per transaction by create_participants
+PARTICIPANT_CHUNK_SIZE = int(os.getenv("PARTICIPANT_CHUNK_SIZE", "1000"))
 
 class ParticipantsServices:        
     @staticmethod
@@ -89,87 +100,91 @@ class ParticipantsServices:
     
     @staticmethod
     async def create_participants( db:AsyncSession, event_id : UUID, participants : Participants):
+        """
+            Enroll users in the event PARTICIPANT_CHUNK_SIZE at a time, each chunk in its own transaction.
+            Users already enrolled are skipped, so a failed or repeated request can simply be sent again.
+        """
+        # Round 1 is the first stage of the event
+        result = await db.execute(
+            select(Stage.id).where(
+                Stage.event_id == event_id,
+            ).order_by(Stage.created_at).limit(1)
+        )
+        stage_id = result.scalar_one_or_none()
+        if not stage_id:
+            raise HTTPNotFound("Stage round 1 not found for this event")
+
+        role_id = await get_member_role_id(db=db)
+        if not role_id:
+            raise HTTPNotFound("Role not found")
+
+        user_ids = list(dict.fromkeys(participants.user_id))
+        inserted = 0
+        not_found = 0
         try:
-            # 1. Insert into user_event_association (bulk)
-            association_rows = [
-                {
-                    "user_id": p,
-                    "event_id": event_id,
-                }
-                for p in participants.user_id
-            ]
-
-            await db.execute(
-                insert(user_event_association),
-                association_rows
-            )
+            for start in range(0, len(user_ids), PARTICIPANT_CHUNK_SIZE):
+                chunk = user_ids[start:start + PARTICIPANT_CHUNK_SIZE]
 
-            print("Working 1")
-            # 2. Get stage_id for round 1
-            result = await db.execute(
-                select(Stage.id).where(
-                    Stage.event_id == event_id,
-                ).order_by(Stage.created_at)
-            )
-            stage_id = result.scalars().all()
+                # Selected from users so unknown ids are skipped instead of failing the chunk
+                result = await db.execute(
+                    pg_insert(user_event_association)
+                    .from_select(
+                        ["user_id", "event_id"],
+                        select(User.id, literal(event_id)).where(User.id.in_(chunk))
+                    )
+                    .on_conflict_do_nothing()
+                    .returning(user_event_association.c.user_id)
+                )
+                enrolled = result.scalars().all()
 
-            if not stage_id:
-                raise HTTPNotFound("Stage round 1 not found for this event")
+                if len(enrolled) < len(chunk):
+                    existing = await db.scalar(
+                        select(func.count(User.id)).where(User.id.in_(set(chunk) - set(enrolled)))
+                    )
+                    not_found += len(chunk) - len(enrolled) - existing
 
-            print("Working 2")
-            # 3. Get standing columns + default values
-            result = await db.execute(
-                select(
-                    StandingColumn.id,
-                    StandingColumn.default_value
-                ).where(StandingColumn.stage_id == stage_id[0])
-            )
-            cols_and_vals = result.all()
-            
-            print("Working 3")
-            # 4. Create ColumnValues for each user & column
-            new_col_vals = [
-                ColumnValues(
-                    user_id=p,
-                    column_id=col_id,
-                    value=default_value
+                if not enrolled:
+                    continue
+
+                # Default value of every standing column of round 1 for each new participant
+                await db.execute(
+                    pg_insert(ColumnValues)
+                    .from_select(
+                        ["id", "user_id", "column_id", "value"],
+                        select(func.gen_random_uuid(), User.id, StandingColumn.id, StandingColumn.default_value)
+                        .where(User.id.in_(enrolled), StandingColumn.stage_id == stage_id)
+                    )
+                    .on_conflict_do_nothing()
                 )
-                for p in participants.user_id
-                for col_id, default_value in cols_and_vals
-            ]
-            
-            print("Working 4")
-            # 5. Create Round 1 qualifiers
-            new_qualifiers = [
-                Qualifier(
-                    event_id=event_id,
-                    stage_id=stage_id[0],
-                    user_id=p
+
+                await db.execute(
+                    pg_insert(Qualifier).on_conflict_do_nothing(),
+                    [{"id": uuid4(), "event_id": event_id, "stage_id": stage_id, "user_id": user_id} for user_id in enrolled]
                 )
-                for p in participants.user_id
-            ]
-
-            db.add_all(new_col_vals)
-            db.add_all(new_qualifiers)
-
-            role_id = await get_member_role_id(db=db)
-            userrole = [
-                UserRole(
-                    user_id = p,
-                    event_id = event_id,
-                    role_id = role_id
+
+                # A role assigned in the event before enrollment is kept
+                await db.execute(
+                    pg_insert(UserRole).on_conflict_do_nothing(),
+                    [{"id": uuid4(), "user_id": user_id, "event_id": event_id, "role_id": role_id} for user_id in enrolled]
                 )
-                for p in participants.user_id
-            ]
-            db.add_all(userrole)
-            await db.commit()
 
-            return {"message": "Participants added successfully"}
+                await refresh_standings(db, stage_id, enrolled)
+                touch_event(db, event_id)
+                invalidate_user_permissions(db, *enrolled)
+                await db.commit()
+                inserted += len(enrolled)
 
         except SQLAlchemyError as e:
             await db.rollback()
             raise HTTPInternalServer(f"Failed to add participants: {str(e)}")
 
+        return {
+            "message": f"{inserted} participants added successfully",
+            "inserted": inserted,
+            "already_present": len(user_ids) - inserted - not_found,
+            "not_found": not_found,
+        }
+
     @staticmethod
     async def extract_participant_by_event(db:AsyncSession, event_id : UUID):
         try:
@@ -186,7 +201,7 @@ class ParticipantsServices:
             result = await db.execute(stmt)
             participants = result.mappings().all()
 
-            return [ParticipantsEventResponse.model_validate(p) for p in participants]
+            return ParticipantsEventResponseList.validate_python(participants)
         except SQLAlchemyError as e:
             await db.rollback()
             raise HTTPInternalServer(f"Failed to extract participants by event: {str(e)}")
@@ -241,9 +256,22 @@ class ParticipantsServices:
                     UserRole.user_id == user_id
                 )
             )
+            # Drop the user from the standings of every stage of the event
+            stmt4 = delete(Standing).where(
+                Standing.user_id == user_id,
+                Standing.stage_id.in_(select(Stage.id).where(Stage.event_id == event_id))
+            )
             await db.execute(stmt)
             await db.execute(stmt2)
             await db.execute(stmt3)
+            stmt5 = delete(EventStanding).where(
+                EventStanding.user_id == user_id,
+                EventStanding.event_id == event_id
+            )
+            await db.execute(stmt4)
+            await db.execute(stmt5)
+            touch_event(db, event_id)
+            invalidate_user_permissions(db, user_id)
             await db.commit()
 
             return{
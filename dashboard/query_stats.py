@@ -0,0 +1,58 @@
+from collections import Counter
+from contextvars import ContextVar
+from time import perf_counter
+from sqlalchemy import event
+from dotenv import load_dotenv
+from db_connect import engine
+import logging
+import os
+
+load_dotenv()
+# Executions of the same statement within one request that get reported as a suspected N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
+
+logger = logging.getLogger("dashboard.queries")
+
+
+class QueryStats:
+    """ Queries run and time spent in the database while handling one request """
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        # Statements are parameterized, so equal text means the same query shape
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement] += 1
+
+    def suspected_n_plus_one(self) -> list[tuple[str, int]]:
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= N_PLUS_ONE_THRESHOLD]
+
+    def server_timing(self) -> str:
+        return f'db;desc="{self.count} queries";dur={self.total_time * 1000:.3f}'
+
+    def log(self, method: str, path: str):
+        logger.debug("%s %s ran %d queries in %.3f ms", method, path, self.count, self.total_time * 1000)
+        for statement, count in self.suspected_n_plus_one():
+            logger.warning("Suspected N+1 in %s %s, statement ran %d times: %s", method, path, count, " ".join(statement.split()))
+
+
+request_query_stats: ContextVar[QueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+# Cursor events run in SQLAlchemy's greenlet, which shares the request task's context
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_started = perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    stats = request_query_stats.get()
+    started = getattr(context, "query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, perf_counter() - started)
@@ -0,0 +1,17 @@
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+from typing import Any
+
+
+class FastJSONResponse(JSONResponse):
+    """
+        JSON response rendered by pydantic-core in a single pass, and the app's default response class.
+        Models, UUID, date/datetime and Enum values are serialized natively, so routes
+        returning this directly skip FastAPI's jsonable_encoder walk over the payload.
+        Routes returning plain content still go through jsonable_encoder first, which writes
+        Decimal as a JSON number (standings points included). Returned directly, Decimal is
+        written as a string, so convert it before returning this from a route.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
@@ -8,8 +8,8 @@ async def get_user_role(
     db : AsyncSession,
     user_id : UUID
 ):
-    """ Extract user Role """
-    role_info = await db.execute(select(UserRole).where(UserRole.user_id == user_id))
+    """ Extract the global user Role, not the roles assigned within events """
+    role_info = await db.execute(select(UserRole).where(UserRole.user_id == user_id, UserRole.event_id.is_(None)))
     return role_info.scalars().first()
 
 async def get_role_by_id( db : AsyncSession, role_id : UUID):
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from sqlalchemy import event, select, case
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from dotenv import load_dotenv
+from models import Role, UserRole
+from roles.schema import UserEventRole
+from enums import Permission, ROLE_PERMISSIONS, PAGE_PERMISSIONS
+import os
+import time
+
+load_dotenv()
+PERMISSION_CACHE_SIZE = int(os.getenv("PERMISSION_CACHE_SIZE", 4096))
+# Upper bound on staleness for other workers, which do not see this worker's invalidations
+PERMISSION_CACHE_TTL_SECONDS = float(os.getenv("PERMISSION_CACHE_TTL_SECONDS", 60))
+
+
+class PermissionCache:
+    """
+        LRU cache of the resolved role of a user in an event, keyed by (user_id, event_id).
+        Users without a role are cached too, as None.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[tuple, tuple[float, UserEventRole | None]] = OrderedDict()
+        self.user_keys: dict[UUID, set[tuple]] = {}
+        # Bumped on every invalidation so a resolve that raced a role change does not store stale data
+        self.generation = 0
+
+    def get(self, key: tuple):
+        """ (hit, role) for the key """
+        cached = self.entries.get(key)
+        if cached is None:
+            return False, None
+        expires_at, role = cached
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return False, None
+        self.entries.move_to_end(key)
+        return True, role
+
+    def set(self, key: tuple, role: UserEventRole | None, generation: int):
+        if self.max_entries <= 0 or generation != self.generation:
+            return
+
+        self.entries[key] = (time.monotonic() + self.ttl, role)
+        self.entries.move_to_end(key)
+        self.user_keys.setdefault(key[0], set()).add(key)
+        while len(self.entries) > self.max_entries:
+            oldest, _ = self.entries.popitem(last=False)
+            self._forget(oldest)
+
+    def invalidate_user(self, user_id: UUID):
+        self.generation += 1
+        for key in self.user_keys.pop(user_id, set()):
+            self.entries.pop(key, None)
+
+    def clear(self):
+        self.generation += 1
+        self.entries.clear()
+        self.user_keys.clear()
+
+    def _remove(self, key: tuple):
+        self.entries.pop(key, None)
+        self._forget(key)
+
+    def _forget(self, key: tuple):
+        keys = self.user_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.user_keys[key[0]]
+
+
+permission_cache = PermissionCache(PERMISSION_CACHE_SIZE, PERMISSION_CACHE_TTL_SECONDS)
+
+
+def pack_permissions(role, pages) -> int:
+    """ Permission bits of an object with the can_* flags and one with the *_page flags """
+    mask = Permission(0)
+    for permission in ROLE_PERMISSIONS:
+        if getattr(role, permission.name, False):
+            mask |= permission
+    for permission in PAGE_PERMISSIONS:
+        if pages is not None and getattr(pages, permission.name, False):
+            mask |= permission
+    return int(mask)
+
+
+def unpack_permissions(mask: int) -> dict:
+    """ can_* flags plus a roleaccesspage dict of *_page flags, the shape of RoleResponse """
+    return {
+        **{permission.name: bool(mask & permission) for permission in ROLE_PERMISSIONS},
+        "roleaccesspage": {permission.name: bool(mask & permission) for permission in PAGE_PERMISSIONS},
+    }
+
+
+async def resolve_user_role(db: AsyncSession, user_id: UUID, event_id: UUID | None = None) -> UserEventRole | None:
+    """
+        Role and page access of a user in an event: the role assigned in the event when there is one,
+        the global role otherwise. Served from memory after the first call, one query on a miss
+        reading the packed permissions instead of the role access page.
+    """
+    key = (user_id, event_id)
+    hit, role = permission_cache.get(key)
+    if hit:
+        return role
+
+    generation = permission_cache.generation
+    # The role assigned in the event first, then the global role, then any other role of the user
+    priority = case((UserRole.event_id == event_id, 0), (UserRole.event_id.is_(None), 1), else_=2)
+    stmt = (
+        select(Role.id, Role.rolename, Role.permissions)
+        .join(UserRole, UserRole.role_id == Role.id)
+        .where(UserRole.user_id == user_id)
+        .order_by(priority, UserRole.created_at)
+        .limit(1)
+    )
+    result = await db.execute(stmt)
+    row = result.first()
+
+    role = None
+    if row:
+        role = UserEventRole.model_validate({"id": row.id, "rolename": row.rolename, **unpack_permissions(row.permissions)})
+    permission_cache.set(key, role, generation)
+    return role
+
+
+def invalidate_user_permissions(db: AsyncSession, *user_ids):
+    """ Drop the cached permissions of these users once this transaction commits """
+    db.info.setdefault("permission_users", set()).update(UUID(str(user_id)) for user_id in user_ids if user_id)
+
+
+def invalidate_all_permissions(db: AsyncSession):
+    """ Drop every cached permission once this transaction commits, for changes to a role itself """
+    db.info["permission_all"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def drop_invalidated_permissions(session):
+    if session.info.pop("permission_all", False):
+        permission_cache.clear()
+    for user_id in session.info.pop("permission_users", ()):
+        permission_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_invalidated_permissions(session, previous_transaction):
+    session.info.pop("permission_all", None)
+    session.info.pop("permission_users", None)
@@ -2,18 +2,22 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from db_connect import get_db_session
 from typing import Annotated
-from roles.schema import RoleResponse, EventRole,RolePermissionEdit, CreateRoleDetail
+from roles.schema import RoleResponseList, EventRole,RolePermissionEdit, CreateRoleDetail
+from responses import FastJSONResponse
 from models import Role, UserRole
-from sqlalchemy import select,delete
-from enums import PermissionDetailEnum
+from sqlalchemy import select,delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from enums import PermissionDetailEnum, Permission
+from dependencies import require_permission
 from sqlalchemy.orm import selectinload
-from uuid import UUID
+from uuid import UUID, uuid4
 from exception import HTTPNotFound
 from roles.crud import get_role_by_id
+from roles.permissions import invalidate_user_permissions, invalidate_all_permissions
 from roles.services import create_role_services, get_role_by_permssion_services, get_permission_detail_services, edit_role_and_permission_services
 router = APIRouter()
 
-@router.post("")
+@router.post("", dependencies=[Depends(require_permission(Permission.can_create_roles))])
 async def create_role_with_permission( db: Annotated[AsyncSession, Depends(get_db_session)], roledetail : CreateRoleDetail):
     return await create_role_services( db=db, roledetail=roledetail)
 
@@ -27,7 +31,7 @@ async def get_roles_with_permissions(db: Annotated[AsyncSession, Depends(get_db_
     result = await db.execute(stmt)
     roles = result.scalars().all()
     
-    return [RoleResponse.model_validate(role) for role in roles]
+    return FastJSONResponse(RoleResponseList.validate_python(roles))
     
 
 @router.get("/all")
@@ -38,12 +42,22 @@ async def get_all_role(db: Annotated[AsyncSession, Depends(get_db_session)]):
 
 @router.post("/event")
 async def create_user_role_in_event_with_permission(db: Annotated[AsyncSession, Depends(get_db_session)],user_role_detail : EventRole):
-    new_user_role = UserRole(
-        user_id = user_role_detail.user_id,
-        event_id = user_role_detail.event_id,
-        role_id = user_role_detail.role_id
+    # Replaces the user's role within the event, global roles (no event) are added as before
+    stmt = (
+        pg_insert(UserRole)
+        .values(
+            id=uuid4(),
+            user_id=user_role_detail.user_id,
+            event_id=user_role_detail.event_id,
+            role_id=user_role_detail.role_id
+        )
+        .on_conflict_do_update(
+            constraint="uq_userrole_user_event",
+            set_={"role_id": user_role_detail.role_id, "updated_at": func.now()},
+        )
     )
-    db.add(new_user_role)
+    await db.execute(stmt)
+    invalidate_user_permissions(db, user_role_detail.user_id)
     await db.commit()
 
     return {
@@ -58,6 +72,8 @@ async def get_role_by_permission(
 ):
     """ Extract user permission based on role """
     response = await get_role_by_permssion_services(db = db, user_id=user_id, event_id=event_id)
+    if not response:
+        raise HTTPNotFound("Role not found")
     return response[0].role
 
 @router.get("/detail")
@@ -69,7 +85,7 @@ async def get_permission_detail(
     return await get_permission_detail_services( db=db, permission_detail=permission_detail)
 
     
-@router.put("/{role_id}")
+@router.put("/{role_id}", dependencies=[Depends(require_permission(Permission.can_edit_roles))])
 async def edit_role_and_permission(db: Annotated[AsyncSession, Depends(get_db_session)], permission_detail:RolePermissionEdit,role_id : UUID):
     return await edit_role_and_permission_services( db=db, permission_detail=permission_detail, role_id=role_id)
 
@@ -89,7 +105,7 @@ async def get_role_for_filter(db: Annotated[AsyncSession, Depends(get_db_session
 
     return roles
 
-@router.delete("/{role_id}")
+@router.delete("/{role_id}", dependencies=[Depends(require_permission(Permission.can_delete_roles))])
 async def delete_role_and_permission(
     db: Annotated[AsyncSession, Depends(get_db_session)],
     role_id : UUID
@@ -101,6 +117,7 @@ async def delete_role_and_permission(
     
     stmt = delete(Role).where(Role.id == role_id)
     await db.execute(stmt)
+    invalidate_all_permissions(db)
     await db.commit()
 
     return {
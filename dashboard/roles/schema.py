@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from uuid import UUID
 
 class RolePageAccessResponse(BaseModel):
@@ -55,6 +55,8 @@ class RoleResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+RoleResponseList = TypeAdapter(list[RoleResponse])
+
 
 class EventRole(BaseModel):
     user_id : UUID
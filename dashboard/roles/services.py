@@ -1,4 +1,4 @@
-from models import Role, RoleAccessPage, UserRole
+from models import Role, RoleAccessPage
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from roles.schema import RoleDetail, EventRoleResponse, RolePermissionEdit, CreateRoleDetail
@@ -7,6 +7,7 @@ from uuid import UUID
 from  sqlalchemy.orm import selectinload
 from enums import PermissionDetailEnum,PERMISSION_DETAIL_SCHEMA 
 from roles.crud import get_role_by_id
+from roles.permissions import resolve_user_role, invalidate_all_permissions, pack_permissions
 from exception import HTTPNotFound
 
 async def get_member_role_id(db: AsyncSession):
@@ -34,6 +35,7 @@ async def create_role_services( db:AsyncSession, roledetail : CreateRoleDetail )
             can_edit_events = roledetail.can_edit_events,
             can_create_events = roledetail.can_create_events,
             can_delete_events = roledetail.can_delete_events,
+            permissions = pack_permissions(roledetail, roledetail.roleaccessdetail),
         )
         db.add(new_role)
         await db.flush()
@@ -71,29 +73,12 @@ async def get_role_by_permssion_services(
     user_id: UUID,
     event_id: UUID | None = None,
 ):
-    base_stmt = (
-        select(UserRole)
-        .options(
-            selectinload(UserRole.role)
-            .selectinload(Role.roleaccesspage)
-        )
-        .where(UserRole.user_id == user_id)
-    )
-    roledetail = []
-
-    if event_id:
-        stmt = base_stmt.where(UserRole.event_id == event_id)
-        result = await db.execute(stmt)
-        roledetail = result.scalars().all()
+    role = await resolve_user_role(db=db, user_id=user_id, event_id=event_id)
 
-    if not roledetail:
-        result = await db.execute(base_stmt)
-        roledetail = result.scalars().all()
-
-    if not roledetail:
+    if not role:
         return None
 
-    return [EventRoleResponse.model_validate(rd) for rd in roledetail]
+    return [EventRoleResponse(role=role)]
 
 async def get_permission_detail_services(
     db : AsyncSession,
@@ -130,6 +115,8 @@ async def edit_role_and_permission_services(
     for field, value in permission_detail.roleaccessdetail.dict().items():
         setattr(role.roleaccesspage, field, value)
 
+    role.permissions = pack_permissions(role, role.roleaccesspage)
+    invalidate_all_permissions(db)
     await db.commit()
     await db.refresh(role)
 
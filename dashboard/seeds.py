@@ -3,6 +3,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from db_connect import AsyncSessionLocal
 from models import Role, User, RoleAccessPage, UserRole
 from users.services import get_password_hash
+from roles.permissions import pack_permissions
+from counters import adjust_counters
 
 async def seed():
     async with AsyncSessionLocal() as db:
@@ -43,6 +45,7 @@ async def seed():
                 event_role_page = True
             )
             db.add(superadmin_roleaccesspage)
+            super_admin_role.permissions = pack_permissions(super_admin_role, superadmin_roleaccesspage)
             await db.flush()
 
             super_admin_user = User(
@@ -59,7 +62,8 @@ async def seed():
                 role_id=super_admin_role.id
             )
             db.add(user_role)
-            
+            await adjust_counters(db, total_users=1)
+
             member_role = Role(
                 rolename="member",
                 can_edit=False,
@@ -96,6 +100,7 @@ async def seed():
                 event_role_page = False
             )
             db.add(member_roleaccesspage)
+            member_role.permissions = pack_permissions(member_role, member_roleaccesspage)
             await db.flush()
             await db.commit()
             print("Database Seeded Successfully")
@@ -1,5 +1,60 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from enum import Enum
+from exception import HTTPBadRequest
+import base64
+import json
+
+class PaginationMode(str, Enum):
+    offset = "offset"
+    cursor = "cursor"
+
+class TotalCount(str, Enum):
+    exact = "exact"
+    estimate = "estimate"
+    none = "none"
 
 async def pagination(db : AsyncSession, page:int, limit : int, stmt):
     skip = (page -1) * limit
-    
\ No newline at end of file
+
+def encode_cursor(*values) -> str:
+    """ Opaque cursor from the sort key of the last row of a page """
+    raw = json.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor : str, *types):
+    """ Decode a cursor back to its sort key, converting each part with the matching type """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(types):
+            raise ValueError("cursor length mismatch")
+        return [convert(value) for convert, value in zip(types, values)]
+    except (ValueError, TypeError, ArithmeticError):
+        raise HTTPBadRequest("Invalid cursor")
+
+async def count_rows(db : AsyncSession, stmt, mode : TotalCount = TotalCount.exact):
+    """
+        Count the rows a statement returns.
+        estimate uses the planner row estimate instead of scanning, none skips counting.
+    """
+    if mode == TotalCount.none:
+        return None
+
+    stmt = stmt.order_by(None)
+    if mode == TotalCount.estimate:
+        compiled = stmt.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+        # Sent as raw SQL so literal values containing ':' are not parsed as bind params
+        connection = await db.connection()
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    result = await db.execute(select(func.count()).select_from(stmt.subquery()))
+    return result.scalar()
+
+def total_pages(total : int | None, limit : int):
+    if total is None:
+        return None
+    return (total + limit - 1) // limit
@@ -1,9 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
+from sqlalchemy import select, or_, func, tuple_
+from datetime import datetime
 from models import User, Role, UserRole
 from uuid import UUID
-from users.schema import UserDetailResponse
+from users.schema import UserDetailResponse, UserDetailResponseList
 from sqlalchemy.orm import selectinload
+from services import PaginationMode, TotalCount, count_rows, decode_cursor, encode_cursor, total_pages
 
 async def get_user_by_email_or_username(
     db: AsyncSession,
@@ -25,11 +27,18 @@ async def get_user_by_email_or_username(
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
-async def get_user_by_role(db: AsyncSession,page : int, limit : int,role_id : UUID | None = None):
+async def get_user_by_role(
+    db: AsyncSession,
+    page : int,
+    limit : int,
+    role_id : UUID | None = None,
+    pagination : PaginationMode = PaginationMode.offset,
+    cursor : str | None = None,
+    total_count : TotalCount = TotalCount.exact,
+):
     """"
         Extract user detail with role info
     """
-    skip = (page - 1) * limit
     stmt = (
         select(
             User.id.label("id"),
@@ -47,19 +56,40 @@ async def get_user_by_role(db: AsyncSession,page : int, limit : int,role_id : UU
     if role_id:
         stmt = stmt.where(UserRole.role_id == role_id)
 
+    total = await count_rows(db=db, stmt=stmt, mode=total_count)
+
+    if pagination == PaginationMode.cursor:
+        # UserRole.id breaks ties and keeps the key unique per row
+        stmt = stmt.add_columns(User.created_at, UserRole.id.label("userrole_id"))
+        stmt = stmt.order_by(User.created_at, UserRole.id)
+        if cursor:
+            created_at, userrole_id = decode_cursor(cursor, datetime.fromisoformat, UUID)
+            stmt = stmt.where(tuple_(User.created_at, UserRole.id) > (created_at, userrole_id))
+
+        result = await db.execute(stmt.limit(limit + 1))
+        user = result.mappings().all()
+        next_cursor = None
+        if len(user) > limit:
+            user = user[:limit]
+            next_cursor = encode_cursor(user[-1]["created_at"], user[-1]["userrole_id"])
+
+        return {
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "total_pages": total_pages(total, limit),
+            "items": UserDetailResponseList.validate_python(user)
+        }
+
+    skip = (page - 1) * limit
     stmt = stmt.offset(skip).limit(limit)
     result = await db.execute(stmt)
     user = result.mappings().all()
 
-    count_stmt = select(func.count()).select_from(User)
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar()    
-
     return {
         "page": page,
         "limit": limit,
-        "total_pages": (total + limit - 1) // limit,
-        "items": [UserDetailResponse.model_validate(u) for u in user]
+        "total_pages": total_pages(total, limit),
+        "items": UserDetailResponseList.validate_python(user)
     }
 
 async def get_all_users(db : AsyncSession, role_id : str | None = None):
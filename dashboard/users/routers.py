@@ -1,4 +1,4 @@
-from fastapi import APIRouter,Depends, Query
+from fastapi import APIRouter,Depends, Query, UploadFile
 from users.schema import UserDetail,UserDetailResponse, LoginUser, EditUserDetail, RefreshTokenRequest, TokenResponse
 from models import User
 from db_connect import get_db_session
@@ -6,10 +6,16 @@ from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import delete
 from uuid import UUID
-from users.services import login_user_service, signup_user_services, edit_user_services, refresh_access_token_service, home_page_services
+from users.services import login_user_service, signup_user_services, edit_user_services, refresh_access_token_service, home_page_services, parse_user_import, import_users_services
 from users.crud import get_user_by_role, get_user_by_id
-from dependencies import get_current_user
+from dependencies import get_current_user, require_permission, ensure_permission
+from enums import Permission
+from roles.permissions import invalidate_user_permissions
+from counters import adjust_counters
+from events.crud import touch_events_of_user
 from exception import HTTPNotFound
+from services import PaginationMode, TotalCount
+from responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -25,6 +31,19 @@ async def signup_user(
     return {"message": "User created successfully"}
         
     
+@router.post("/import", dependencies=[Depends(require_permission(Permission.can_create_users))])
+async def import_users(
+    file : UploadFile,
+    db : Annotated[AsyncSession,Depends(get_db_session)]
+):
+    """
+        Create users from a CSV (header row with the signup fields) or JSON (list of signup objects) file.
+        Rows that are invalid or already exist are reported in conflicts, the rest are created.
+    """
+    users, conflicts = parse_user_import(await file.read(), file.filename)
+    return await import_users_services(db=db, users=users, conflicts=conflicts)
+
+
 @router.post("/login")
 async def login_user(
     user : LoginUser, 
@@ -64,24 +83,40 @@ async def retrieve_user(
     role_id : str | None = None,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    pagination: PaginationMode = PaginationMode.offset,
+    cursor: str | None = None,
+    total_count: TotalCount = TotalCount.exact,
 ):  
-    users = await get_user_by_role(db=db, role_id=role_id, page=page, limit = limit)
+    users = await get_user_by_role(
+        db=db,
+        role_id=role_id,
+        page=page,
+        limit = limit,
+        pagination=pagination,
+        cursor=cursor,
+        total_count=total_count
+    )
     if not users:
         return{
             "message" : "User not found"
         }
 
-    return users
+    return FastJSONResponse(users)
 
-@router.patch("/{user_id}", dependencies=[Depends(get_current_user)])
+@router.patch("/{user_id}")
 async def edit_user(    
     edit_detail : EditUserDetail,
     db: Annotated[AsyncSession, Depends(get_db_session)],
     user_id: UUID,
+    current_user: dict = Depends(get_current_user),
 ):
+    # Anyone may edit their own profile, editing another user or a role needs can_edit_users
+    if current_user.get("sub") != str(user_id) or edit_detail.role_id:
+        ensure_permission(current_user, Permission.can_edit_users)
+
     return await edit_user_services(db=db, user_data=edit_detail, user_id=user_id)
 
-@router.delete("/{user_id}", dependencies=[Depends(get_current_user)])
+@router.delete("/{user_id}", dependencies=[Depends(require_permission(Permission.can_delete_users))])
 async def delete_user(    
     db: Annotated[AsyncSession, Depends(get_db_session)],
     user_id: UUID,
@@ -91,8 +126,12 @@ async def delete_user(
     if not user:
         raise HTTPNotFound("User not found")
     
+    # Read before the delete cascades away the user's participations
+    await touch_events_of_user(db=db, user_id=user_id)
     stmt = delete(User).where(User.id == user_id)
-    await db.execute(stmt)
+    result = await db.execute(stmt)
+    await adjust_counters(db, total_users=-result.rowcount)
+    invalidate_user_permissions(db, user_id)
     await db.commit()
 
     return {"message": f"User {user.username} deleted successfully"}
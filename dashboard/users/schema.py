@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from enum import Enum
 from datetime import datetime
 from uuid import UUID
@@ -31,6 +31,8 @@ class UserDetailResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+UserDetailResponseList = TypeAdapter(list[UserDetailResponse])
+
 class LoginUser(BaseModel):
     username : str
     password : str
@@ -1,4 +1,4 @@
-from models import User, UserRole, Event, Role
+from models import User, UserRole, Role
 from fastapi import HTTPException, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from pwdlib import PasswordHash
@@ -7,35 +7,81 @@ from uuid import UUID
 from dotenv import load_dotenv
 import os
 from datetime import datetime,timedelta
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import asyncio
+import hashlib
+import time
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from roles.services import get_member_role_id
+from roles.permissions import invalidate_user_permissions
+from counters import adjust_counters, counters_row
 from roles.crud import get_user_role
+from events.crud import touch_events_of_user
 from users.crud import get_user_by_email_or_username, get_user_with_roles_by_username, get_user_by_id
 from sqlalchemy.exc import SQLAlchemyError
-from exception import HTTPConflict, HTTPNotFound, HTTPInternalServer, HTTPUnauthorized
-from sqlalchemy import select,func
+from exception import HTTPConflict, HTTPNotFound, HTTPInternalServer, HTTPUnauthorized, HTTPServiceUnavailable, HTTPBadRequest
+from sqlalchemy import select, insert, or_, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from users.schema import UserDetail
+from pydantic import ValidationError
+from uuid import uuid4
+import csv
+import io
+import json
 
 load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 REFRESH_TOKEN_EXPIRE_MINUTES = os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "64"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+USER_IMPORT_CHUNK_SIZE = int(os.getenv("USER_IMPORT_CHUNK_SIZE", "500"))
 
 password_hash = PasswordHash.recommended()
 security = HTTPBearer()
 
+# Argon2 releases the GIL, so a small thread pool keeps hashing off the event loop
+hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_pending_hash_jobs = 0
+
+# sha256(token) -> (cache expiry timestamp, verified claims)
+_verified_tokens: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+async def run_in_hash_pool(func, *args):
+    """ Run a password hashing call on the hash executor, rejecting work once the queue is full """
+    global _pending_hash_jobs
+    if _pending_hash_jobs >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE:
+        raise HTTPServiceUnavailable("Too many password operations in progress, try again shortly")
+
+    _pending_hash_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hash_executor, func, *args)
+    finally:
+        _pending_hash_jobs -= 1
+
 async def get_password_hash(password):
-    return password_hash.hash(password)
+    return await run_in_hash_pool(password_hash.hash, password)
 
 async def verify_password(plain_password, hashed_password):
-    return password_hash.verify(plain_password, hashed_password)
+    return await run_in_hash_pool(password_hash.verify, plain_password, hashed_password)
 
-async def generate_access_token(user_id : UUID, role_id : UUID,role : str):
+async def verify_and_update_password(plain_password, hashed_password):
+    """ Verify password and return a fresh hash when the stored one uses outdated parameters """
+    return await run_in_hash_pool(password_hash.verify_and_update, plain_password, hashed_password)
+
+async def generate_access_token(user_id : UUID, role_id : UUID,role : str, permissions : int = 0):
     expire = datetime.utcnow() + timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES))
     payload = {
         "sub": str(user_id),
         "role_id": str(role_id),
         "role": role,
+        # enums.Permission bits of the role, checked by dependencies.require_permission
+        "perm": permissions,
         "type": "access",
         "exp": expire
     }
@@ -55,19 +101,42 @@ async def generate_refresh_token(user_id : UUID):
     return token
 
 async def verify_jwt_token(credential: HTTPAuthorizationCredentials = Depends(security)):
-    # Actual JWT token  
+    """
+        Verify the access token, reusing claims of recently verified tokens until they expire
+    """
     token = credential.credentials
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+
+    cached = _verified_tokens.get(key)
+    if cached is not None:
+        expires_at, payload = cached
+        if expires_at > now:
+            _verified_tokens.move_to_end(key)
+            return payload
+        del _verified_tokens[key]
+
     try:
-        
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print("Decoded JWT:", payload)
-        return payload
-
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    if TOKEN_CACHE_SIZE > 0:
+        expires_at = now + TOKEN_CACHE_TTL_SECONDS
+        if "exp" in payload:
+            expires_at = min(expires_at, payload["exp"])
+        _verified_tokens[key] = (expires_at, payload)
+        if len(_verified_tokens) > TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+
+    return payload
+
+
+def global_role(user):
+    """ Role of the user outside events, the one access tokens carry. Event roles are resolved per request """
+    return next((user_role.role for user_role in user.userrole if user_role.event_id is None), None)
 
 
 async def login_user_service(db : AsyncSession, login_data):
@@ -83,27 +152,32 @@ async def login_user_service(db : AsyncSession, login_data):
         raise HTTPUnauthorized("Invalid username or password")
 
     # verify password
-    is_valid = await verify_password(
+    is_valid, updated_hash = await verify_and_update_password(
         login_data.password,
         user.password
     )
 
     if not is_valid:
         raise HTTPUnauthorized("Invalid username or password")
+
+    # Transparently upgrade hashes created with outdated parameters
+    if updated_hash:
+        user.password = updated_hash
+        await db.commit()
     
-    if not user.userrole:
+    role = global_role(user)
+    if not role:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User has no assigned role"
         )
-    
-    role = user.userrole[0].role  # assuming single role per user
 
     # retrieve access token
     access_token = await generate_access_token(
         user_id=user.id,
         role=role.rolename,
-        role_id=role.id
+        role_id=role.id,
+        permissions=role.permissions
     )
     # retrieve refresh token
     refresh_token = await generate_refresh_token(
@@ -153,6 +227,7 @@ async def signup_user_services(db : AsyncSession, user_data):
             role_id = role_id
         ) 
         db.add(user_role)
+        await adjust_counters(db, total_users=1)
         await db.commit()
 
         return new_user
@@ -161,6 +236,155 @@ async def signup_user_services(db : AsyncSession, user_data):
         raise HTTPInternalServer("Failed to create user")
     
 
+def import_conflict(row : int, detail : str, username : str | None = None, email : str | None = None):
+    return {"row": row, "username": username, "email": email, "detail": detail}
+
+def parse_user_import(content : bytes, filename : str | None = None):
+    """
+        Users of a CSV or JSON import file as (row number, UserDetail) pairs,
+        plus a conflict entry for every row that fails validation
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPBadRequest("Import file must be UTF-8 encoded")
+
+    if (filename or "").lower().endswith(".csv"):
+        # Empty CSV cells mean the field was not given
+        records = [
+            {key: value or None for key, value in record.items()}
+            for record in csv.DictReader(io.StringIO(text))
+        ]
+    else:
+        try:
+            records = json.loads(text)
+        except ValueError:
+            raise HTTPBadRequest("Import file is not valid JSON, use a .csv file name for CSV")
+        if isinstance(records, dict):
+            records = records.get("users")
+        if not isinstance(records, list):
+            raise HTTPBadRequest("Import file must contain a list of users")
+
+    users, conflicts = [], []
+    for row, record in enumerate(records, start=1):
+        try:
+            users.append((row, UserDetail.model_validate(record)))
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc']) or 'row'}: {error['msg']}" for error in e.errors()
+            )
+            record = record if isinstance(record, dict) else {}
+            conflicts.append(import_conflict(row, detail, record.get("username"), record.get("email")))
+
+    return users, conflicts
+
+async def hash_passwords(passwords : list[str]) -> list[str]:
+    """ Hash in waves of PASSWORD_HASH_WORKERS, keeping every worker busy without overflowing the hash queue """
+    hashes = []
+    for start in range(0, len(passwords), PASSWORD_HASH_WORKERS):
+        wave = passwords[start:start + PASSWORD_HASH_WORKERS]
+        hashes.extend(await asyncio.gather(*(get_password_hash(password) for password in wave)))
+    return hashes
+
+async def import_users_services(db : AsyncSession, users : list[tuple[int, UserDetail]], conflicts : list[dict] | None = None):
+    """
+        Create many users at once. Usernames and emails are checked with one query per chunk,
+        users and their roles are written with one bulk insert per chunk, and rows that conflict
+        are reported back instead of failing the whole import.
+    """
+    conflicts = list(conflicts or [])
+
+    # Duplicates inside the file itself, the first occurrence wins
+    seen_usernames, seen_emails, candidates = set(), set(), []
+    for row, user in users:
+        if user.username in seen_usernames:
+            conflicts.append(import_conflict(row, "Username repeated in import", user.username, user.email))
+        elif user.email in seen_emails:
+            conflicts.append(import_conflict(row, "Email repeated in import", user.username, user.email))
+        else:
+            seen_usernames.add(user.username)
+            seen_emails.add(user.email)
+            candidates.append((row, user))
+
+    member_role_id = await get_member_role_id(db)
+    role_ids = {user.role_id for _, user in candidates if user.role_id}
+    if role_ids:
+        result = await db.execute(select(Role.id).where(Role.id.in_(role_ids)))
+        role_ids = set(result.scalars().all())
+
+    created = 0
+    try:
+        for start in range(0, len(candidates), USER_IMPORT_CHUNK_SIZE):
+            chunk = candidates[start:start + USER_IMPORT_CHUNK_SIZE]
+
+            result = await db.execute(
+                select(User.username, User.email).where(
+                    or_(
+                        User.username.in_([user.username for _, user in chunk]),
+                        User.email.in_([user.email for _, user in chunk]),
+                    )
+                )
+            )
+            existing = result.all()
+            existing_usernames = {u.username for u in existing}
+            existing_emails = {u.email for u in existing}
+
+            accepted = []
+            for row, user in chunk:
+                role_id = user.role_id or member_role_id
+                if user.username in existing_usernames:
+                    conflicts.append(import_conflict(row, "Username already exist", user.username, user.email))
+                elif user.email in existing_emails:
+                    conflicts.append(import_conflict(row, "Email already exist", user.username, user.email))
+                elif not role_id or (user.role_id and user.role_id not in role_ids):
+                    conflicts.append(import_conflict(row, "Role not found", user.username, user.email))
+                else:
+                    accepted.append((row, user, role_id))
+            if not accepted:
+                continue
+
+            hashes = await hash_passwords([user.password for _, user, _ in accepted])
+            new_users = [
+                {
+                    "id": uuid4(),
+                    "username": user.username,
+                    "fullname": user.fullname,
+                    "email": user.email,
+                    "password": hashed,
+                }
+                for (_, user, _), hashed in zip(accepted, hashes)
+            ]
+
+            # Users created concurrently since the lookup are skipped here and reported below
+            result = await db.execute(
+                pg_insert(User).on_conflict_do_nothing().returning(User.id),
+                new_users
+            )
+            inserted = set(result.scalars().all())
+
+            user_roles = []
+            for (row, user, role_id), new_user in zip(accepted, new_users):
+                if new_user["id"] in inserted:
+                    user_roles.append({"user_id": new_user["id"], "role_id": role_id})
+                else:
+                    conflicts.append(import_conflict(row, "Username or email already exist", user.username, user.email))
+            if user_roles:
+                await db.execute(insert(UserRole), user_roles)
+            created += len(user_roles)
+
+        await adjust_counters(db, total_users=created)
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPInternalServer("Failed to import users")
+
+    return {
+        "message": f"{created} users imported",
+        "created": created,
+        "conflicts": sorted(conflicts, key=lambda conflict: conflict["row"]),
+    }
+
+
 async def edit_user_services(db: AsyncSession, user_data, user_id: UUID):
     user = await get_user_by_id( db=db , user_id=user_id)
     if not user:
@@ -191,6 +415,9 @@ async def edit_user_services(db: AsyncSession, user_data, user_id: UUID):
         user.email = user_data.email
     if user_data.role_id:
         role.role_id = user_data.role_id
+        invalidate_user_permissions(db, user_id)
+    if user_data.username or user_data.fullname:
+        await touch_events_of_user(db=db, user_id=user_id)
 
     await db.commit()
     return {"message": "User updated successfully"}
@@ -229,19 +456,19 @@ async def refresh_access_token_service(db: AsyncSession, refresh_token: str):
     if not user:
         raise HTTPUnauthorized("User not found")
     
-    if not user.userrole:
+    role = global_role(user)
+    if not role:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User has no assigned role"
         )
     
-    role = user.userrole[0].role
-    
     # Generate new tokens
     new_access_token = await generate_access_token(
         user_id=user.id,
         role=role.rolename,
-        role_id=role.id
+        role_id=role.id,
+        permissions=role.permissions
     )
     
     new_refresh_token = await generate_refresh_token(user_id=user.id)
@@ -249,31 +476,34 @@ async def refresh_access_token_service(db: AsyncSession, refresh_token: str):
     return new_access_token, new_refresh_token
 
 async def home_page_services(db: AsyncSession, user_id : UUID):
+    """ Home page counts and the user's global role in one query, counts read from dashboard_counters """
     try:
-        # Get counts
-        total_users = await db.scalar(select(func.count(User.id)))
-        total_events = await db.scalar(select(func.count(Event.id)))
-        active_events = await db.scalar(
-            select(func.count(Event.id)).where(Event.status == "active")
-        )
-
-        # Get username and role
-        stmt = (
+        counters = counters_row()
+        # Global role first, the user may also hold roles within events
+        user_role = (
             select(User.username, Role.rolename)
             .join(UserRole, UserRole.user_id == User.id)
             .join(Role, Role.id == UserRole.role_id)
             .where(User.id == user_id)
+            .order_by(UserRole.event_id.is_not(None), UserRole.created_at)
+            .limit(1)
+            .subquery()
+        )
+        stmt = (
+            select(user_role.c.username, user_role.c.rolename, counters)
+            .select_from(counters)
+            .outerjoin(user_role, true())
         )
 
         result = await db.execute(stmt)
-        user_data = result.first()
+        row = result.one()
 
         return {
-            "username": user_data.username if user_data else None,
-            "role": user_data.rolename if user_data else None,
-            "total_users": total_users,
-            "total_events": total_events,
-            "active_events": active_events,
+            "username": row.username,
+            "role": row.rolename,
+            "total_users": row.total_users,
+            "total_events": row.total_events,
+            "active_events": row.active_events,
         }
     except SQLAlchemyError as e:
         await db.rollback()